@@ -1,4 +1,5 @@
 from producto import Producto
+from indice_trigramas import IndiceTrigramas
 from typing import List, Optional
 
 
@@ -11,6 +12,8 @@ class Inventario:
     def __init__(self):
         """Inicializa un inventario vacío"""
         self._productos: List[Producto] = []
+        # Índice de trigramas sobre los nombres para acelerar buscar_por_nombre
+        self._indice_nombres = IndiceTrigramas()
 
     def agregar_producto(self, producto: Producto) -> bool:
         """
@@ -27,6 +30,7 @@ class Inventario:
         if self.buscar_por_id(producto.id):
             return False
         self._productos.append(producto)
+        self._indice_nombres.agregar(producto, producto.nombre)
         return True
 
     def eliminar_producto(self, id_producto: int) -> bool:
@@ -42,6 +46,7 @@ class Inventario:
         producto = self.buscar_por_id(id_producto)
         if producto:
             self._productos.remove(producto)
+            self._indice_nombres.eliminar(producto)
             return True
         return False
 
@@ -79,6 +84,24 @@ class Inventario:
             return True
         return False
 
+    def actualizar_nombre(self, id_producto: int, nuevo_nombre: str) -> bool:
+        """
+        Renombra un producto existente manteniendo actualizado el índice de búsqueda.
+
+        Args:
+            id_producto: ID del producto a actualizar
+            nuevo_nombre: Nuevo nombre (no vacío)
+
+        Returns:
+            True si se actualizó exitosamente, False si no existe el producto
+        """
+        producto = self.buscar_por_id(id_producto)
+        if producto:
+            producto.nombre = nuevo_nombre
+            self._indice_nombres.agregar(producto, producto.nombre)
+            return True
+        return False
+
     def buscar_por_id(self, id_producto: int) -> Optional[Producto]:
         """
         Busca un producto por su ID exacto.
@@ -105,10 +128,8 @@ class Inventario:
             Lista de productos coincidentes (vacía si no hay coincidencias)
         """
         nombre_normalizado = nombre_busqueda.strip().lower()
-        return [
-            producto for producto in self._productos
-            if nombre_normalizado in producto.nombre.lower()
-        ]
+        # El índice de trigramas evita recorrer toda la lista y conserva su orden
+        return self._indice_nombres.buscar(nombre_normalizado)
 
     def obtener_todos(self) -> List[Producto]:
         """
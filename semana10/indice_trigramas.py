@@ -0,0 +1,90 @@
+from typing import Dict, Hashable, List, Set
+
+
+class IndiceTrigramas:
+    """
+    Índice invertido de trigramas para búsquedas por subcadena insensibles a mayúsculas.
+
+    Cada nombre se normaliza con lower() y se descompone en sus subcadenas de 3 caracteres.
+    Una consulta de 3 o más caracteres solo verifica los productos que contienen todos sus
+    trigramas, en lugar de recorrer el inventario completo. Los resultados se devuelven en
+    el orden en que se indexaron las claves, igual que un recorrido lineal.
+
+    La clave puede ser el ID del producto o el propio objeto Producto.
+    """
+
+    def __init__(self):
+        """Inicializa un índice vacío"""
+        self._nombres: Dict[Hashable, str] = {}         # clave -> nombre normalizado
+        self._orden: Dict[Hashable, int] = {}           # clave -> posición de inserción
+        self._trigramas: Dict[str, Set[Hashable]] = {}  # trigrama -> claves que lo contienen
+        self._contador = 0
+
+    @staticmethod
+    def _trigramas_de(texto: str) -> Set[str]:
+        return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+    def agregar(self, clave: Hashable, nombre: str):
+        """Indexa el nombre de una clave. Si la clave ya existe se reindexa conservando su posición."""
+        normalizado = nombre.lower()
+        anterior = self._nombres.get(clave)
+        if anterior is None:
+            self._orden[clave] = self._contador
+            self._contador += 1
+        elif anterior == normalizado:
+            return
+        else:
+            self._quitar_trigramas(clave, anterior)
+
+        self._nombres[clave] = normalizado
+        for trigrama in self._trigramas_de(normalizado):
+            self._trigramas.setdefault(trigrama, set()).add(clave)
+
+    def eliminar(self, clave: Hashable):
+        """Quita una clave del índice (no hace nada si no existe)."""
+        anterior = self._nombres.pop(clave, None)
+        if anterior is None:
+            return
+        del self._orden[clave]
+        self._quitar_trigramas(clave, anterior)
+
+    def _quitar_trigramas(self, clave: Hashable, nombre: str):
+        for trigrama in self._trigramas_de(nombre):
+            claves = self._trigramas.get(trigrama)
+            if claves is not None:
+                claves.discard(clave)
+                if not claves:
+                    del self._trigramas[trigrama]
+
+    def buscar(self, texto: str) -> List[Hashable]:
+        """
+        Busca las claves cuyo nombre contiene el texto (insensible a mayúsculas).
+
+        Args:
+            texto: Subcadena a buscar
+
+        Returns:
+            Lista de claves coincidentes en orden de inserción
+        """
+        consulta = texto.lower()
+        if len(consulta) < 3:
+            # Consultas muy cortas no tienen trigramas: se recorren los nombres ya normalizados
+            return [clave for clave, nombre in self._nombres.items() if consulta in nombre]
+
+        conjuntos = []
+        for trigrama in self._trigramas_de(consulta):
+            claves = self._trigramas.get(trigrama)
+            if not claves:
+                return []
+            conjuntos.append(claves)
+        conjuntos.sort(key=len)
+        candidatos = conjuntos[0].intersection(*conjuntos[1:])
+
+        # Los trigramas solo filtran candidatos: la subcadena se confirma sobre el nombre completo
+        nombres = self._nombres
+        coincidencias = [clave for clave in candidatos if consulta in nombres[clave]]
+        coincidencias.sort(key=self._orden.__getitem__)
+        return coincidencias
+
+    def __len__(self) -> int:
+        return len(self._nombres)
@@ -1,6 +1,7 @@
 import json
 import os
 from producto_mejorado import Producto
+from indice_trigramas import IndiceTrigramas
 from typing import List, Optional
 
 
@@ -10,10 +11,26 @@ class Inventario:
     Implementa operaciones CRUD con validación de integridad y manejo de excepciones.
     """
 
-    def __init__(self, ruta_archivo: str = "inventario.txt"):
-        """Inicializa el inventario y carga los datos desde el archivo"""
+    def __init__(self, ruta_archivo: str = "inventario.txt", usar_diario: bool = False,
+                 umbral_compactacion: int = 1000):
+        """
+        Inicializa el inventario y carga los datos desde el archivo.
+
+        Args:
+            ruta_archivo: Ruta del archivo de texto (instantánea completa del inventario)
+            usar_diario: Si es True, cada cambio se añade como un registro compacto a un
+                diario (ruta_archivo + '.log') en lugar de reescribir todo el archivo
+            umbral_compactacion: Número de registros del diario tras el cual se vuelca
+                una nueva instantánea y se vacía el diario
+        """
         self._productos: List[Producto] = []
+        # Índice de trigramas sobre los nombres para acelerar buscar_por_nombre
+        self._indice_nombres = IndiceTrigramas()
         self._ruta_archivo = ruta_archivo
+        self._usar_diario = usar_diario
+        self._ruta_diario = ruta_archivo + ".log"
+        self._umbral_compactacion = umbral_compactacion
+        self._entradas_diario = 0
         self.cargar_desde_archivo()
 
     def cargar_desde_archivo(self):
@@ -29,11 +46,15 @@ class Inventario:
                         precio=item['precio']
                     )
                     self._productos.append(producto)
+            if self._usar_diario:
+                self._reproducir_diario()
             print(f"--- Sistema: Inventario cargado exitosamente desde '{self._ruta_archivo}' ---")
 
         except FileNotFoundError:
             print(
                 f"--- Sistema: Archivo '{self._ruta_archivo}' no encontrado. Se creará automáticamente al guardar. ---")
+            if self._usar_diario:
+                self._reproducir_diario()
             # Creamos un archivo base vacío para asegurar que podemos escribir en el directorio
             try:
                 with open(self._ruta_archivo, 'w', encoding='utf-8') as archivo:
@@ -50,32 +71,117 @@ class Inventario:
         except Exception as e:
             print(f"--- Error inesperado al cargar el archivo: {e} ---")
 
+        self._reconstruir_indice()
+
+    def _reconstruir_indice(self):
+        """Vuelve a indexar los nombres de todos los productos cargados."""
+        self._indice_nombres = IndiceTrigramas()
+        for producto in self._productos:
+            self._indice_nombres.agregar(producto, producto.nombre)
+
     def guardar_en_archivo(self):
         """Serializa la lista de productos y la guarda en el archivo."""
+        # Se escribe en un temporal y se reemplaza el archivo de una vez: un corte a mitad
+        # de la escritura deja intacta la instantánea anterior
+        temporal = self._ruta_archivo + ".tmp"
         try:
-            with open(self._ruta_archivo, 'w', encoding='utf-8') as archivo:
+            with open(temporal, 'w', encoding='utf-8') as archivo:
                 # Utilizamos el método to_dict() de la clase Producto
                 datos = [producto.to_dict() for producto in self._productos]
                 json.dump(datos, archivo, indent=4)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(temporal, self._ruta_archivo)
         except PermissionError:
             # Elevamos el error para que la Interfaz de Usuario lo maneje e informe
             raise PermissionError(f"Permiso denegado para escribir en '{self._ruta_archivo}'")
         except Exception as e:
             raise Exception(f"Fallo inesperado al guardar el archivo: {e}")
 
+    def _reproducir_diario(self):
+        """Aplica sobre la instantánea cargada los cambios pendientes del diario."""
+        if not os.path.exists(self._ruta_diario):
+            return
+        # Índice temporal por ID para que la reproducción no recorra la lista en cada registro
+        indice = {producto.id: producto for producto in self._productos}
+        with open(self._ruta_diario, 'r', encoding='utf-8') as diario:
+            for numero, linea in enumerate(diario, start=1):
+                try:
+                    registro = json.loads(linea)
+                except json.JSONDecodeError:
+                    # Una última línea sin salto de línea es una escritura interrumpida: se
+                    # descarta en silencio. Cualquier otra línea inválida se informa.
+                    if linea.endswith('\n'):
+                        print(f"--- Error: La línea {numero} del diario '{self._ruta_diario}' "
+                              f"está corrupta. Se omite. ---")
+                    continue
+                operacion = registro['op']
+                id_producto = registro['id']
+                if operacion == 'agregar':
+                    indice[id_producto] = Producto(
+                        id_producto, registro['nombre'], registro['cantidad'], registro['precio']
+                    )
+                elif operacion == 'eliminar':
+                    indice.pop(id_producto, None)
+                elif id_producto in indice:
+                    if operacion == 'cantidad':
+                        indice[id_producto].cantidad = registro['valor']
+                    elif operacion == 'precio':
+                        indice[id_producto].precio = registro['valor']
+                    elif operacion == 'nombre':
+                        indice[id_producto].nombre = registro['valor']
+                self._entradas_diario += 1
+        self._productos = list(indice.values())
+
+    def _registrar_cambio(self, registro: dict):
+        """
+        Persiste un cambio. Sin diario reescribe el archivo completo; con diario
+        añade una sola línea compacta, por lo que el costo no depende del tamaño del inventario.
+        """
+        if not self._usar_diario:
+            self.guardar_en_archivo()
+            return
+        try:
+            with open(self._ruta_diario, 'a', encoding='utf-8') as diario:
+                diario.write(json.dumps(registro, separators=(',', ':')) + '\n')
+        except PermissionError:
+            raise PermissionError(f"Permiso denegado para escribir en '{self._ruta_diario}'")
+        except Exception as e:
+            raise Exception(f"Fallo inesperado al escribir en el diario: {e}")
+        self._entradas_diario += 1
+        if self._entradas_diario >= self._umbral_compactacion:
+            self.compactar()
+
+    def compactar(self):
+        """
+        Vuelca una instantánea completa y vacía el diario de cambios. El diario solo se vacía
+        cuando la nueva instantánea ya reemplazó a la anterior; si el guardado falla, el error
+        se propaga y el diario conserva los cambios.
+        """
+        self.guardar_en_archivo()
+        if self._usar_diario:
+            try:
+                with open(self._ruta_diario, 'w', encoding='utf-8'):
+                    pass
+            except PermissionError:
+                raise PermissionError(f"Permiso denegado para escribir en '{self._ruta_diario}'")
+        self._entradas_diario = 0
+
     def agregar_producto(self, producto: Producto) -> bool:
         if self.buscar_por_id(producto.id):
             return False
 
         self._productos.append(producto)
-        self.guardar_en_archivo()  # Guardamos cambios en disco
+        self._indice_nombres.agregar(producto, producto.nombre)
+        self._registrar_cambio({'op': 'agregar', **producto.to_dict()})  # Guardamos cambios en disco
         return True
 
     def eliminar_producto(self, id_producto: int) -> bool:
         producto = self.buscar_por_id(id_producto)
         if producto:
             self._productos.remove(producto)
-            self.guardar_en_archivo()  # Guardamos cambios en disco
+            self._indice_nombres.eliminar(producto)
+            self._registrar_cambio({'op': 'eliminar', 'id': id_producto})  # Guardamos cambios en disco
             return True
         return False
 
@@ -83,7 +189,7 @@ class Inventario:
         producto = self.buscar_por_id(id_producto)
         if producto:
             producto.cantidad = nueva_cantidad
-            self.guardar_en_archivo()  # Guardamos cambios en disco
+            self._registrar_cambio({'op': 'cantidad', 'id': id_producto, 'valor': producto.cantidad})
             return True
         return False
 
@@ -91,7 +197,16 @@ class Inventario:
         producto = self.buscar_por_id(id_producto)
         if producto:
             producto.precio = nuevo_precio
-            self.guardar_en_archivo()  # Guardamos cambios en disco
+            self._registrar_cambio({'op': 'precio', 'id': id_producto, 'valor': producto.precio})
+            return True
+        return False
+
+    def actualizar_nombre(self, id_producto: int, nuevo_nombre: str) -> bool:
+        producto = self.buscar_por_id(id_producto)
+        if producto:
+            producto.nombre = nuevo_nombre
+            self._indice_nombres.agregar(producto, producto.nombre)
+            self._registrar_cambio({'op': 'nombre', 'id': id_producto, 'valor': producto.nombre})
             return True
         return False
 
@@ -103,10 +218,8 @@ class Inventario:
 
     def buscar_por_nombre(self, nombre_busqueda: str) -> List[Producto]:
         nombre_normalizado = nombre_busqueda.strip().lower()
-        return [
-            producto for producto in self._productos
-            if nombre_normalizado in producto.nombre.lower()
-        ]
+        # El índice usa los propios productos como clave y los devuelve en el orden de la lista
+        return self._indice_nombres.buscar(nombre_normalizado)
 
     def obtener_todos(self) -> List[Producto]:
         return sorted(self._productos, key=lambda p: p.id)
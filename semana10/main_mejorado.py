@@ -169,8 +169,8 @@ def mostrar_menu():
 
 
 def main():
-    # Al inicializar, Inventario intentará cargar "inventario.txt"
-    inventario = Inventario()
+    # Al inicializar, Inventario intentará cargar "inventario.txt" y su diario de cambios
+    inventario = Inventario(usar_diario=True)
 
     # Si el inventario está vacío (primera vez que se ejecuta o archivo borrado),
     # agregamos los datos de prueba automáticamente.
@@ -197,6 +197,10 @@ def main():
             menu_mostrar_todos(inventario)
         elif opcion == '6':
             print("\nGuardando últimos detalles y saliendo. ¡Gracias por usar el sistema!\n")
+            try:
+                inventario.compactar()
+            except Exception as e:
+                print(f"[ADVERTENCIA] No se pudo compactar el diario (los cambios siguen en él): {e}")
             sys.exit(0)
         else:
             print("\nError: Opción no válida. Por favor seleccione 1-6")
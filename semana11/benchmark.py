@@ -0,0 +1,980 @@
+#!/usr/bin/env python3
+"""
+Pruebas de rendimiento del Sistema de Gestion de Inventarios.
+Genera inventarios sintéticos en un directorio temporal y mide con time.perf_counter
+el costo de las operaciones más frecuentes.
+
+Uso:
+    python benchmark.py diario --tamanos 1000 10000 100000
+    python benchmark.py busqueda --tamanos 100000 1000000
+    python benchmark.py reportes --tamanos 1000000 5000000
+    python benchmark.py producto --tamanos 100000 1000000
+    python benchmark.py carga --tamanos 1000000 20000000   (20M productos ~ 2 GB de JSON)
+    python benchmark.py binario --tamanos 100000 1000000
+    python benchmark.py sqlite --tamanos 10000 100000
+    python benchmark.py diferida --tamanos 10000 100000
+    python benchmark.py concurrencia --tamanos 16 100000
+    python benchmark.py rangos --tamanos 100000 1000000
+    python benchmark.py incremental --tamanos 100000 1000000
+    python benchmark.py fragmentos --tamanos 100000 1000000
+    python benchmark.py generaciones --tamanos 1000 100000 1000000 --salida informe.json
+    python benchmark.py generaciones --tamanos 1000 100000 --comparar informe.json
+    python benchmark.py metricas --tamanos 100000
+    python benchmark.py replicas --tamanos 100000 1000000
+    python benchmark.py difusa --tamanos 10000 100000 1000000
+    python benchmark.py script --tamanos 10000 100000 1000000   (comandos sobre 100000 productos)
+    python benchmark.py movimientos --tamanos 100000 1000000 10000000   (movimientos de 90 días)
+    python benchmark.py cache --tamanos 100000 1000000
+    python benchmark.py listado --tamanos 100000 500000
+    python benchmark.py migracion --tamanos 100000 1000000
+
+Los escenarios solo miden; que las variantes comparadas den los mismos resultados lo
+comprueban las pruebas de tests/ (p. ej. tests/test_benchmark.py y tests/test_concurrencia.py).
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import timeit
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from busqueda_difusa import distancia_edicion, normalizar_palabras, tolerancia
+from cache_lru import CacheLRU
+from comandos_inventario import ejecutar_script
+from inventario import Inventario
+from main import escribir_tabla
+from migracion import DESTINOS, migrar
+from movimientos import RegistroMovimientos
+from lector_json import iterar_arreglo_json
+from producto import Producto
+
+
+def generar_archivo(ruta: str, cantidad_productos: int):
+    """
+    Escribe un inventario JSON sintético con IDs consecutivos desde 1, con el mismo formato
+    que guardar_en_archivo. Se escribe producto a producto para poder generar archivos de varios GB.
+    """
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write('[')
+        for i in range(1, cantidad_productos + 1):
+            fila = {'id': i, 'nombre': f"Producto {i}", 'cantidad': i % 500, 'precio': round(1 + (i % 1000) * 0.5, 2)}
+            separador = ',\n    ' if i > 1 else '\n    '
+            archivo.write(separador + json.dumps(fila, indent=4).replace('\n', '\n    '))
+        archivo.write('\n]' if cantidad_productos else ']')
+
+
+@contextlib.contextmanager
+def directorio_con_inventario(cantidad_productos: int) -> Iterator[Tuple[str, str]]:
+    """Directorio temporal con un inventario sintético en inventario.json. Devuelve (directorio, ruta)."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "inventario.json")
+        generar_archivo(ruta, cantidad_productos)
+        yield directorio, ruta
+
+
+def medir(funcion: Callable[[int], object], repeticiones: int) -> float:
+    """Ejecuta funcion(i) para i en [0, repeticiones) y devuelve los segundos promedio por llamada."""
+    inicio = time.perf_counter()
+    for i in range(repeticiones):
+        funcion(i)
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+class Tabla:
+    """
+    Tabla de resultados que se imprime fila a fila. Cada columna es (título, formato), con el
+    formato de format() para sus valores (p. ej. '>12.3f'); el título se alinea con el mismo
+    ancho. Un valor None se muestra como '-' (la variante no tiene esa medición).
+    """
+
+    def __init__(self, *columnas: Tuple[str, str]):
+        self._formatos = [formato for _, formato in columnas]
+        self._anchos = [re.match(r'[<>^]?\d*', formato).group() for formato in self._formatos]
+        print(" | ".join(format(titulo, ancho) for (titulo, _), ancho in zip(columnas, self._anchos)))
+
+    def fila(self, *valores):
+        print(" | ".join(format('-', ancho) if valor is None else format(valor, formato)
+                         for valor, formato, ancho in zip(valores, self._formatos, self._anchos)))
+
+
+def bench_diario(tamanos: List[int]):
+    """Compara el costo por actualización reescribiendo el archivo completo frente al diario."""
+    tabla = Tabla(('PRODUCTOS', '>10'), ('REESCRITURA (ms)', '>17.3f'), ('DIARIO (ms)', '>12.3f'))
+    for n in tamanos:
+        with directorio_con_inventario(n) as (_, ruta):
+            completo = Inventario(ruta)
+            t_completo = medir(lambda i: completo.actualizar_cantidad(i % n + 1, i), 5)
+
+            con_diario = Inventario(ruta, usar_diario=True, umbral_compactacion=10 ** 9)
+            t_diario = medir(lambda i: con_diario.actualizar_cantidad(i % n + 1, i), 1000)
+        tabla.fila(n, t_completo * 1000, t_diario * 1000)
+
+
+def bench_busqueda(tamanos: List[int]):
+    """Compara buscar_por_nombre (índice de trigramas) con el recorrido lineal original."""
+    consultas = ["producto 12345", "to 99", "uct", "7"]
+    tabla = Tabla(('PRODUCTOS', '>10'), ('CONSULTA', '<16'), ('LINEAL (ms)', '>12.3f'), ('ÍNDICE (ms)', '>12.3f'))
+    for n in tamanos:
+        with directorio_con_inventario(n) as (_, ruta):
+            inventario = Inventario(ruta)
+        productos = list(inventario._productos.values())
+        for consulta in consultas:
+            t_lineal = medir(lambda i: [p for p in productos if consulta in p.nombre.lower()], 3)
+            t_indice = medir(lambda i: inventario.buscar_por_nombre(consulta), 3)
+            tabla.fila(n, consulta, t_lineal * 1000, t_indice * 1000)
+
+
+def bench_reportes(tamanos: List[int]):
+    """Compara los reportes de fin de mes con bucles de Python frente al backend columnar de NumPy."""
+    import numpy as np
+    from inventario_columnar import InventarioColumnar
+
+    tabla = Tabla(('PRODUCTOS', '>10'), ('REPORTE', '<20'), ('BUCLE (ms)', '>11.2f'), ('NUMPY (ms)', '>11.2f'))
+    for n in tamanos:
+        with tempfile.TemporaryDirectory() as directorio:
+            columnar = InventarioColumnar(os.path.join(directorio, "inventario.json"))
+        ids = np.arange(1, n + 1, dtype=np.int64)
+        columnar._anexar_columnas(ids, [f"Producto {i}" for i in range(1, n + 1)],
+                                  ids % 500, np.round(1 + (ids % 1000) * 0.5, 2))
+        productos = [Producto(i, f"Producto {i}", i % 500, round(1 + (i % 1000) * 0.5, 2)) for i in range(1, n + 1)]
+
+        reportes = [
+            ("valor_total", lambda i: sum(p.cantidad * p.precio for p in productos),
+             lambda i: columnar.valor_total()),
+            ("bajo_stock(5)", lambda i: [p for p in productos if p.cantidad < 5],
+             lambda i: columnar.bajo_stock(5)),
+            ("estadisticas_precio", lambda i: (min(p.precio for p in productos), max(p.precio for p in productos),
+                                               sum(p.precio for p in productos) / n),
+             lambda i: columnar.estadisticas_precio()),
+        ]
+        for nombre, bucle, vectorizado in reportes:
+            tabla.fila(n, nombre, medir(bucle, 1) * 1000, medir(vectorizado, 3) * 1000)
+
+
+def _cargar_modulo(nombre: str, ruta: str):
+    """Importa un módulo desde una ruta concreta (las semanas repiten nombres de módulo)."""
+    especificacion = importlib.util.spec_from_file_location(nombre, ruta)
+    modulo = importlib.util.module_from_spec(especificacion)
+    especificacion.loader.exec_module(modulo)
+    return modulo
+
+
+def bench_producto(tamanos: List[int]):
+    """Compara tiempo y memoria al construir productos: clase con __dict__ (semana10) frente a la actual."""
+    directorio_repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ProductoDict = _cargar_modulo(
+        "producto_semana10", os.path.join(directorio_repo, "semana10", "producto_mejorado.py")
+    ).Producto
+
+    def construir_uno_a_uno(clase, filas):
+        return [clase(f['id'], f['nombre'], f['cantidad'], f['precio']) for f in filas]
+
+    variantes = [
+        ("__dict__ + __init__", lambda filas: construir_uno_a_uno(ProductoDict, filas)),
+        ("__slots__ + __init__", lambda filas: construir_uno_a_uno(Producto, filas)),
+        ("desde_filas validando", lambda filas: list(Producto.desde_filas(filas))),
+        ("desde_filas confiable", lambda filas: list(Producto.desde_filas(filas, validar=False))),
+    ]
+    tabla = Tabla(('PRODUCTOS', '>10'), ('VARIANTE', '<22'), ('TIEMPO (ms)', '>12.1f'), ('MEMORIA (MB)', '>13.1f'))
+    for n in tamanos:
+        filas = [{'id': i, 'nombre': f"Producto {i}", 'cantidad': i % 500, 'precio': round(1 + (i % 1000) * 0.5, 2)}
+                 for i in range(1, n + 1)]
+        for nombre, construir in variantes:
+            tiempo = medir(lambda i: construir(filas), 1)
+            tracemalloc.start()
+            productos = construir(filas)
+            memoria = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del productos
+            tabla.fila(n, nombre, tiempo * 1000, memoria / 2 ** 20)
+
+
+def _cargar_completo(ruta: str) -> int:
+    """Carga original: json.load del documento completo y luego un Producto por fila."""
+    with open(ruta, 'r', encoding='utf-8') as archivo:
+        datos = json.load(archivo)
+    productos = {}
+    for item in datos:
+        productos[item['id']] = Producto(item['id'], item['nombre'], item['cantidad'], item['precio'])
+    return len(productos)
+
+
+def _cargar_por_flujo(ruta: str) -> int:
+    """Carga por flujo: los productos se construyen a medida que se analiza el arreglo."""
+    productos = {}
+    with open(ruta, 'rb') as archivo:
+        for producto in Producto.desde_filas(iterar_arreglo_json(archivo)):
+            productos[producto.id] = producto
+    return len(productos)
+
+
+def _medir_en_proceso(funcion: Callable[[str], int], ruta: str):
+    """Se ejecuta en un proceso nuevo para que la memoria máxima medida sea solo la de la carga."""
+    inicio = time.perf_counter()
+    funcion(ruta)
+    segundos = time.perf_counter() - inicio
+    memoria_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return segundos, memoria_kb
+
+
+def bench_carga(tamanos: List[int]):
+    """Compara tiempo y memoria máxima de la carga con json.load frente al lector por flujo."""
+    contexto = multiprocessing.get_context('spawn')
+    tabla = Tabla(('PRODUCTOS', '>10'), ('ARCHIVO (MB)', '>12.1f'), ('MODO', '<10'), ('TIEMPO (s)', '>10.2f'),
+                  ('MEMORIA MÁX (MB)', '>16.1f'))
+    for n in tamanos:
+        with directorio_con_inventario(n) as (_, ruta):
+            tamano_mb = os.path.getsize(ruta) / 2 ** 20
+            for modo, funcion in (("json.load", _cargar_completo), ("flujo", _cargar_por_flujo)):
+                with contexto.Pool(1) as pool:
+                    segundos, memoria_kb = pool.apply(_medir_en_proceso, (funcion, ruta))
+                tabla.fila(n, tamano_mb, modo, segundos, memoria_kb / 1024)
+
+
+def bench_binario(tamanos: List[int]):
+    """Compara el arranque y las consultas por ID del inventario JSON frente al binario mapeado."""
+    from inventario_binario import InventarioBinario, escribir_inventario_binario
+
+    tabla = Tabla(('PRODUCTOS', '>10'), ('FORMATO', '<8'), ('APERTURA (ms)', '>13.1f'), ('BUSCAR ID (us)', '>14.2f'),
+                  ('ACTUALIZAR (us)', '>15.2f'))
+    for n in tamanos:
+        with directorio_con_inventario(n) as (directorio, ruta_json):
+            ruta_bin = os.path.join(directorio, "inventario.bin")
+
+            inicio = time.perf_counter()
+            inventario = Inventario(ruta_json, usar_diario=True, umbral_compactacion=10 ** 9)
+            t_json = time.perf_counter() - inicio
+            escribir_inventario_binario(ruta_bin, inventario.obtener_todos())
+
+            inicio = time.perf_counter()
+            binario = InventarioBinario(ruta_bin)
+            t_bin = time.perf_counter() - inicio
+
+            for formato, inv, apertura in (("json", inventario, t_json), ("binario", binario, t_bin)):
+                t_buscar = medir(lambda i: inv.buscar_por_id(i * 7919 % n + 1), 10000)
+                t_actualizar = medir(lambda i: inv.actualizar_cantidad(i * 7919 % n + 1, i), 1000)
+                tabla.fila(n, formato, apertura * 1000, t_buscar * 1e6, t_actualizar * 1e6)
+            binario.cerrar()
+
+
+def bench_sqlite(tamanos: List[int]):
+    """Compara agregar/actualizar/buscar/listar entre Inventario (JSON completo y con diario) e InventarioSQLite."""
+    from inventario_sqlite import InventarioSQLite
+
+    tabla = Tabla(('PRODUCTOS', '>10'), ('IMPLEMENTACIÓN', '<14'), ('AGREGAR (us)', '>12.1f'),
+                  ('ACTUALIZAR (us)', '>15.1f'), ('BUSCAR (ms)', '>11.2f'), ('LISTAR (ms)', '>11.1f'))
+    for n in tamanos:
+        with directorio_con_inventario(n) as (directorio, ruta_json):
+            sqlite = InventarioSQLite(os.path.join(directorio, "inventario.db"))
+            sqlite.agregar_lote(Inventario(ruta_json).obtener_todos())
+
+            implementaciones = [
+                ("json", Inventario(ruta_json), 3),
+                ("dict + diario", Inventario(ruta_json, usar_diario=True, umbral_compactacion=10 ** 9), 1000),
+                ("sqlite", sqlite, 1000),
+            ]
+            for nombre, inventario, repeticiones in implementaciones:
+                t_agregar = medir(lambda i: inventario.agregar_producto(
+                    Producto(n + 1 + i, f"Nuevo {i}", 1, 1.0)), repeticiones)
+                t_actualizar = medir(lambda i: inventario.actualizar_cantidad(i * 7919 % n + 1, i), repeticiones)
+                t_buscar = medir(lambda i: inventario.buscar_por_nombre("producto 12"), 5)
+                t_listar = medir(lambda i: inventario.obtener_todos(), 3)
+                tabla.fila(n, nombre, t_agregar * 1e6, t_actualizar * 1e6, t_buscar * 1000, t_listar * 1000)
+            sqlite.cerrar()
+
+
+def bench_diferida(tamanos: List[int]):
+    """Mide cuánto bloquea una ráfaga de ediciones con guardado inmediato frente a escritura diferida."""
+    repeticiones = 200
+    tabla = Tabla(('PRODUCTOS', '>10'), ('MODO', '<10'), ('EDICIÓN (us)', '>12.1f'), ('SINCRONIZAR (ms)', '>16.1f'),
+                  ('GUARDADOS', '>9'))
+    for n in tamanos:
+        with directorio_con_inventario(n) as (_, ruta):
+            for modo, espera in (("inmediato", None), ("diferido", 0.5)):
+                inventario = Inventario(ruta, escritura_diferida=espera)
+                guardados = 0
+                guardar_original = inventario.guardar_en_archivo
+
+                def contar_guardado():
+                    nonlocal guardados
+                    guardados += 1
+                    guardar_original()
+
+                inventario.guardar_en_archivo = contar_guardado
+                t_edicion = medir(lambda i: inventario.actualizar_cantidad(i * 7919 % n + 1, i), repeticiones)
+                inicio = time.perf_counter()
+                inventario.cerrar()
+                t_cerrar = time.perf_counter() - inicio
+                tabla.fila(n, modo, t_edicion * 1e6, t_cerrar * 1000, guardados)
+
+
+def _estresar(inventario: Inventario, n: int, hilos: int, operaciones: int) -> tuple:
+    """
+    Lanza varios hilos que suman y descuentan unidades sobre IDs al azar entre 1 y n.
+
+    Returns:
+        (segundos, unidades esperadas al final según las operaciones exitosas, unidades reales)
+    """
+    inicial = sum(producto.cantidad for producto in inventario.obtener_todos())
+    netos = [0] * hilos
+    barrera = threading.Barrier(hilos + 1)
+
+    def trabajar(numero: int):
+        azar = random.Random(numero)
+        barrera.wait()
+        for _ in range(operaciones):
+            id_producto = azar.randint(1, n)
+            if azar.random() < 0.5:
+                if inventario.incrementar_cantidad(id_producto, 1):
+                    netos[numero] += 1
+            elif inventario.decrementar_si_hay(id_producto, 1):
+                netos[numero] -= 1
+
+    trabajadores = [threading.Thread(target=trabajar, args=(i,)) for i in range(hilos)]
+    for trabajador in trabajadores:
+        trabajador.start()
+    barrera.wait()
+    inicio = time.perf_counter()
+    for trabajador in trabajadores:
+        trabajador.join()
+    segundos = time.perf_counter() - inicio
+    final = sum(producto.cantidad for producto in inventario.obtener_todos())
+    return segundos, inicial + sum(netos), final
+
+
+def bench_concurrencia(tamanos: List[int]):
+    """
+    Prueba de estrés con 16 hilos sobre un mismo inventario: compara Inventario sin sincronizar
+    con InventarioConcurrente (1 y 64 franjas) y muestra las actualizaciones perdidas. Que
+    InventarioConcurrente no pierda ninguna lo comprueba tests/test_concurrencia.py.
+    Los guardados se difieren hasta el final para medir solo la contención en memoria.
+    """
+    from inventario_concurrente import InventarioConcurrente
+
+    hilos, operaciones = 16, 20000
+    tabla = Tabla(('PRODUCTOS', '>10'), ('IMPLEMENTACIÓN', '<17'), ('OPS/S', '>10.0f'), ('ESPERADO', '>9'),
+                  ('OBTENIDO', '>9'), ('RESULTADO', ''))
+    intervalo = sys.getswitchinterval()
+    # Cambios de hilo más frecuentes para que las carreras aparezcan en pocas operaciones
+    sys.setswitchinterval(1e-5)
+    try:
+        for n in tamanos:
+            with directorio_con_inventario(n) as (_, ruta):
+                implementaciones = [
+                    ("sin cerrojos", lambda: Inventario(ruta, escritura_diferida=3600)),
+                    ("franjas=1", lambda: InventarioConcurrente(ruta, escritura_diferida=3600, franjas=1)),
+                    ("franjas=64", lambda: InventarioConcurrente(ruta, escritura_diferida=3600, franjas=64)),
+                ]
+                for nombre, crear in implementaciones:
+                    inventario = crear()
+                    segundos, esperado, obtenido = _estresar(inventario, n, hilos, operaciones)
+                    inventario.cerrar()
+                    resultado = "OK" if esperado == obtenido else f"{abs(esperado - obtenido)} perdidas"
+                    tabla.fila(n, nombre, hilos * operaciones / segundos, esperado, obtenido, resultado)
+    finally:
+        sys.setswitchinterval(intervalo)
+
+
+def bench_rangos(tamanos: List[int]):
+    """Compara por_rango_precio y top_k (índices secundarios) con recorrer y ordenar todo el diccionario."""
+    tabla = Tabla(('PRODUCTOS', '>10'), ('CONSULTA', '<26'), ('RECORRIDO (ms)', '>14.2f'), ('ÍNDICE (ms)', '>11.3f'),
+                  ('CREAR ÍNDICE (ms)', '>17.1f'))
+    for n in tamanos:
+        with directorio_con_inventario(n) as (_, ruta):
+            inventario = Inventario(ruta)
+        productos = list(inventario._productos.values())
+
+        inicio = time.perf_counter()
+        inventario.por_rango_precio(0, 0)
+        t_precio = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        inventario.top_k('cantidad', 1)
+        t_cantidad = time.perf_counter() - inicio
+
+        consultas = [
+            ("precio entre 20 y 50", t_precio,
+             lambda i: sorted((p for p in productos if 20 <= p.precio <= 50), key=lambda p: (p.precio, p.id)),
+             lambda i: inventario.por_rango_precio(20, 50)),
+            ("100 con menos stock", t_cantidad,
+             lambda i: sorted(productos, key=lambda p: (p.cantidad, p.id))[:100],
+             lambda i: inventario.top_k('cantidad', 100)),
+        ]
+        for nombre, t_crear, recorrido, indice in consultas:
+            tabla.fila(n, nombre, medir(recorrido, 3) * 1000, medir(indice, 20) * 1000, t_crear * 1000)
+
+
+def bench_incremental(tamanos: List[int]):
+    """
+    Costo de guardar un cambio pequeño (1000 ediciones directas sobre 100 productos) según el
+    tamaño del inventario: instantánea completa frente a segmento con solo los productos marcados.
+    """
+    tabla = Tabla(('PRODUCTOS', '>10'), ('MODO', '<10'), ('GUARDAR (ms)', '>12.2f'), ('BYTES ESCRITOS', '>14'))
+    for n in tamanos:
+        with directorio_con_inventario(n) as (_, ruta):
+            for modo, usar_diario in (("completo", False), ("segmento", True)):
+                inventario = Inventario(ruta, usar_diario=usar_diario, umbral_compactacion=10 ** 9)
+                for i in range(1000):
+                    inventario.buscar_por_id(i % 100 * 7919 % n + 1).cantidad = i
+                destino = inventario._ruta_diario if usar_diario else ruta
+                antes = os.path.getsize(destino) if os.path.exists(destino) else 0
+                inicio = time.perf_counter()
+                inventario.sincronizar()
+                t_guardar = time.perf_counter() - inicio
+                escritos = os.path.getsize(destino) - antes if usar_diario else os.path.getsize(destino)
+                tabla.fila(n, modo, t_guardar * 1000, escritos)
+
+
+def bench_fragmentos(tamanos: List[int]):
+    """
+    Tiempo de arranque con el inventario en un solo archivo y repartido en 1, 4 y 16 fragmentos
+    (leídos en paralelo por un pool de procesos), y costo de guardar un cambio en un producto.
+    """
+    from inventario_fragmentado import InventarioFragmentado
+
+    print(f"Núcleos disponibles: {os.cpu_count()}")
+    tabla = Tabla(('PRODUCTOS', '>10'), ('DISTRIBUCIÓN', '<15'), ('ARRANQUE (s)', '>12.3f'),
+                  ('GUARDAR 1 CAMBIO (ms)', '>21.1f'))
+    for n in tamanos:
+        with directorio_con_inventario(n) as (_, ruta):
+            Inventario(ruta).guardar_en_archivo()  # escribe la suma para que ninguna carga revalide
+            distribuciones = [("un archivo", lambda: Inventario(ruta))]
+            for fragmentos in (1, 4, 16):
+                distribuciones.append((f"{fragmentos} fragmento(s)",
+                                       lambda fragmentos=fragmentos: InventarioFragmentado(ruta, fragmentos=fragmentos)))
+            for nombre, abrir in distribuciones:
+                # La primera apertura redistribuye los archivos de la medición anterior
+                abrir()
+                inicio = time.perf_counter()
+                inventario = abrir()
+                t_carga = time.perf_counter() - inicio
+                inventario.buscar_por_id(1).cantidad += 1
+                inicio = time.perf_counter()
+                inventario.sincronizar()
+                t_guardar = time.perf_counter() - inicio
+                tabla.fila(n, nombre, t_carga, t_guardar * 1000)
+
+
+# Generación -> (directorio, módulo del inventario, módulos hermanos que importa por nombre)
+GENERACIONES = {
+    'semana09': ('semana09', 'inventario.py', ('producto', 'indice_trigramas')),
+    'semana10': ('semana10', 'inventario_mejorado.py', ('producto_mejorado', 'indice_trigramas')),
+    'semana11': ('semana11', 'inventario.py', ()),
+}
+OPERACIONES = ('cargar', 'agregar', 'buscar_id', 'buscar_nombre', 'actualizar', 'listar', 'guardar')
+
+
+def _importar_generacion(generacion: str):
+    """
+    Importa el inventario de una generación y su Producto. Las semanas repiten nombres de
+    módulo (producto, indice_trigramas), así que los de la semana se registran en sys.modules
+    antes de ejecutar el inventario; solo debe hacerse en un proceso dedicado a esa generación.
+    """
+    directorio, archivo, hermanos = GENERACIONES[generacion]
+    ruta = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), directorio)
+    for nombre in hermanos:
+        sys.modules[nombre] = _cargar_modulo(nombre, os.path.join(ruta, nombre + ".py"))
+    modulo = _cargar_modulo(f"inventario_{generacion}", os.path.join(ruta, archivo))
+    return modulo.Inventario, modulo.Producto
+
+
+def _abrir_generacion(generacion: str, ruta: str):
+    """
+    Abre con el inventario de una generación el archivo de datos ruta (solo en un proceso
+    dedicado a esa generación, ver _importar_generacion).
+
+    Returns:
+        (inventario, clase Producto de la generación, segundos de carga o None si no tiene persistencia)
+    """
+    Inventario, Producto = _importar_generacion(generacion)
+    if generacion != 'semana09':
+        inicio = time.perf_counter()
+        inventario = Inventario(ruta, usar_diario=True)
+        return inventario, Producto, time.perf_counter() - inicio
+    # Sin persistencia: se puebla directamente, porque agregar_producto recorre la lista
+    # para comprobar el ID y n altas costarían O(n^2)
+    inventario = Inventario()
+    with open(ruta, 'r', encoding='utf-8') as archivo:
+        for fila in json.load(archivo):
+            producto = Producto(fila['id'], fila['nombre'], fila['cantidad'], fila['precio'])
+            inventario._productos.append(producto)
+            inventario._indice_nombres.agregar(producto, producto.nombre)
+    return inventario, Producto, None
+
+
+def _medir_generacion(generacion: str, ruta_datos: str, n: int) -> Dict[str, Optional[tuple]]:
+    """
+    Se ejecuta en un proceso nuevo: mide cada operación de una generación sobre n productos.
+
+    Returns:
+        Operación -> (segundos por llamada, llamadas medidas), o None si la generación no la tiene
+    """
+    azar = random.Random(n)
+    resultados: Dict[str, Optional[tuple]] = {}
+    ruta = os.path.join(os.path.dirname(ruta_datos), f"{generacion}.json")
+    shutil.copyfile(ruta_datos, ruta)
+
+    def cronometrar(funcion: Callable[[], object]) -> tuple:
+        # Una llamada previa construye los índices perezosos (p. ej. el de nombres de semana11);
+        # luego autorange fija cuántas llamadas suman al menos 0,2 s y, como recomienda timeit,
+        # se toma la mejor de tres series para descontar el ruido de otros procesos
+        funcion()
+        temporizador = timeit.Timer(funcion)
+        llamadas, segundos = temporizador.autorange()
+        segundos = min([segundos] + temporizador.repeat(repeat=2, number=llamadas))
+        return segundos / llamadas, llamadas
+
+    with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+        inventario, Producto, t_cargar = _abrir_generacion(generacion, ruta)
+        resultados['cargar'] = (t_cargar, 1) if t_cargar is not None else None
+        siguiente = iter(range(n + 1, n + 10 ** 9))
+        resultados['agregar'] = cronometrar(
+            lambda: inventario.agregar_producto(Producto(next(siguiente), "Nuevo producto", 1, 1.0)))
+        resultados['buscar_id'] = cronometrar(lambda: inventario.buscar_por_id(azar.randint(1, n)))
+        resultados['buscar_nombre'] = cronometrar(lambda: inventario.buscar_por_nombre(f"producto {n // 2}"))
+        resultados['actualizar'] = cronometrar(lambda: inventario.actualizar_cantidad(azar.randint(1, n), 7))
+        resultados['listar'] = cronometrar(inventario.obtener_todos)
+        resultados['guardar'] = cronometrar(inventario.guardar_en_archivo) if t_cargar is not None else None
+    return resultados
+
+
+def _comparar_informes(anterior: dict, actual: dict, tolerancia: float) -> int:
+    """Informa las mediciones más lentas que en el informe anterior. Devuelve cuántas hay."""
+    previos = {(r['generacion'], r['productos'], r['operacion']): r['segundos'] for r in anterior['resultados']}
+    regresiones = 0
+    for r in actual['resultados']:
+        previo = previos.get((r['generacion'], r['productos'], r['operacion']))
+        if previo is None or r['segundos'] is None:
+            continue
+        if r['segundos'] > previo * (1 + tolerancia):
+            regresiones += 1
+            print(f"[REGRESIÓN] {r['generacion']} {r['operacion']} con {r['productos']} productos: "
+                  f"{previo * 1000:.3f} ms -> {r['segundos'] * 1000:.3f} ms (x{r['segundos'] / previo:.2f})")
+    if not regresiones:
+        print(f"Sin regresiones respecto del informe anterior (tolerancia {tolerancia:.0%})")
+    return regresiones
+
+
+def bench_generaciones(tamanos: List[int], salida: Optional[str] = None, comparar: Optional[str] = None,
+                       tolerancia: float = 0.25) -> int:
+    """
+    Mide las operaciones de las tres generaciones del inventario (lista en memoria de semana09,
+    lista con archivo y diario de semana10, diccionario de semana11) sobre los mismos datos.
+
+    Cada generación se mide en un proceso propio. El informe JSON (--salida) tiene una entrada
+    por generación, tamaño y operación con los segundos por llamada, para compararlo con
+    ejecuciones posteriores (--comparar).
+
+    Returns:
+        Número de regresiones encontradas frente al informe anterior (0 sin --comparar)
+    """
+    contexto = multiprocessing.get_context('spawn')
+    informe = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'nucleos': os.cpu_count(),
+        'resultados': [],
+    }
+    print(f"Tiempo por llamada en ms ('-': la generación no tiene la operación)")
+    tabla = Tabla(('PRODUCTOS', '>10'), ('GENERACIÓN', '<10'), *((operacion, '>13.4f') for operacion in OPERACIONES))
+    for n in tamanos:
+        with directorio_con_inventario(n) as (_, ruta):
+            for generacion in GENERACIONES:
+                with contexto.Pool(1) as pool:
+                    resultados = pool.apply(_medir_generacion, (generacion, ruta, n))
+                celdas = []
+                for operacion in OPERACIONES:
+                    medicion = resultados[operacion]
+                    informe['resultados'].append({
+                        'generacion': generacion,
+                        'productos': n,
+                        'operacion': operacion,
+                        'segundos': medicion[0] if medicion else None,
+                        'repeticiones': medicion[1] if medicion else 0,
+                    })
+                    celdas.append(medicion[0] * 1000 if medicion else None)
+                tabla.fila(n, generacion, *celdas)
+
+    if salida:
+        with open(salida, 'w', encoding='utf-8') as archivo:
+            json.dump(informe, archivo, indent=4, ensure_ascii=False)
+        print(f"Informe escrito en '{salida}'")
+    if comparar:
+        with open(comparar, 'r', encoding='utf-8') as archivo:
+            return _comparar_informes(json.load(archivo), informe, tolerancia)
+    return 0
+
+
+def bench_metricas(tamanos: List[int]):
+    """Costo por llamada de la medición de latencias: nunca activada, activada y desactivada de nuevo."""
+    tabla = Tabla(('PRODUCTOS', '>10'), ('OPERACIÓN', '<12'), ('SIN MEDIR (us)', '>14.3f'), ('MIDIENDO (us)', '>13.3f'),
+                  ('DESACTIVADA (us)', '>16.3f'))
+    for n in tamanos:
+        with directorio_con_inventario(n) as (_, ruta):
+            inventario = Inventario(ruta, escritura_diferida=3600)
+            operaciones = [
+                ("buscar_id", lambda i: inventario.buscar_por_id(i % n + 1)),
+                ("actualizar", lambda i: inventario.actualizar_cantidad(i % n + 1, i % 500)),
+            ]
+            for nombre, operacion in operaciones:
+                tiempos = []
+                for activar in (False, True, False):
+                    if activar:
+                        inventario.activar_metricas()
+                    else:
+                        inventario.desactivar_metricas()
+                    tiempos.append(min(medir(operacion, 100000) for _ in range(3)))
+                tabla.fila(n, nombre, *(t * 1e6 for t in tiempos))
+            inventario.cerrar()
+
+
+TIPOS_DIFUSA = ("Teclado", "Mouse", "Monitor", "Impresora", "Audífonos", "Parlante", "Cargador", "Cámara",
+                "Memoria USB", "Disco Duro", "Router", "Tablet", "Micrófono", "Cable HDMI", "Proyector")
+MARCAS_DIFUSA = ("Logitech", "Samsung", "Epson", "Sony", "Kingston", "Lenovo", "Xiaomi", "Genius",
+                 "Philips", "Corsair", "Razer", "Canon")
+CONSULTAS_DIFUSA = ("Teclao", "Mouce", "Impresra Epzon", "audifonos sonny", "Kingstom memoria")
+
+
+def _nombre_realista(i: int) -> str:
+    # Tipo y marca repetidos y un número de modelo propio: un vocabulario grande como el real
+    return f"{TIPOS_DIFUSA[i % len(TIPOS_DIFUSA)]} {MARCAS_DIFUSA[i // 7 % len(MARCAS_DIFUSA)]} {i * 37 % 100003}"
+
+
+def _buscar_aproximado_lineal(productos: List[Producto], texto: str, limite: int) -> List[int]:
+    """La misma búsqueda que buscar_aproximado, calculando la distancia contra cada nombre."""
+    consulta = [(palabra, tolerancia(palabra)) for palabra in normalizar_palabras(texto)]
+    encontrados = []
+    for producto in productos:
+        palabras = normalizar_palabras(producto.nombre)
+        errores = 0
+        for palabra, maxima in consulta:
+            mejor = min(distancia_edicion(palabra, propia, maxima) for propia in palabras)
+            if mejor > maxima:
+                break
+            errores += mejor
+        else:
+            encontrados.append((errores, producto.id))
+    return [id_producto for _, id_producto in sorted(encontrados)[:limite]]
+
+
+def bench_difusa(tamanos: List[int], limite_lineal: int = 100000):
+    """Compara buscar_aproximado (índice difuso) con calcular la distancia de edición contra cada nombre."""
+    tabla = Tabla(('PRODUCTOS', '>10'), ('CONSULTA', '<18'), ('LINEAL (ms)', '>11.1f'), ('ÍNDICE (ms)', '>11.3f'),
+                  ('CREAR ÍNDICE (ms)', '>17.1f'), ('PRIMERO', '<24'))
+    for n in tamanos:
+        with tempfile.TemporaryDirectory() as directorio:
+            inventario = Inventario(os.path.join(directorio, "inventario.json"))
+            inventario.agregar_lote(Producto(i, _nombre_realista(i), i % 500, 10.0) for i in range(1, n + 1))
+            inventario.cerrar()
+        productos = inventario.obtener_todos()
+
+        inicio = time.perf_counter()
+        inventario.buscar_aproximado("")
+        t_crear = time.perf_counter() - inicio
+        for consulta in CONSULTAS_DIFUSA:
+            t_indice = medir(lambda i: inventario.buscar_aproximado(consulta), 5)
+            resultado = inventario.buscar_aproximado(consulta)
+            t_lineal = None
+            if n <= limite_lineal:
+                t_lineal = medir(lambda i: _buscar_aproximado_lineal(productos, consulta, 10), 1) * 1000
+            tabla.fila(n, consulta, t_lineal, t_indice * 1000, t_crear * 1000,
+                       resultado[0].nombre if resultado else None)
+
+
+def _lineas_script(comandos: int, productos: int) -> List[str]:
+    """Script de mantenimiento sintético: cambios de cantidad y precio, altas y bajas."""
+    lineas = []
+    for i in range(comandos):
+        id_producto = i * 7919 % productos + 1
+        if i % 4 == 0:
+            lineas.append(f"cantidad {id_producto} {i % 500}\n")
+        elif i % 4 == 1:
+            lineas.append(f"precio {id_producto} {1 + i % 1000 * 0.25}\n")
+        elif i % 4 == 2:
+            lineas.append(f"agregar {productos + i} Producto nuevo {i} {i % 50} 9.90\n")
+        else:
+            lineas.append(f"eliminar {productos + i - 1}\n")
+    return lineas
+
+
+def bench_script(tamanos: List[int], productos: int = 100000, limite_uno_a_uno: int = 20000):
+    """Compara el modo --script (una transacción, un guardado) con guardar tras cada comando como el menú."""
+    tabla = Tabla(('COMANDOS', '>10'), ('SCRIPT (s)', '>10.2f'), ('SCRIPT (us/cmd)', '>15.1f'),
+                  ('UNO A UNO (us/cmd)', '>18.1f'))
+    for n in tamanos:
+        lineas = _lineas_script(n, productos)
+        with directorio_con_inventario(productos) as (_, ruta):
+            inventario = Inventario(ruta, usar_diario=True)
+            inicio = time.perf_counter()
+            ejecutar_script(inventario, lineas, io.StringIO())
+            inventario.cerrar()
+            t_script = time.perf_counter() - inicio
+
+            # El menú guarda en el diario después de cada comando
+            generar_archivo(ruta, productos)
+            inventario = Inventario(ruta, usar_diario=True)
+            m = min(n, limite_uno_a_uno)
+            inicio = time.perf_counter()
+            for linea in lineas[:m]:
+                ejecutar_script(inventario, [linea], io.StringIO())
+            t_uno_a_uno = (time.perf_counter() - inicio) / m
+            inventario.cerrar()
+        tabla.fila(n, t_script, t_script / n * 1e6, t_uno_a_uno * 1e6)
+
+
+def bench_movimientos(tamanos: List[int], productos: int = 10000, dias: int = 90):
+    """
+    Costo del registro de movimientos: por cambio de cantidad, al abrir el historial (solo los días
+    de la ventana) y en el reporte de reposición, frente a recorrer todos los movimientos.
+    """
+    tabla = Tabla(('MOVIMIENTOS', '>11'), ('CAMBIO SIN/CON (us)', '>19'), ('ABRIR (ms)', '>10.1f'),
+                  ('LEER TODO (ms)', '>14.1f'), ('REPORTE (ms)', '>12.2f'), ('RECORRER (ms)', '>13.1f'))
+    for n in tamanos:
+        with directorio_con_inventario(productos) as (_, ruta):
+            registro = RegistroMovimientos(ruta + ".mov")
+            inicio_historial = time.time() - dias * 86400
+            for i in range(n):
+                registro.registrar(i * 7919 % productos + 1, -(i % 5 + 1), inicio_historial + i * dias * 86400 / n)
+            registro.volcar()
+
+            t_abrir = medir(lambda i: RegistroMovimientos(ruta + ".mov"), 3)
+            inventario = Inventario(ruta, escritura_diferida=3600, registrar_movimientos=True)
+            t_leer_todo = medir(lambda i: sum(1 for _ in inventario.movimientos.movimientos()), 1)
+
+            t_reporte = medir(lambda i: inventario.reporte_reposicion(7), 5)
+            desde = time.time() - inventario.movimientos.dias_ventana * 86400
+
+            def recorrer(i):
+                # Lo que haría un reporte sin agregados: sumar las salidas de la ventana desde el historial
+                salidas: Dict[int, int] = {}
+                for momento, id_producto, delta in inventario.movimientos.movimientos():
+                    if momento >= desde and delta < 0:
+                        salidas[id_producto] = salidas.get(id_producto, 0) - delta
+                return salidas
+            t_recorrer = medir(recorrer, 1)
+
+            # Cada serie asigna cantidades distintas a las anteriores: un valor igual no es un movimiento
+            sin_registro = Inventario(ruta, escritura_diferida=3600)
+            t_sin = min(medir(lambda i: sin_registro.actualizar_cantidad(i % productos + 1, i % 500 + serie), 20000)
+                        for serie in range(1000, 1003))
+            t_con = min(medir(lambda i: inventario.actualizar_cantidad(i % productos + 1, i % 500 + serie), 20000)
+                        for serie in range(1000, 1003))
+            sin_registro.cerrar()
+            inventario.cerrar()
+        tabla.fila(n, f"{t_sin * 1e6:>9.2f}/{t_con * 1e6:<9.2f}", t_abrir * 1000, t_leer_todo * 1000,
+                   t_reporte * 1000, t_recorrer * 1000)
+
+
+def bench_cache(tamanos: List[int], consultas_distintas: int = 300, busquedas: int = 20000):
+    """
+    buscar_por_nombre con y sin caché para un punto de venta: unas pocas cientos de consultas que
+    se repiten (las primeras mucho más que las últimas), cada una seguida de una venta.
+    """
+    tabla = Tabla(('PRODUCTOS', '>10'), ('SIN CACHÉ (us)', '>14.1f'), ('CON CACHÉ (us)', '>14.1f'), ('ACIERTOS', '>8.1%'))
+    aleatorio = random.Random(7)
+    # Distribución de Zipf: la consulta k se repite en proporción a 1/k
+    pesos = [1 / k for k in range(1, consultas_distintas + 1)]
+    # Números de 4 o 5 cifras: cada consulta coincide con decenas o cientos de productos, no con miles
+    consultas = [f"producto {1000 + k * 31}"
+                 for k in aleatorio.choices(range(1, consultas_distintas + 1), pesos, k=busquedas)]
+    for n in tamanos:
+        with directorio_con_inventario(n) as (_, ruta):
+            inventario = Inventario(ruta, escritura_diferida=3600)
+            inventario.buscar_por_nombre("producto")  # construye el índice de nombres fuera de la medición
+
+            def buscar_y_vender(i):
+                inventario.buscar_por_nombre(consultas[i])
+                inventario.actualizar_cantidad(i % n + 1, i % 500 + 1000)
+
+            tiempos = []
+            for capacidad in (0, inventario.TAMANO_CACHE_BUSQUEDAS):
+                inventario._cache_busquedas = CacheLRU(capacidad)
+                tiempos.append(medir(buscar_y_vender, busquedas))
+            estadisticas = inventario.estadisticas_cache()
+            inventario.cerrar()
+        tabla.fila(n, tiempos[0] * 1e6, tiempos[1] * 1e6, estadisticas['tasa_aciertos'])
+
+
+def _listar_con_print(productos: List[Producto], destino):
+    """El listado anterior a escribir_tabla: un print por producto sobre la lista completa."""
+    print("=" * 70, file=destino)
+    print(f"{'ID':<6} | {'NOMBRE':<22} | {'CANTIDAD':<10} | {'PRECIO':<12}", file=destino)
+    print("=" * 70, file=destino)
+    for producto in productos:
+        print(f"{producto.id:<6} | {producto.nombre:<22} | {producto.cantidad:<10} | ${producto.precio:<11.2f}",
+              file=destino)
+    print("=" * 70, file=destino)
+
+
+def bench_listado(tamanos: List[int]):
+    """
+    Listado completo a un archivo: obtener_todos() con un print por producto frente a recorrer()
+    con escribir_tabla (escrituras por bloques), y memoria adicional que usa cada uno.
+    """
+    tabla = Tabla(('PRODUCTOS', '>10'), ('PRINT (s)', '>9.2f'), ('MEMORIA (MB)', '>12.1f'), ('BLOQUES (s)', '>11.2f'),
+                  ('MEMORIA (MB)', '>12.1f'), ('UNA PÁGINA (ms)', '>15.3f'))
+    for n in tamanos:
+        with directorio_con_inventario(n) as (directorio, ruta):
+            inventario = Inventario(ruta)
+            resultados = []
+            for listar in (lambda destino: _listar_con_print(inventario.obtener_todos(), destino),
+                           lambda destino: escribir_tabla(destino, inventario.recorrer())):
+                with open(os.path.join(directorio, "listado.txt"), 'w', encoding='utf-8', buffering=1 << 20) as destino:
+                    inicio = time.perf_counter()
+                    listar(destino)
+                    transcurrido = time.perf_counter() - inicio
+                # La memoria se mide en otra pasada: tracemalloc hace mucho más lento el listado
+                with open(os.path.join(directorio, "listado.txt"), 'w', encoding='utf-8', buffering=1 << 20) as destino:
+                    tracemalloc.start()
+                    listar(destino)
+                    pico = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                resultados.append((transcurrido, pico / 2 ** 20))
+            t_pagina = medir(lambda i: escribir_tabla(io.StringIO(), inventario.pagina(i + 1, 20)), 100)
+        (t_print, m_print), (t_bloques, m_bloques) = resultados
+        tabla.fila(n, t_print, m_print, t_bloques, m_bloques, t_pagina * 1000)
+
+
+def bench_migracion(tamanos: List[int]):
+    """
+    Migración de un inventario de semana10 (JSON con sangría, con diario) a cada formato:
+    ritmo de lectura y escritura y tiempo de la verificación por sumas.
+    """
+    tabla = Tabla(('PRODUCTOS', '>10'), ('ARCHIVO (MB)', '>12.1f'), ('DESTINO', '<10'), ('ESCRITURA (s)', '>13.2f'),
+                  ('PRODUCTOS/s', '>11,.0f'), ('MB/s', '>6.1f'), ('VERIFICACIÓN (s)', '>16.2f'))
+    for n in tamanos:
+        with tempfile.TemporaryDirectory() as directorio:
+            origen = os.path.join(directorio, "inventario.txt")
+            generar_archivo(origen, n)
+            with open(origen + ".log", 'w', encoding='utf-8') as diario:
+                for i in range(1, min(n, 1000) + 1):
+                    diario.write(json.dumps({'op': 'cantidad', 'id': i * 7919 % n + 1, 'valor': i}) + '\n')
+            tamano_mb = os.path.getsize(origen) / 2 ** 20
+            for destino in DESTINOS:
+                with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+                    resultado = migrar(origen, destino, os.path.join(directorio, f"destino-{destino}"))
+                tabla.fila(n, tamano_mb, destino, resultado.segundos_escritura, resultado.registros_por_segundo,
+                           resultado.mb_por_segundo, resultado.segundos_verificacion)
+
+
+def _memoria_proporcional_kb() -> int:
+    """PSS del proceso: las páginas compartidas cuentan divididas entre los procesos que las usan."""
+    try:
+        with open('/proc/self/smaps_rollup', 'r') as archivo:
+            for linea in archivo:
+                if linea.startswith('Pss:'):
+                    return int(linea.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # sin /proc: memoria máxima (RSS)
+
+
+def _lector(modo: str, ruta: str, barrera, resultados):
+    """Proceso lector: abre el inventario, recorre todos los productos y mide con los demás lectores vivos."""
+    from inventario_binario import ReplicaLectura
+
+    with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+        inicio = time.perf_counter()
+        inventario = Inventario(ruta) if modo == "json" else ReplicaLectura(ruta)
+        segundos = time.perf_counter() - inicio
+        # Una búsqueda sin coincidencias lee todos los nombres (y, en la réplica, todas las páginas)
+        inventario.buscar_por_nombre("sin coincidencias")
+    barrera.wait()
+    resultados.put((segundos, _memoria_proporcional_kb()))
+    barrera.wait()
+
+
+def bench_replicas(tamanos: List[int], lectores: int = 4):
+    """
+    Varios procesos lectores a la vez: cada uno carga su propia copia del JSON, frente a
+    réplicas que mapean la misma instantánea binaria publicada por el inventario.
+    """
+    contexto = multiprocessing.get_context('spawn')
+    print(f"{lectores} lectores simultáneos")
+    tabla = Tabla(('PRODUCTOS', '>10'), ('MODO', '<8'), ('APERTURA MEDIA (ms)', '>19.1f'), ('PSS POR LECTOR (MB)', '>19.1f'),
+                  ('PUBLICAR (ms)', '>13.1f'))
+    for n in tamanos:
+        with directorio_con_inventario(n) as (directorio, ruta):
+            ruta_bin = os.path.join(directorio, "inventario.bin")
+            inventario = Inventario(ruta)
+            inventario.guardar_en_archivo()  # con suma, para que los lectores JSON no revaliden
+            inicio = time.perf_counter()
+            inventario.publicar_instantanea(ruta_bin)
+            t_publicar = time.perf_counter() - inicio
+            del inventario
+
+            for modo, origen in (("json", ruta), ("replica", ruta_bin)):
+                barrera = contexto.Barrier(lectores)
+                resultados = contexto.Queue()
+                procesos = [contexto.Process(target=_lector, args=(modo, origen, barrera, resultados))
+                            for _ in range(lectores)]
+                for proceso in procesos:
+                    proceso.start()
+                medidas = [resultados.get() for _ in procesos]
+                for proceso in procesos:
+                    proceso.join()
+                apertura = sum(m[0] for m in medidas) / lectores
+                pss = sum(m[1] for m in medidas) / lectores / 1024
+                tabla.fila(n, modo, apertura * 1000, pss, t_publicar * 1000 if modo == "replica" else None)
+
+
+# Escenario -> función que lo mide sobre la lista de tamaños
+ESCENARIOS: Dict[str, Callable[[List[int]], object]] = {
+    'diario': bench_diario,
+    'busqueda': bench_busqueda,
+    'reportes': bench_reportes,
+    'producto': bench_producto,
+    'carga': bench_carga,
+    'binario': bench_binario,
+    'sqlite': bench_sqlite,
+    'diferida': bench_diferida,
+    'concurrencia': bench_concurrencia,
+    'rangos': bench_rangos,
+    'incremental': bench_incremental,
+    'fragmentos': bench_fragmentos,
+    'generaciones': bench_generaciones,
+    'metricas': bench_metricas,
+    'replicas': bench_replicas,
+    'difusa': bench_difusa,
+    'script': bench_script,
+    'movimientos': bench_movimientos,
+    'cache': bench_cache,
+    'listado': bench_listado,
+    'migracion': bench_migracion,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento del inventario")
+    parser.add_argument('escenario', choices=list(ESCENARIOS))
+    parser.add_argument('--tamanos', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--salida', help="generaciones: archivo donde escribir el informe JSON")
+    parser.add_argument('--comparar', metavar='INFORME', help="generaciones: informe JSON anterior con el que comparar")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="generaciones: aumento relativo de tiempo a partir del cual se informa una regresión")
+    args = parser.parse_args()
+
+    if args.escenario == 'generaciones':
+        if bench_generaciones(args.tamanos, args.salida, args.comparar, args.tolerancia):
+            sys.exit(1)
+        return
+    ESCENARIOS[args.escenario](args.tamanos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import heapq
+import re
+import unicodedata
+from itertools import product
+from typing import Dict, Hashable, List, Set, Tuple
+
+_PALABRA = re.compile(r'\w+')
+
+
+def normalizar_palabras(texto: str) -> Tuple[str, ...]:
+    """Palabras del texto en minúsculas y sin tildes ('Teléfono Móvil' -> ('telefono', 'movil'))."""
+    descompuesto = unicodedata.normalize('NFKD', texto.lower())
+    sin_tildes = ''.join(caracter for caracter in descompuesto if not unicodedata.combining(caracter))
+    return tuple(_PALABRA.findall(sin_tildes))
+
+
+def tolerancia(palabra: str) -> int:
+    """Errores admitidos según la longitud: ninguno hasta 2 letras, 1 hasta 5 y 2 a partir de 6."""
+    if len(palabra) <= 2:
+        return 0
+    return 1 if len(palabra) <= 5 else 2
+
+
+def distancia_edicion(a: str, b: str, maxima: int) -> int:
+    """
+    Distancia de Damerau-Levenshtein restringida (altas, bajas, sustituciones y transposiciones
+    de letras vecinas). Deja de calcular en cuanto supera 'maxima' y devuelve maxima + 1.
+    """
+    if abs(len(a) - len(b)) > maxima:
+        return maxima + 1
+    anterior2: List[int] = []
+    anterior = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        actual = [i] + [0] * len(b)
+        minimo_fila = i
+        for j in range(1, len(b) + 1):
+            costo = 0 if a[i - 1] == b[j - 1] else 1
+            valor = min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + costo)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                valor = min(valor, anterior2[j - 2] + 1)
+            actual[j] = valor
+            if valor < minimo_fila:
+                minimo_fila = valor
+        if minimo_fila > maxima:
+            return maxima + 1
+        anterior2, anterior = anterior, actual
+    return min(anterior[-1], maxima + 1)
+
+
+class IndiceDifuso:
+    """
+    Índice para búsquedas tolerantes a errores de escritura ('Teclao' encuentra 'Teclado').
+
+    Indexa las palabras distintas de los nombres (no cada nombre), con sus trigramas
+    rellenados con espacios ('  te', ' tec', ..., 'do '), que también capturan errores al
+    principio y al final de la palabra. Un alta, baja o sustitución de letra altera como mucho
+    3 trigramas, así que una palabra a distancia de Levenshtein d de la consulta comparte al
+    menos T - 3d de sus T trigramas: basta con tomar candidatas de las 3d + 1 listas más cortas
+    (filtro por prefijo), descartar por longitud y trigramas compartidos, y solo entonces
+    calcular la distancia de edición. Así una consulta revisa unas pocas palabras, no el
+    inventario completo. Las letras vecinas intercambiadas ('Mosue') alteran 4 trigramas y se
+    buscan aparte, probando directamente cada intercambio en el vocabulario.
+
+    Se mantiene al día con agregar/eliminar, igual que IndiceTrigramas.
+    """
+
+    def __init__(self):
+        self._palabras_de: Dict[Hashable, Tuple[str, ...]] = {}  # clave -> palabras del nombre
+        self._claves: Dict[str, Set[Hashable]] = {}              # palabra -> claves que la contienen
+        self._trigramas: Dict[str, Set[str]] = {}                # trigrama -> palabras que lo contienen
+
+    @staticmethod
+    def _trigramas_de(palabra: str) -> Set[str]:
+        rellena = f"  {palabra} "
+        return {rellena[i:i + 3] for i in range(len(rellena) - 2)}
+
+    def agregar(self, clave: Hashable, nombre: str):
+        """Indexa el nombre de una clave; si la clave ya existía, reemplaza su nombre anterior."""
+        palabras = normalizar_palabras(nombre)
+        if self._palabras_de.get(clave) == palabras:
+            return
+        self.eliminar(clave)
+        self._palabras_de[clave] = palabras
+        for palabra in set(palabras):
+            claves = self._claves.get(palabra)
+            if claves is None:
+                claves = self._claves[palabra] = set()
+                for trigrama in self._trigramas_de(palabra):
+                    self._trigramas.setdefault(trigrama, set()).add(palabra)
+            claves.add(clave)
+
+    def eliminar(self, clave: Hashable):
+        """Quita una clave del índice (no hace nada si no existe)."""
+        palabras = self._palabras_de.pop(clave, None)
+        if palabras is None:
+            return
+        for palabra in set(palabras):
+            claves = self._claves[palabra]
+            claves.discard(clave)
+            if claves:
+                continue
+            # Ningún nombre usa ya la palabra: sale del vocabulario
+            del self._claves[palabra]
+            for trigrama in self._trigramas_de(palabra):
+                palabras_trigrama = self._trigramas[trigrama]
+                palabras_trigrama.discard(palabra)
+                if not palabras_trigrama:
+                    del self._trigramas[trigrama]
+
+    def palabras_parecidas(self, palabra: str) -> List[Tuple[str, int]]:
+        """Palabras del vocabulario a distancia admisible de 'palabra', como (palabra, distancia)."""
+        maxima = tolerancia(palabra)
+        if maxima == 0:
+            return [(palabra, 0)] if palabra in self._claves else []
+
+        propios = self._trigramas_de(palabra)
+        listas = sorted((self._trigramas.get(trigrama, ()) for trigrama in propios), key=len)
+        minimo_compartidos = len(propios) - 3 * maxima
+        # Toda palabra con al menos minimo_compartidos trigramas en común aparece en alguna de estas
+        candidatas = set().union(*listas[:len(listas) - minimo_compartidos + 1])
+        candidatas = {candidata for candidata in candidatas
+                      if abs(len(candidata) - len(palabra)) <= maxima
+                      and sum(1 for lista in listas if candidata in lista) >= minimo_compartidos}
+        for i in range(len(palabra) - 1):
+            intercambiada = palabra[:i] + palabra[i + 1] + palabra[i] + palabra[i + 2:]
+            if intercambiada in self._claves:
+                candidatas.add(intercambiada)
+
+        resultado = []
+        for candidata in candidatas:
+            distancia = distancia_edicion(palabra, candidata, maxima)
+            if distancia <= maxima:
+                resultado.append((candidata, distancia))
+        return resultado
+
+    def buscar(self, texto: str, limite: int = 10) -> List[Tuple[Hashable, int]]:
+        """
+        Claves cuyo nombre contiene, para cada palabra de la consulta, una palabra parecida.
+
+        Returns:
+            Hasta 'limite' pares (clave, errores totales), de menos a más errores y, a igual
+            número de errores, por clave
+        """
+        consulta = normalizar_palabras(texto)
+        if not consulta:
+            return []
+        # Por cada palabra de la consulta, claves con una palabra a distancia <= d, para d = 0, 1, ...
+        hasta_distancia: List[List[Set[Hashable]]] = []
+        for palabra in consulta:
+            opciones = self.palabras_parecidas(palabra)
+            if not opciones:
+                return []
+            niveles = []
+            acumulado: Set[Hashable] = set()
+            for distancia in range(max(d for _, d in opciones) + 1):
+                acumulado = acumulado.union(*(self._claves[p] for p, d in opciones if d == distancia))
+                niveles.append(acumulado)
+            hasta_distancia.append(niveles)
+
+        # Se recorren los totales de errores de menor a mayor con operaciones de conjuntos (sin
+        # calcular los errores de cada clave); basta llegar al total que completa el límite
+        resultado: List[Tuple[Hashable, int]] = []
+        vistas: Set[Hashable] = set()
+        for total in range(sum(len(niveles) for niveles in hasta_distancia) - len(hasta_distancia) + 1):
+            con_total: Set[Hashable] = set()
+            for reparto in product(*(range(len(niveles)) for niveles in hasta_distancia)):
+                if sum(reparto) == total:
+                    conjuntos = sorted((niveles[d] for niveles, d in zip(hasta_distancia, reparto)), key=len)
+                    con_total |= conjuntos[0].intersection(*conjuntos[1:])
+            nuevas = con_total - vistas
+            resultado.extend((clave, total) for clave in heapq.nsmallest(limite - len(resultado), nuevas))
+            if len(resultado) >= limite:
+                break
+            vistas |= nuevas
+        return resultado
+
+    def __len__(self) -> int:
+        return len(self._palabras_de)
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class CacheLRU:
+    """
+    Caché con capacidad acotada que descarta la entrada usada hace más tiempo (LRU).
+
+    Las entradas pertenecen a una versión de los datos: al consultar o guardar con una
+    versión distinta de la vigente se vacía la caché entera de una vez, en O(1) por
+    consulta, sin recorrer las entradas para saber cuáles dependen del cambio.
+
+    Ejemplo:
+        cache = CacheLRU(256)
+        resultado = cache.obtener(consulta, version)
+        if resultado is None:
+            resultado = calcular(consulta)
+            cache.guardar(consulta, version, resultado)
+    """
+
+    def __init__(self, capacidad: int = 256):
+        if capacidad < 0:
+            raise ValueError("La capacidad no puede ser negativa")
+        self.capacidad = capacidad
+        self._entradas: 'OrderedDict[Hashable, object]' = OrderedDict()
+        self._version = None
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0  # veces que un cambio de versión vació la caché
+
+    def _validar_version(self, version: Hashable):
+        if version != self._version:
+            if self._entradas:
+                self._entradas.clear()
+                self.invalidaciones += 1
+            self._version = version
+
+    def obtener(self, clave: Hashable, version: Hashable) -> Optional[object]:
+        """Valor guardado para la clave en esta versión, o None si no está (cuenta un fallo)."""
+        self._validar_version(version)
+        valor = self._entradas.get(clave)
+        if valor is None:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return valor
+
+    def guardar(self, clave: Hashable, version: Hashable, valor: object):
+        """Guarda un valor (distinto de None) calculado con los datos de esa versión."""
+        if self.capacidad == 0:
+            return
+        self._validar_version(version)
+        self._entradas[clave] = valor
+        self._entradas.move_to_end(clave)
+        if len(self._entradas) > self.capacidad:
+            self._entradas.popitem(last=False)
+
+    def vaciar(self):
+        self._entradas.clear()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def estadisticas(self) -> dict:
+        """Aciertos, fallos, tasa de aciertos (0 a 1), invalidaciones, entradas y capacidad."""
+        consultas = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+            'invalidaciones': self.invalidaciones,
+            'entradas': len(self._entradas),
+            'capacidad': self.capacidad,
+        }
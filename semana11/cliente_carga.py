@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Generador de carga para servidor.py.
+
+Abre muchas conexiones simultáneas, envía peticiones con pipelining (varias en vuelo por
+conexión) y mide la latencia de cada una, desde que se escribe hasta que llega su respuesta.
+
+Uso:
+    python servidor.py --archivo inventario.json &
+    python cliente_carga.py --conexiones 2000 --peticiones 100 --profundidad 4
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from typing import List
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _peticion(numero: int, azar: random.Random, productos: int) -> bytes:
+    """Mezcla típica de un punto de venta: mayoría de consultas y algunos movimientos de stock."""
+    id_producto = azar.randint(1, productos)
+    sorteo = azar.random()
+    if sorteo < 0.8:
+        peticion = {'id': numero, 'op': 'buscar_id', 'id_producto': id_producto}
+    elif sorteo < 0.9:
+        peticion = {'id': numero, 'op': 'incrementar', 'id_producto': id_producto, 'delta': 1}
+    else:
+        peticion = {'id': numero, 'op': 'decrementar_si_hay', 'id_producto': id_producto, 'cantidad': 1}
+    return json.dumps(peticion, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+async def _cliente(numero: int, argumentos: argparse.Namespace, apertura: asyncio.Semaphore,
+                   inicio: asyncio.Event, listos: List[int], latencias: List[float], errores: List[int]):
+    async with apertura:
+        lector, escritor = await asyncio.open_connection(argumentos.host, argumentos.puerto)
+    listos[0] += 1
+    await inicio.wait()
+
+    azar = random.Random(numero)
+    en_vuelo = deque()  # momentos de envío; las respuestas llegan en el mismo orden
+    enviadas = 0
+    try:
+        while enviadas < argumentos.peticiones or en_vuelo:
+            # Mantiene 'profundidad' peticiones en vuelo sin esperar respuestas
+            lote = []
+            while enviadas < argumentos.peticiones and len(en_vuelo) < argumentos.profundidad:
+                lote.append(_peticion(enviadas, azar, argumentos.productos))
+                en_vuelo.append(time.perf_counter())
+                enviadas += 1
+            if lote:
+                escritor.write(b''.join(lote))
+                await escritor.drain()
+            linea = await lector.readline()
+            if not linea:
+                raise ConnectionError("El servidor cerró la conexión")
+            latencias.append(time.perf_counter() - en_vuelo.popleft())
+            if not json.loads(linea)['ok']:
+                errores[0] += 1
+    finally:
+        escritor.close()
+
+
+def _percentil(ordenados: List[float], p: float) -> float:
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+async def ejecutar(argumentos: argparse.Namespace):
+    apertura = asyncio.Semaphore(argumentos.apertura)
+    inicio = asyncio.Event()
+    listos, errores = [0], [0]
+    latencias: List[float] = []
+    tareas = [asyncio.create_task(_cliente(i, argumentos, apertura, inicio, listos, latencias, errores))
+              for i in range(argumentos.conexiones)]
+
+    # Se espera a que todas las conexiones estén abiertas para medir con la concurrencia pedida
+    while listos[0] < argumentos.conexiones and not any(t.done() for t in tareas):
+        await asyncio.sleep(0.05)
+    comienzo = time.perf_counter()
+    inicio.set()
+    resultados = await asyncio.gather(*tareas, return_exceptions=True)
+    segundos = time.perf_counter() - comienzo
+
+    fallidas = [r for r in resultados if isinstance(r, BaseException)]
+    if not latencias:
+        print(f"[ERROR] Ninguna petición completada: {fallidas[0] if fallidas else 'sin respuesta'}")
+        return
+    latencias.sort()
+    print(f"Conexiones: {argumentos.conexiones} | Profundidad: {argumentos.profundidad} | "
+          f"Peticiones: {len(latencias)} en {segundos:.2f} s ({len(latencias) / segundos:.0f}/s)")
+    print(f"Latencia (ms): p50 {_percentil(latencias, 50) * 1000:.2f} | p90 {_percentil(latencias, 90) * 1000:.2f} | "
+          f"p99 {_percentil(latencias, 99) * 1000:.2f} | máx {latencias[-1] * 1000:.2f}")
+    if errores[0] or fallidas:
+        print(f"[ADVERTENCIA] {errores[0]} respuesta(s) con error, {len(fallidas)} conexión(es) fallida(s)")
+        if fallidas:
+            print(f"  Primer fallo: {fallidas[0]!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de carga para el servidor de inventario")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--conexiones', type=int, default=1000)
+    parser.add_argument('--peticiones', type=int, default=100, help="Peticiones por conexión")
+    parser.add_argument('--profundidad', type=int, default=4, help="Peticiones en vuelo por conexión")
+    parser.add_argument('--productos', type=int, default=3, help="IDs consultados: de 1 a PRODUCTOS")
+    parser.add_argument('--apertura', type=int, default=256, help="Conexiones que se abren a la vez")
+    argumentos = parser.parse_args()
+
+    if resource is not None:
+        # Cada conexión usa un descriptor de archivo; se sube el límite blando hasta el máximo permitido
+        _, maximo = resource.getrlimit(resource.RLIMIT_NOFILE)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (maximo, maximo))
+        except (ValueError, OSError):
+            pass
+    asyncio.run(ejecutar(argumentos))
+
+
+if __name__ == "__main__":
+    main()
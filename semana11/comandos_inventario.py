@@ -0,0 +1,196 @@
+import csv
+import io
+import shlex
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, TextIO, Tuple
+
+from producto import Producto
+
+AYUDA = """Comandos (uno por línea; las líneas vacías y las que empiezan con # se ignoran):
+    agregar ID NOMBRE CANTIDAD PRECIO
+    eliminar ID
+    cantidad ID CANTIDAD
+    precio ID PRECIO
+    nombre ID NOMBRE
+    incrementar ID DELTA
+    buscar TEXTO
+    listar
+Los nombres pueden llevar espacios sin comillas; con comillas se separan como en la consola."""
+
+
+class ResultadoScript:
+    """Resumen de un script: comandos ejecutados y líneas con error con su motivo."""
+
+    def __init__(self):
+        self.ejecutados = 0
+        self.errores: List[Tuple[int, str]] = []  # (número de línea, motivo)
+
+
+class _SalidaConBuffer:
+    """Acumula la salida en memoria y la escribe en bloques grandes en lugar de línea a línea."""
+
+    def __init__(self, destino: TextIO, tamano_bloque: int = 1 << 20):
+        self._destino = destino
+        self._tamano_bloque = tamano_bloque
+        self._buffer = io.StringIO()
+        self.escritor = csv.writer(self._buffer, lineterminator='\n')
+
+    def escribir_productos(self, encabezado: str, productos: Iterable[Producto], filas_por_bloque: int = 10000):
+        self._buffer.write(encabezado + '\n')
+        filas = ((p.id, p.nombre, p.cantidad, f"{p.precio:.2f}") for p in productos)
+        # De a bloques, para que un listado largo no se acumule entero en memoria
+        while True:
+            bloque = list(islice(filas, filas_por_bloque))
+            if not bloque:
+                return
+            self.escritor.writerows(bloque)
+            if self._buffer.tell() >= self._tamano_bloque:
+                self.volcar()
+
+    def volcar(self):
+        self._destino.write(self._buffer.getvalue())
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+
+def _separar(linea: str) -> List[str]:
+    # shlex es unas 20 veces más lento que split: solo se usa si la línea tiene comillas
+    if '"' in linea or "'" in linea:
+        return shlex.split(linea)
+    return linea.split()
+
+
+def _entero(texto: str, campo: str) -> int:
+    try:
+        return int(texto)
+    except ValueError:
+        raise ValueError(f"{campo} debe ser un número entero: {texto!r}")
+
+
+def _numero(texto: str, campo: str) -> float:
+    try:
+        return float(texto)
+    except ValueError:
+        raise ValueError(f"{campo} debe ser un número: {texto!r}")
+
+
+def _existente(resultado: bool, id_producto: int):
+    if not resultado:
+        raise ValueError(f"No existe producto con ID {id_producto}")
+
+
+def _agregar(inventario, argumentos: List[str], salida: _SalidaConBuffer):
+    if len(argumentos) < 4:
+        raise ValueError("uso: agregar ID NOMBRE CANTIDAD PRECIO")
+    id_producto = _entero(argumentos[0], "El ID")
+    producto = Producto(id_producto, ' '.join(argumentos[1:-2]),
+                        _entero(argumentos[-2], "La cantidad"), _numero(argumentos[-1], "El precio"))
+    if not inventario.agregar_producto(producto):
+        raise ValueError(f"Ya existe un producto con ID {id_producto}")
+
+
+def _eliminar(inventario, argumentos: List[str], salida: _SalidaConBuffer):
+    if len(argumentos) != 1:
+        raise ValueError("uso: eliminar ID")
+    id_producto = _entero(argumentos[0], "El ID")
+    _existente(inventario.eliminar_producto(id_producto), id_producto)
+
+
+def _cantidad(inventario, argumentos: List[str], salida: _SalidaConBuffer):
+    if len(argumentos) != 2:
+        raise ValueError("uso: cantidad ID CANTIDAD")
+    id_producto = _entero(argumentos[0], "El ID")
+    _existente(inventario.actualizar_cantidad(id_producto, _entero(argumentos[1], "La cantidad")), id_producto)
+
+
+def _precio(inventario, argumentos: List[str], salida: _SalidaConBuffer):
+    if len(argumentos) != 2:
+        raise ValueError("uso: precio ID PRECIO")
+    id_producto = _entero(argumentos[0], "El ID")
+    _existente(inventario.actualizar_precio(id_producto, _numero(argumentos[1], "El precio")), id_producto)
+
+
+def _nombre(inventario, argumentos: List[str], salida: _SalidaConBuffer):
+    if len(argumentos) < 2:
+        raise ValueError("uso: nombre ID NOMBRE")
+    id_producto = _entero(argumentos[0], "El ID")
+    _existente(inventario.actualizar_nombre(id_producto, ' '.join(argumentos[1:])), id_producto)
+
+
+def _incrementar(inventario, argumentos: List[str], salida: _SalidaConBuffer):
+    if len(argumentos) != 2:
+        raise ValueError("uso: incrementar ID DELTA")
+    id_producto = _entero(argumentos[0], "El ID")
+    _existente(inventario.incrementar_cantidad(id_producto, _entero(argumentos[1], "El delta")), id_producto)
+
+
+def _buscar(inventario, argumentos: List[str], salida: _SalidaConBuffer):
+    if not argumentos:
+        raise ValueError("uso: buscar TEXTO")
+    texto = ' '.join(argumentos)
+    resultados = inventario.buscar_por_nombre(texto)
+    salida.escribir_productos(f"# buscar {texto}: {len(resultados)} producto(s)", resultados)
+
+
+def _listar(inventario, argumentos: List[str], salida: _SalidaConBuffer):
+    if argumentos:
+        raise ValueError("uso: listar")
+    salida.escribir_productos(f"# listar: {inventario.obtener_tamaño()} producto(s)", inventario.recorrer())
+
+
+COMANDOS: Dict[str, Callable[[object, List[str], _SalidaConBuffer], None]] = {
+    'agregar': _agregar,
+    'eliminar': _eliminar,
+    'cantidad': _cantidad,
+    'precio': _precio,
+    'nombre': _nombre,
+    'incrementar': _incrementar,
+    'buscar': _buscar,
+    'listar': _listar,
+}
+
+
+def ejecutar_script(inventario, lineas: Iterable[str], salida: TextIO, estricto: bool = False) -> ResultadoScript:
+    """
+    Ejecuta un script de comandos (ver AYUDA) sin pedir datos ni confirmaciones.
+
+    Todos los comandos se aplican dentro de una sola transacción, así que el inventario se
+    persiste una única vez al final, sin importar cuántos comandos tenga el script. Los
+    resultados de buscar y listar se escriben en 'salida' como filas CSV
+    (id,nombre,cantidad,precio), precedidas por una línea '# comando: N producto(s)'.
+
+    Args:
+        inventario: Inventario (o cualquier implementación con transaccion y los métodos CRUD)
+        lineas: Líneas del script, p. ej. un archivo abierto o sys.stdin
+        salida: Destino de los resultados de las consultas
+        estricto: Si es True, el primer error detiene el script y se descartan todos sus cambios.
+            Si es False, las líneas con error se informan en el resultado y se continúa
+
+    Raises:
+        ValueError: En modo estricto, el primer comando inválido o que no se pudo aplicar
+        PermissionError, Exception: Si falla el guardado final (los cambios quedan en memoria)
+    """
+    resultado = ResultadoScript()
+    buffer = _SalidaConBuffer(salida)
+    try:
+        with inventario.transaccion():
+            for numero, linea in enumerate(lineas, start=1):
+                linea = linea.strip()
+                if not linea or linea.startswith('#'):
+                    continue
+                try:
+                    palabras = _separar(linea)
+                    comando = COMANDOS.get(palabras[0].lower())
+                    if comando is None:
+                        raise ValueError(f"comando desconocido: {palabras[0]!r}")
+                    comando(inventario, palabras[1:], buffer)
+                except ValueError as e:
+                    # ValueError cubre también las validaciones de Producto y las comillas sin cerrar
+                    if estricto:
+                        raise ValueError(f"Línea {numero}: {e}")
+                    resultado.errores.append((numero, str(e)))
+                    continue
+                resultado.ejecutados += 1
+    finally:
+        buffer.volcar()
+    return resultado
@@ -0,0 +1,150 @@
+import csv
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from producto import Producto
+
+ENCABEZADO = ['id', 'nombre', 'cantidad', 'precio']
+# Bloques en vuelo por proceso del pool: mantiene ocupados a los procesos sin leer el archivo entero
+BLOQUES_POR_PROCESO = 2
+
+
+class ResultadoImportacion:
+    """Resumen de una importación: productos agregados y líneas rechazadas con su motivo."""
+
+    def __init__(self):
+        self.agregados = 0
+        self.rechazados: List[Tuple[int, str]] = []  # (número de línea, motivo)
+
+
+def _validar_bloque(bloque: Tuple[int, List[str]]) -> Tuple[List[Tuple[int, dict]], List[Tuple[int, str]]]:
+    """
+    Analiza y valida un bloque de líneas CSV (se ejecuta en un proceso del pool).
+
+    Args:
+        bloque: (número de la primera línea, líneas del bloque)
+
+    Returns:
+        Filas válidas (número de línea, diccionario) y líneas rechazadas con su motivo
+    """
+    primera_linea, lineas = bloque
+    validas: List[Tuple[int, dict]] = []
+    rechazadas: List[Tuple[int, str]] = []
+    for numero, campos in enumerate(csv.reader(lineas), start=primera_linea):
+        if not campos:
+            continue
+        if len(campos) != 4:
+            rechazadas.append((numero, f"se esperaban 4 columnas y hay {len(campos)}"))
+            continue
+        try:
+            id_producto, cantidad, precio = int(campos[0]), int(campos[2]), float(campos[3])
+        except ValueError:
+            rechazadas.append((numero, "id y cantidad deben ser enteros y precio un número"))
+            continue
+        try:
+            # El constructor de Producto aplica las mismas validaciones que el menú
+            producto = Producto(id_producto, campos[1], cantidad, precio)
+        except ValueError as e:
+            rechazadas.append((numero, str(e)))
+            continue
+        validas.append((numero, producto.to_dict()))
+    return validas, rechazadas
+
+
+def _bloques(archivo, tamano_bloque: int) -> Iterator[Tuple[int, List[str]]]:
+    """Divide el archivo en bloques de líneas, conservando el número de la primera línea."""
+    numero = 1
+    primera = archivo.readline()
+    if primera and [c.strip().lower() for c in next(csv.reader([primera]), [])] != ENCABEZADO:
+        yield numero, [primera]  # Sin encabezado: la primera línea también es un producto
+    numero += 1
+    while True:
+        lineas = list(islice(archivo, tamano_bloque))
+        if not lineas:
+            return
+        yield numero, lineas
+        numero += len(lineas)
+
+
+def _mapear_en_ventana(pool: Executor, funcion: Callable, elementos: Iterable, ventana: int) -> Iterator:
+    """
+    Como pool.map, pero con a lo sumo 'ventana' tareas enviadas y sin consumir: el siguiente
+    elemento se lee de 'elementos' solo cuando se entrega un resultado, de modo que la memoria
+    no depende del tamaño de la entrada. Los resultados se entregan en orden.
+    """
+    pendientes = deque()
+    for elemento in elementos:
+        if len(pendientes) >= ventana:
+            yield pendientes.popleft().result()
+        pendientes.append(pool.submit(funcion, elemento))
+    while pendientes:
+        yield pendientes.popleft().result()
+
+
+def importar_csv(inventario, ruta: str, procesos: Optional[int] = None,
+                 tamano_bloque: int = 50000) -> ResultadoImportacion:
+    """
+    Importa productos desde un CSV (id,nombre,cantidad,precio) validando los bloques en paralelo.
+
+    Las filas válidas se agregan con una sola escritura en disco mediante agregar_lote.
+    Se rechazan (sin detener la importación) las filas mal formadas, las que no superan las
+    validaciones de Producto y las de IDs ya existentes o repetidos en el archivo.
+    Los nombres no deben contener saltos de línea, porque el archivo se divide por líneas.
+
+    Args:
+        inventario: Inventario (o cualquier implementación con agregar_lote y buscar_por_id)
+        ruta: Archivo CSV en UTF-8, con o sin fila de encabezado
+        procesos: Procesos del pool (por defecto, los núcleos disponibles)
+        tamano_bloque: Líneas que valida cada tarea del pool
+    """
+    resultado = ResultadoImportacion()
+    filas: List[dict] = []
+    vistos = set()
+
+    with open(ruta, 'r', encoding='utf-8', newline='') as archivo:
+        bloques = _bloques(archivo, tamano_bloque)
+        if os.path.getsize(ruta) < 1 << 20:
+            # Para archivos pequeños el arranque del pool cuesta más que validar en este proceso
+            resultados = map(_validar_bloque, bloques)
+            pool = None
+        else:
+            procesos = procesos or os.cpu_count() or 1
+            pool = ProcessPoolExecutor(max_workers=procesos)
+            resultados = _mapear_en_ventana(pool, _validar_bloque, bloques, procesos * BLOQUES_POR_PROCESO)
+        try:
+            for validas, rechazadas in resultados:
+                resultado.rechazados.extend(rechazadas)
+                for numero, fila in validas:
+                    if fila['id'] in vistos or inventario.buscar_por_id(fila['id']) is not None:
+                        resultado.rechazados.append((numero, f"ID {fila['id']} duplicado"))
+                        continue
+                    vistos.add(fila['id'])
+                    filas.append(fila)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    # Las filas ya se validaron en los procesos del pool
+    resultado.agregados = inventario.agregar_lote(Producto.desde_filas(filas, validar=False))
+    resultado.rechazados.sort()
+    return resultado
+
+
+def exportar_csv(inventario, ruta: str) -> int:
+    """
+    Exporta el inventario completo, ordenado por ID, a un archivo CSV con encabezado.
+
+    Returns:
+        Número de productos exportados
+    """
+    total = 0
+    with open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(ENCABEZADO)
+        for producto in inventario.obtener_todos():
+            escritor.writerow((producto.id, producto.nombre, producto.cantidad, f"{producto.precio:.2f}"))
+            total += 1
+    return total
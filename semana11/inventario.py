@@ -1,6 +1,46 @@
+import hashlib
 import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+from operator import attrgetter
 from producto import Producto
-from typing import Dict, List, Optional
+from lector_json import iterar_arreglo_json
+from indice_trigramas import IndiceTrigramas
+from busqueda_difusa import IndiceDifuso
+from cache_lru import CacheLRU
+from lista_ordenada import ListaOrdenada
+from metricas import Metricas, desinstrumentar, instrumentar
+from inventario_binario import publicar_inventario_binario
+from movimientos import RegistroMovimientos, calcular_reposicion
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+_cadena_json = json.encoder.encode_basestring_ascii
+
+
+def _numero_json(valor) -> str:
+    # repr coincide con json.dumps para números finitos; NaN/Infinity se delegan a json
+    return repr(valor) if not isinstance(valor, float) or math.isfinite(valor) else json.dumps(valor)
+
+
+def _serializar_productos(productos: Iterable[Producto]) -> bytes:
+    """
+    Genera exactamente el mismo texto que json.dumps([...to_dict()], indent=4).
+
+    Con indent, el módulo json usa su codificador en Python puro; armar cada bloque con
+    f-strings y el codificador de cadenas en C es varias veces más rápido en inventarios grandes.
+    """
+    bloques = [
+        f'    {{\n        "id": {producto.id},\n        "nombre": {_cadena_json(producto.nombre)},\n'
+        f'        "cantidad": {producto.cantidad},\n        "precio": {_numero_json(producto.precio)}\n    }}'
+        for producto in productos
+    ]
+    if not bloques:
+        return b'[]'
+    return ('[\n' + ',\n'.join(bloques) + '\n]').encode('ascii')
 
 class Inventario:
     """
@@ -8,103 +48,939 @@ class Inventario:
     Implementa operaciones CRUD optimizadas utilizando un Diccionario.
     """
 
-    def __init__(self, ruta_archivo: str = "inventario.json"):
-        """Inicializa el inventario y carga los datos desde el archivo"""
+    # Con escritura diferida, máximo de intervalos de espera que puede demorarse un guardado
+    MAXIMO_ESPERAS = 10
+    # Campos con índice ordenado para consultas por rango y top_k
+    CAMPOS_INDEXADOS = ('precio', 'cantidad')
+    # Búsquedas por nombre distintas que se recuerdan, y resultados máximos de una búsqueda recordada
+    TAMANO_CACHE_BUSQUEDAS = 256
+    MAXIMO_RESULTADOS_CACHE = 10000
+    # Métodos cuyo conteo y latencia se registran con activar_metricas
+    METODOS_MEDIDOS = (
+        'cargar_desde_archivo', 'guardar_en_archivo', 'compactar', 'sincronizar', '_persistir',
+        'agregar_producto', 'eliminar_producto', 'actualizar_cantidad', 'actualizar_precio',
+        'actualizar_nombre', 'incrementar_cantidad', 'decrementar_si_hay', 'agregar_lote', 'actualizar_lote',
+        'buscar_por_id', 'buscar_por_nombre', 'buscar_aproximado', 'obtener_todos', 'pagina',
+        'por_rango_precio', 'por_rango_cantidad', 'top_k', 'reporte_reposicion',
+    )
+
+    def __init__(self, ruta_archivo: str = "inventario.json", usar_diario: bool = False,
+                 umbral_compactacion: int = 1000, progreso: Optional[Callable[[int, int], None]] = None,
+                 escritura_diferida: Optional[float] = None, metricas: Optional[Metricas] = None,
+                 registrar_movimientos: bool = False):
+        """
+        Inicializa el inventario y carga los datos desde el archivo.
+
+        Args:
+            ruta_archivo: Ruta del archivo JSON (instantánea completa del inventario)
+            usar_diario: Si es True, cada guardado añade a un segmento (ruta_archivo + '.log')
+                solo los productos modificados, agregados o eliminados, en lugar de
+                reescribir todo el archivo
+            umbral_compactacion: Número de registros del diario tras el cual se vuelca
+                una nueva instantánea y se vacía el diario; también es el tamaño a partir
+                del cual agregar_lote inserta en bloque y guarda una instantánea completa
+            progreso: Función opcional que recibe (bytes leídos, bytes totales) durante la carga
+            escritura_diferida: Segundos sin cambios tras los cuales un hilo en segundo plano
+                guarda los cambios acumulados. Con None (por defecto) cada cambio se guarda
+                antes de que el método retorne
+            metricas: Si se indica, registra en ella el conteo y la latencia de METODOS_MEDIDOS
+                desde la carga inicial (ver activar_metricas)
+            registrar_movimientos: Si es True, cada cambio de cantidad se registra con su fecha
+                en ruta_archivo + '.mov' (ver movimientos y reporte_reposicion)
+        """
         # Usamos un diccionario (Dict) para búsquedas rápidas usando el ID como llave
         self._productos: Dict[int, Producto] = {}
+        # Índice de trigramas sobre los nombres; se construye en la primera búsqueda por nombre
+        self._indice_nombres: Optional[IndiceTrigramas] = None
+        # Índice de palabras tolerante a errores; se construye en la primera búsqueda aproximada
+        self._indice_difuso: Optional[IndiceDifuso] = None
+        # Resultados de buscar_por_nombre por consulta normalizada. Solo se invalidan cuando cambia
+        # el conjunto de nombres (altas, bajas y renombres), no con los cambios de cantidad o precio
+        self._version_nombres = 0
+        self._cache_busquedas = CacheLRU(self.TAMANO_CACHE_BUSQUEDAS)
+        # IDs en orden ascendente, mantenidos en cada alta/baja para listar sin ordenar
+        self._ids_ordenados = ListaOrdenada()
+        # Índices secundarios de pares (valor, id) por campo ('precio', 'cantidad'); cada uno se
+        # construye en la primera consulta por ese campo y luego lo actualizan los setters de Producto
+        self._indices_valores: Dict[str, ListaOrdenada] = {}
         self._ruta_archivo = ruta_archivo
+        # Suma SHA-256 del último archivo escrito; si coincide al cargar, se omite la validación
+        self._ruta_suma = ruta_archivo + ".sha256"
+        self._usar_diario = usar_diario
+        self._ruta_diario = ruta_archivo + ".log"
+        self._umbral_compactacion = umbral_compactacion
+        self._entradas_diario = 0
+        self._progreso = progreso
+        # IDs modificados, agregados o eliminados desde el último guardado (los marcan los
+        # setters de Producto y las altas y bajas); solo ellos se escriben en el siguiente guardado
+        self._sucios: Set[int] = set()
+        # Aumenta con cada cambio (también los que no pasan por el diario), para saber si hubo
+        # cambios desde un momento dado sin comparar productos
+        self._version = 0
+        # Transacción activa y estado previo de cada ID que modificó
+        self._en_transaccion = False
+        self._respaldo: Dict[int, Optional[Tuple[Producto, str, int, float]]] = {}
+        # Escritura diferida: momentos del primer y último cambio sin guardar y error del último intento
+        self._espera_escritura = escritura_diferida
+        self._primer_cambio = -1.0  # -1: no hay cambios esperando al hilo de escritura
+        self._ultimo_cambio = 0.0
+        self._error_escritura: Optional[Exception] = None
+        self._condicion_escritura = threading.Condition()
+        self._hilo_escritura: Optional[threading.Thread] = None
+        self._cerrando = False
+        # Serializa todas las escrituras en disco (hilo de escritura, compactar y guardados explícitos)
+        self._cerrojo_disco = threading.RLock()
+        # Historial de cambios de cantidad con las salidas de los últimos días por producto
+        self._movimientos: Optional[RegistroMovimientos] = None
+        if registrar_movimientos:
+            self._movimientos = RegistroMovimientos(ruta_archivo + ".mov")
+        self._metricas: Optional[Metricas] = None
+        if metricas is not None:
+            self.activar_metricas(metricas)
         self.cargar_desde_archivo()
 
+    @property
+    def movimientos(self) -> Optional[RegistroMovimientos]:
+        """Registro de movimientos de stock, o None si no se registran."""
+        return self._movimientos
+
+    @property
+    def escritura_diferida(self) -> Optional[float]:
+        """Segundos de espera de la escritura diferida, o None si cada cambio se guarda al momento."""
+        return self._espera_escritura
+
+    @property
+    def metricas(self) -> Optional[Metricas]:
+        """Métricas en las que se registran las operaciones, o None si la medición está desactivada."""
+        return self._metricas
+
+    def activar_metricas(self, metricas: Optional[Metricas] = None) -> Metricas:
+        """
+        Empieza a registrar el conteo y la latencia de cada llamada a METODOS_MEDIDOS.
+
+        Los métodos se envuelven solo en esta instancia, así que con la medición desactivada
+        (el caso por defecto) las operaciones no tienen ningún costo adicional.
+
+        Returns:
+            Las métricas en uso (una nueva si no se indica ninguna)
+        """
+        self.desactivar_metricas()
+        self._metricas = metricas if metricas is not None else Metricas()
+        instrumentar(self, self.METODOS_MEDIDOS, self._metricas)
+        return self._metricas
+
+    def desactivar_metricas(self):
+        """Deja de medir; las métricas ya registradas se conservan en el objeto Metricas."""
+        desinstrumentar(self, self.METODOS_MEDIDOS)
+        self._metricas = None
+
     def cargar_desde_archivo(self):
-        """Lee el archivo JSON y reconstruye el inventario en el diccionario."""
+        """
+        Lee el archivo JSON por bloques y reconstruye el inventario en el diccionario.
+
+        Los productos se construyen a medida que se analiza el arreglo, sin cargar el
+        documento completo en memoria, por lo que el consumo máximo es cercano al del
+        inventario final.
+        """
         try:
-            with open(self._ruta_archivo, 'r', encoding='utf-8') as archivo:
-                datos = json.load(archivo)
-                for item in datos:
-                    producto = Producto(
-                        id_producto=item['id'],
-                        nombre=item['nombre'],
-                        cantidad=item['cantidad'],
-                        precio=item['precio']
-                    )
+            # Un archivo que no fue modificado desde que lo escribimos no necesita revalidarse
+            suma_guardada = self._suma_guardada()
+            confiable = suma_guardada is not None and suma_guardada == self._calcular_suma()
+
+            with open(self._ruta_archivo, 'rb') as archivo:
+                total = os.fstat(archivo.fileno()).st_size
+                leidos = 0
+
+                def al_leer(bloque: bytes):
+                    nonlocal leidos
+                    leidos += len(bloque)
+                    if self._progreso is not None:
+                        self._progreso(leidos, total)
+
+                filas = iterar_arreglo_json(archivo, al_leer=al_leer)
+                for producto in Producto.desde_filas(filas, validar=not confiable):
                     # Almacenamos en el diccionario usando el ID como clave
                     self._productos[producto.id] = producto
+            if self._usar_diario:
+                self._reproducir_diario()
             print(f"--- Sistema: Inventario cargado exitosamente desde '{self._ruta_archivo}' ---")
 
         except FileNotFoundError:
             print(f"--- Sistema: Archivo '{self._ruta_archivo}' no encontrado. Se creará automáticamente al guardar. ---")
+            if self._usar_diario:
+                self._reproducir_diario()
             try:
                 with open(self._ruta_archivo, 'w', encoding='utf-8') as archivo:
                     json.dump([], archivo)
             except PermissionError:
                 print("--- Error Crítico: No hay permisos para crear el archivo en este directorio. ---")
         except json.JSONDecodeError:
+            # La carga por flujo pudo haber agregado productos antes de encontrar el error
+            self._productos.clear()
             print(f"--- Error: El archivo '{self._ruta_archivo}' está corrupto. Se inicia con inventario vacío. ---")
+        except (ValueError, KeyError, TypeError) as e:
+            # Un producto inválido a mitad del arreglo: tampoco se conservan los ya cargados
+            self._productos.clear()
+            print(f"--- Error: El archivo '{self._ruta_archivo}' contiene un producto inválido ({e}). "
+                  f"Se inicia con inventario vacío. ---")
         except PermissionError:
             print(f"--- Error: Permisos insuficientes para leer '{self._ruta_archivo}'. ---")
         except Exception as e:
             print(f"--- Error inesperado al cargar el archivo: {e} ---")
 
+        self._reconstruir_indices()
+
+    def _reconstruir_indices(self):
+        """Reconstruye el orden de IDs y descarta los demás índices para crearlos cuando se necesiten."""
+        self._indice_nombres = None
+        self._indice_difuso = None
+        self._version_nombres += 1
+        self._indices_valores = {}
+        self._ids_ordenados = ListaOrdenada(self._productos.keys())
+        for producto in self._productos.values():
+            producto._inventario = self
+
+    def _obtener_indice_nombres(self) -> IndiceTrigramas:
+        """Devuelve el índice de trigramas, construyéndolo la primera vez que se busca por nombre."""
+        if self._indice_nombres is None:
+            self._indice_nombres = IndiceTrigramas()
+            for producto in self._productos.values():
+                self._indice_nombres.agregar(producto.id, producto.nombre)
+        return self._indice_nombres
+
+    def _obtener_indice_difuso(self) -> IndiceDifuso:
+        """Devuelve el índice difuso, construyéndolo la primera vez que se busca de forma aproximada."""
+        if self._indice_difuso is None:
+            self._indice_difuso = IndiceDifuso()
+            for producto in self._productos.values():
+                self._indice_difuso.agregar(producto.id, producto.nombre)
+        return self._indice_difuso
+
+    def _indexar_nombre(self, id_producto: int, nombre: str):
+        self._version_nombres += 1
+        if self._indice_nombres is not None:
+            self._indice_nombres.agregar(id_producto, nombre)
+        if self._indice_difuso is not None:
+            self._indice_difuso.agregar(id_producto, nombre)
+
+    def _desindexar_nombre(self, id_producto: int):
+        self._version_nombres += 1
+        if self._indice_nombres is not None:
+            self._indice_nombres.eliminar(id_producto)
+        if self._indice_difuso is not None:
+            self._indice_difuso.eliminar(id_producto)
+
+    def _obtener_indice_valores(self, campo: str) -> ListaOrdenada:
+        """Devuelve el índice (valor, id) del campo, construyéndolo en la primera consulta."""
+        if campo not in self.CAMPOS_INDEXADOS:
+            raise ValueError(f"Campo no indexado: {campo!r} (use {' o '.join(self.CAMPOS_INDEXADOS)})")
+        indice = self._indices_valores.get(campo)
+        if indice is None:
+            atributo = '_' + campo
+            indice = ListaOrdenada((getattr(producto, atributo), producto.id) for producto in self._productos.values())
+            self._indices_valores[campo] = indice
+        return indice
+
+    def _vincular(self, producto: Producto):
+        """Registra un producto que entra al inventario en los índices secundarios ya construidos."""
+        producto._inventario = self
+        self._marcar_sucio(producto.id)
+        for campo, indice in self._indices_valores.items():
+            indice.agregar((getattr(producto, campo), producto.id))
+
+    def _desvincular(self, producto: Producto):
+        """Quita de los índices secundarios un producto que sale del inventario."""
+        producto._inventario = None
+        self._marcar_sucio(producto.id)
+        for campo, indice in self._indices_valores.items():
+            indice.eliminar((getattr(producto, campo), producto.id))
+
+    def producto_modificado(self, producto: Producto, campo: str, anterior):
+        """
+        Aviso de los setters de Producto: marca el producto para el próximo guardado y mantiene
+        los índices al día, también si el cambio se hace directamente sobre un producto obtenido
+        con buscar_por_id.
+        """
+        # Dentro de una transacción, un cambio directo también se respalda con el valor anterior
+        self._respaldar(producto.id, campo, anterior)
+        self._marcar_sucio(producto.id)
+        if campo == 'nombre':
+            self._indexar_nombre(producto.id, producto.nombre)
+            return
+        if campo == 'cantidad' and self._movimientos is not None:
+            self._movimientos.registrar(producto.id, producto.cantidad - anterior)
+        indice = self._indices_valores.get(campo)
+        if indice is not None:
+            indice.eliminar((anterior, producto.id))
+            indice.agregar((getattr(producto, campo), producto.id))
+
+    def _marcar_sucio(self, id_producto: int):
+        with self._condicion_escritura:
+            self._sucios.add(id_producto)
+            self._version += 1
+
+    @property
+    def version(self) -> int:
+        """Contador de cambios: dos lecturas iguales garantizan que el inventario no cambió entre ellas."""
+        return self._version
+
+    def publicar_instantanea(self, ruta: str = "inventario.bin") -> int:
+        """
+        Publica una réplica inmutable en formato binario para procesos que solo consultan
+        (ver inventario_binario.ReplicaLectura y PublicadorInstantaneas).
+
+        Puede llamarse desde otro hilo: los productos se copian de una vez con list() y el
+        archivo se reemplaza de forma atómica.
+
+        Returns:
+            La versión del inventario que se publicó
+        """
+        version = self._version
+        productos = sorted(list(self._productos.values()), key=attrgetter('id'))
+        publicar_inventario_binario(ruta, productos)
+        return version
+
+    def _calcular_suma(self) -> str:
+        """Calcula por bloques la suma SHA-256 del archivo actual."""
+        suma = hashlib.sha256()
+        with open(self._ruta_archivo, 'rb') as archivo:
+            for bloque in iter(lambda: archivo.read(1 << 20), b''):
+                suma.update(bloque)
+        return suma.hexdigest()
+
+    def _suma_guardada(self) -> Optional[str]:
+        """Lee la suma de verificación escrita junto al archivo, si existe."""
+        try:
+            with open(self._ruta_suma, 'r', encoding='utf-8') as archivo:
+                return archivo.read().strip()
+        except OSError:
+            return None
+
     def guardar_en_archivo(self):
-        """Serializa los valores del diccionario de productos y los guarda en el archivo."""
+        """
+        Serializa los productos y reemplaza el archivo de forma atómica junto a su suma SHA-256.
+
+        El contenido se escribe en un archivo temporal que se sincroniza con fsync y luego
+        sustituye al original con os.replace: una interrupción deja el archivo anterior o el
+        nuevo completo, nunca uno a medio escribir.
+        """
         try:
-            with open(self._ruta_archivo, 'w', encoding='utf-8') as archivo:
-                # Iteramos sobre los valores del diccionario para guardarlos
-                datos = [producto.to_dict() for producto in self._productos.values()]
-                json.dump(datos, archivo, indent=4)
+            with self._cerrojo_disco:
+                # list() copia los valores de una vez, así el hilo de escritura no recorre el
+                # diccionario mientras otro hilo lo modifica
+                self._escribir_atomico(self._ruta_archivo, _serializar_productos(list(self._productos.values())))
         except PermissionError:
             raise PermissionError(f"Permiso denegado para escribir en '{self._ruta_archivo}'")
         except Exception as e:
             raise Exception(f"Fallo inesperado al guardar el archivo: {e}")
 
+    def _escribir_atomico(self, ruta: str, contenido: bytes):
+        """Reemplaza ruta por contenido (temporal + fsync + os.replace) y escribe su suma en ruta + '.sha256'."""
+        temporal = ruta + ".tmp"
+        with open(temporal, 'wb') as archivo:
+            archivo.write(contenido)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, ruta)
+        self._sincronizar_directorio()
+        with open(ruta + ".sha256", 'w', encoding='utf-8') as archivo:
+            archivo.write(hashlib.sha256(contenido).hexdigest())
+
+    def _sincronizar_directorio(self):
+        """Sincroniza el directorio para que el cambio de nombre sobreviva a un corte de energía."""
+        try:
+            descriptor = os.open(os.path.dirname(os.path.abspath(self._ruta_archivo)), os.O_RDONLY)
+        except OSError:
+            return  # Windows no permite abrir directorios; allí os.replace ya es suficiente
+        try:
+            os.fsync(descriptor)
+        except OSError:
+            pass
+        finally:
+            os.close(descriptor)
+
+    def _reproducir_diario(self):
+        """Aplica sobre la instantánea cargada los cambios pendientes del diario."""
+        if not os.path.exists(self._ruta_diario):
+            return
+        with open(self._ruta_diario, 'r', encoding='utf-8') as diario:
+            for numero, linea in enumerate(diario, start=1):
+                try:
+                    registro = json.loads(linea)
+                except json.JSONDecodeError:
+                    # Una última línea sin salto de línea es una escritura interrumpida: se
+                    # descarta en silencio. Cualquier otra línea inválida se informa.
+                    if linea.endswith('\n'):
+                        print(f"--- Error: La línea {numero} del diario '{self._ruta_diario}' "
+                              f"está corrupta. Se omite. ---")
+                    continue
+                self._aplicar_registro(registro)
+                self._entradas_diario += 1
+
+    def _aplicar_registro(self, registro: dict):
+        """Aplica un registro del diario. Es idempotente para tolerar repeticiones tras una compactación."""
+        operacion = registro['op']
+        id_producto = registro['id']
+        if operacion in ('agregar', 'estado'):
+            self._productos[id_producto] = Producto(
+                id_producto, registro['nombre'], registro['cantidad'], registro['precio']
+            )
+        elif operacion == 'eliminar':
+            self._productos.pop(id_producto, None)
+        elif id_producto in self._productos:
+            if operacion == 'cantidad':
+                self._productos[id_producto].cantidad = registro['valor']
+            elif operacion == 'precio':
+                self._productos[id_producto].precio = registro['valor']
+            elif operacion == 'nombre':
+                self._productos[id_producto].nombre = registro['valor']
+
+    def _registrar_cambio(self):
+        """Persiste los cambios marcados, salvo dentro de una transacción (se persisten al confirmarla)."""
+        if not self._en_transaccion:
+            self._guardar_cambios()
+
+    def _guardar_cambios(self):
+        """
+        Persiste los cambios de inmediato o, con escritura diferida, avisa al hilo de escritura.
+
+        Con escritura diferida, un fallo del guardado en segundo plano no se atribuye al cambio
+        que se está haciendo: se obtiene con tomar_error_escritura o lo lanzan sincronizar y cerrar.
+        """
+        if self._espera_escritura is None:
+            self._persistir()
+            return
+        with self._condicion_escritura:
+            self._ultimo_cambio = time.monotonic()
+            if self._primer_cambio < 0:
+                self._primer_cambio = self._ultimo_cambio
+            if self._hilo_escritura is None:
+                self._hilo_escritura = threading.Thread(target=self._bucle_escritura,
+                                                        name="escritura-inventario", daemon=True)
+                self._hilo_escritura.start()
+            self._condicion_escritura.notify()
+
+    def tomar_error_escritura(self) -> Optional[Exception]:
+        """
+        Devuelve (una sola vez) el error del último guardado en segundo plano, o None si no
+        hubo. Los cambios que no se pudieron guardar siguen en memoria y se reintentan.
+        """
+        error, self._error_escritura = self._error_escritura, None
+        return error
+
+    def _informar_error_escritura(self):
+        """Propaga (una sola vez) el error del último guardado en segundo plano."""
+        error = self.tomar_error_escritura()
+        if error is not None:
+            raise error
+
+    def _bucle_escritura(self):
+        """
+        Hilo de escritura: espera a que pasen escritura_diferida segundos sin cambios y guarda
+        de una vez todo lo acumulado, de modo que una ráfaga de ediciones produce un solo guardado.
+        """
+        while True:
+            with self._condicion_escritura:
+                while self._primer_cambio < 0 and not self._cerrando:
+                    self._condicion_escritura.wait()
+                if self._cerrando:
+                    return
+                while not self._cerrando:
+                    restante = self._plazo_escritura() - time.monotonic()
+                    if restante <= 0:
+                        break
+                    self._condicion_escritura.wait(restante)
+            self._escribir_pendientes()
+
+    def _plazo_escritura(self) -> float:
+        """
+        Momento en que corresponde guardar: tras escritura_diferida segundos sin cambios, pero
+        nunca más de MAXIMO_ESPERAS intervalos después del primer cambio pendiente, para que un
+        flujo continuo de cambios (p. ej. el servidor TCP) también se guarde.
+        """
+        return min(self._ultimo_cambio + self._espera_escritura,
+                   self._primer_cambio + self._espera_escritura * self.MAXIMO_ESPERAS)
+
+    def _escribir_pendientes(self):
+        """Guarda los cambios marcados; si falla, quedan marcados y se guarda el error."""
+        with self._cerrojo_disco:
+            with self._condicion_escritura:
+                self._primer_cambio = -1.0
+            try:
+                self._persistir()
+            except Exception as e:
+                with self._condicion_escritura:
+                    # Se reintenta tras otro intervalo de espera, no en un ciclo continuo
+                    self._primer_cambio = self._ultimo_cambio = time.monotonic()
+                self._error_escritura = e
+
+    def sincronizar(self):
+        """
+        Escribe de inmediato los cambios pendientes: los que la escritura diferida aún no
+        guardó y los hechos directamente sobre productos (p. ej. buscar_por_id(1).cantidad = 5).
+
+        Raises:
+            PermissionError, Exception: Si el guardado falla (los cambios siguen pendientes)
+        """
+        if self._espera_escritura is None:
+            self._persistir()
+            return
+        self._escribir_pendientes()
+        self._informar_error_escritura()
+
+    def cerrar(self):
+        """Guarda los cambios pendientes y detiene el hilo de escritura diferida."""
+        try:
+            self.sincronizar()
+        finally:
+            with self._condicion_escritura:
+                self._cerrando = True
+                self._condicion_escritura.notify()
+            if self._hilo_escritura is not None:
+                self._hilo_escritura.join()
+                self._hilo_escritura = None
+            self._cerrando = False
+
+    def _registro_de(self, id_producto: int) -> dict:
+        """Registro del segmento con el estado actual de un producto, o su baja si ya no está."""
+        producto = self._productos.get(id_producto)
+        if producto is None:
+            return {'op': 'eliminar', 'id': id_producto}
+        return {'op': 'estado', **producto.to_dict()}
+
+    def _persistir(self):
+        """
+        Guarda los productos marcados desde el último guardado. Con diario añade al segmento una
+        línea con el estado actual de cada producto modificado, agregado o eliminado, de modo que
+        el costo depende del tamaño del cambio y no del inventario (varios cambios sobre un mismo
+        producto producen una sola línea). El segmento se fusiona con la instantánea al compactar.
+
+        Sin diario el archivo es un único arreglo JSON que no admite escrituras parciales, así
+        que se reescribe completo: el guardado incremental requiere usar_diario=True (la consola,
+        el modo script y el servidor lo usan siempre).
+
+        Los movimientos de stock se escriben después de los productos: si el guardado falla,
+        quedan pendientes junto con los productos marcados.
+        """
+        with self._cerrojo_disco:
+            with self._condicion_escritura:
+                sucios, self._sucios = self._sucios, set()
+            if not sucios:
+                return
+            registros = []
+            try:
+                if not self._usar_diario:
+                    self.guardar_en_archivo()
+                else:
+                    registros = [self._registro_de(id_producto) for id_producto in sucios]
+                    try:
+                        with open(self._ruta_diario, 'a', encoding='utf-8') as diario:
+                            diario.writelines(json.dumps(registro, separators=(',', ':')) + '\n'
+                                              for registro in registros)
+                    except PermissionError:
+                        raise PermissionError(f"Permiso denegado para escribir en '{self._ruta_diario}'")
+                    except Exception as e:
+                        raise Exception(f"Fallo inesperado al escribir en el diario: {e}")
+            except Exception:
+                with self._condicion_escritura:
+                    self._sucios |= sucios
+                raise
+            self._volcar_movimientos()
+            self._entradas_diario += len(registros)
+            if self._entradas_diario >= self._umbral_compactacion:
+                self.compactar()
+
+    def _volcar_movimientos(self):
+        """Escribe los movimientos pendientes, salvo los de una transacción sin confirmar."""
+        if self._movimientos is not None and not self._en_transaccion:
+            self._movimientos.volcar()
+
+    def _respaldar(self, id_producto: int, campo: Optional[str] = None, anterior=None):
+        """
+        Guarda el estado previo de un producto la primera vez que una transacción lo modifica.
+        Si el cambio ya se aplicó (setters de Producto), campo y anterior indican el valor previo.
+        """
+        if not self._en_transaccion or id_producto in self._respaldo:
+            return
+        producto = self._productos.get(id_producto)
+        if producto is None:
+            self._respaldo[id_producto] = None
+            return
+        estado = {'nombre': producto.nombre, 'cantidad': producto.cantidad, 'precio': producto.precio}
+        if campo is not None:
+            estado[campo] = anterior
+        self._respaldo[id_producto] = (producto, estado['nombre'], estado['cantidad'], estado['precio'])
+
+    def _revertir(self, respaldo: Dict[int, Optional[Tuple[Producto, str, int, float]]]):
+        """Restaura en memoria el estado previo de los productos modificados por una transacción."""
+        for id_producto, estado in respaldo.items():
+            if estado is None:
+                producto = self._productos.get(id_producto)
+                if producto is not None:
+                    self._desvincular(producto)
+                    del self._productos[id_producto]
+                self._desindexar_nombre(id_producto)
+                self._ids_ordenados.eliminar(id_producto)
+            else:
+                # Los setters avisan a los índices si el producto sigue en el inventario
+                producto, nombre, cantidad, precio = estado
+                producto.nombre = nombre
+                producto.cantidad = cantidad
+                producto.precio = precio
+                actual = self._productos.get(id_producto)
+                if actual is not producto:
+                    # El producto original se había eliminado (y quizá reemplazado por otro con su ID)
+                    if actual is None:
+                        self._ids_ordenados.agregar(id_producto)
+                    else:
+                        self._desvincular(actual)
+                    self._productos[id_producto] = producto
+                    self._vincular(producto)
+                self._indexar_nombre(id_producto, nombre)
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Agrupa varios cambios para persistirlos una sola vez al finalizar el bloque.
+
+        Los cambios se aplican en memoria; si ocurre una excepción dentro del bloque se
+        revierten todos y la excepción se propaga. Una transacción anidada se integra a la externa.
+
+        Ejemplo:
+            with inventario.transaccion():
+                inventario.actualizar_cantidad(1, 20)
+                inventario.actualizar_cantidad(2, 35)
+        """
+        if self._en_transaccion:
+            yield self
+            return
+
+        # Mientras dura el bloque, el hilo de escritura no puede guardar estados sin confirmar
+        with self._cerrojo_disco:
+            self._en_transaccion = True
+            self._respaldo = {}
+            marca = self._movimientos.marca() if self._movimientos is not None else 0
+            try:
+                yield self
+            except BaseException:
+                respaldo = self._respaldo
+                self._en_transaccion = False
+                self._respaldo = {}
+                self._revertir(respaldo)
+                if self._movimientos is not None:
+                    # También se descartan los movimientos que la reversión acaba de registrar
+                    self._movimientos.deshacer_hasta(marca)
+                raise
+
+            modificados = len(self._respaldo)
+            self._en_transaccion = False
+            self._respaldo = {}
+            if self._usar_diario and modificados >= self._umbral_compactacion:
+                # Un lote que por sí solo provocaría la compactación se guarda directamente como instantánea
+                self.compactar()
+            elif modificados:
+                self._guardar_cambios()
+
+    def compactar(self):
+        """Vuelca una instantánea completa y vacía el diario de cambios."""
+        with self._cerrojo_disco:
+            # La instantánea ya incluye todos los cambios marcados
+            with self._condicion_escritura:
+                incluidos, self._sucios = self._sucios, set()
+            try:
+                self.guardar_en_archivo()
+            except Exception:
+                with self._condicion_escritura:
+                    self._sucios |= incluidos
+                raise
+            self._volcar_movimientos()
+            if self._usar_diario:
+                try:
+                    with open(self._ruta_diario, 'w', encoding='utf-8'):
+                        pass
+                except PermissionError:
+                    raise PermissionError(f"Permiso denegado para escribir en '{self._ruta_diario}'")
+            self._entradas_diario = 0
+
     def agregar_producto(self, producto: Producto) -> bool:
         """Agrega un producto de forma optimizada comprobando la llave en el diccionario."""
         if producto.id in self._productos:
             return False
 
+        self._respaldar(producto.id)
         self._productos[producto.id] = producto
-        self.guardar_en_archivo()
+        self._indexar_nombre(producto.id, producto.nombre)
+        self._ids_ordenados.agregar(producto.id)
+        self._vincular(producto)
+        self._registrar_cambio()
         return True
 
     def eliminar_producto(self, id_producto: int) -> bool:
         """Elimina un producto instantáneamente si la llave existe."""
         if id_producto in self._productos:
+            self._respaldar(id_producto)
+            # Primero se quita de los índices, para que nunca apunten a un ID ausente
+            self._desvincular(self._productos[id_producto])
             del self._productos[id_producto]
-            self.guardar_en_archivo()
+            self._desindexar_nombre(id_producto)
+            self._ids_ordenados.eliminar(id_producto)
+            self._registrar_cambio()
             return True
         return False
 
     def actualizar_cantidad(self, id_producto: int, nueva_cantidad: int) -> bool:
         producto = self.buscar_por_id(id_producto)
         if producto:
+            self._respaldar(id_producto)
             producto.cantidad = nueva_cantidad
-            self.guardar_en_archivo()
+            self._registrar_cambio()
             return True
         return False
 
     def actualizar_precio(self, id_producto: int, nuevo_precio: float) -> bool:
         producto = self.buscar_por_id(id_producto)
         if producto:
+            self._respaldar(id_producto)
             producto.precio = nuevo_precio
-            self.guardar_en_archivo()
+            self._registrar_cambio()
             return True
         return False
 
+    def actualizar_nombre(self, id_producto: int, nuevo_nombre: str) -> bool:
+        """Renombra un producto manteniendo actualizado el índice de búsqueda por nombre."""
+        producto = self.buscar_por_id(id_producto)
+        if producto:
+            self._respaldar(id_producto)
+            producto.nombre = nuevo_nombre  # El setter actualiza el índice de nombres
+            self._registrar_cambio()
+            return True
+        return False
+
+    def incrementar_cantidad(self, id_producto: int, delta: int) -> bool:
+        """
+        Suma delta (positivo o negativo) a la cantidad actual del producto.
+
+        Raises:
+            ValueError: Si la cantidad resultante sería negativa
+        """
+        producto = self.buscar_por_id(id_producto)
+        if producto is None:
+            return False
+        return self.actualizar_cantidad(id_producto, producto.cantidad + delta)
+
+    def decrementar_si_hay(self, id_producto: int, cantidad: int) -> bool:
+        """
+        Descuenta cantidad unidades solo si hay existencias suficientes.
+
+        Returns:
+            True si se descontó; False si el producto no existe o no alcanza el stock
+
+        Raises:
+            ValueError: Si la cantidad a descontar no es positiva
+        """
+        if cantidad <= 0:
+            raise ValueError("La cantidad a descontar debe ser positiva")
+        producto = self.buscar_por_id(id_producto)
+        if producto is None or producto.cantidad < cantidad:
+            return False
+        return self.actualizar_cantidad(id_producto, producto.cantidad - cantidad)
+
+    def agregar_lote(self, productos: Iterable[Producto]) -> int:
+        """
+        Agrega varios productos con una sola escritura en disco.
+
+        Returns:
+            Número de productos agregados
+
+        Raises:
+            ValueError: Si algún ID ya existe o se repite en el lote (no se agrega ninguno)
+        """
+        lote = list(productos)
+        vistos = set()
+        for producto in lote:
+            if producto.id in self._productos or producto.id in vistos:
+                raise ValueError(f"Ya existe un producto con ID {producto.id}")
+            vistos.add(producto.id)
+        if not lote:
+            return 0
+
+        if self._en_transaccion or len(lote) < self._umbral_compactacion:
+            # Lote pequeño o dentro de otra transacción: altas individuales con una sola escritura
+            with self.transaccion():
+                for producto in lote:
+                    self.agregar_producto(producto)
+            return len(lote)
+
+        # Lote grande: el resultado se guardará como instantánea completa, así que se inserta
+        # directamente sin registros individuales ni respaldo (el lote ya se validó)
+        self._productos.update((producto.id, producto) for producto in lote)
+        for producto in lote:
+            self._indexar_nombre(producto.id, producto.nombre)
+            producto._inventario = self
+        # Los índices secundarios se reconstruyen en la próxima consulta
+        self._indices_valores = {}
+        with self._condicion_escritura:
+            self._version += 1
+        if len(lote) > len(self._ids_ordenados):
+            self._ids_ordenados = ListaOrdenada(self._productos.keys())
+        else:
+            for producto in lote:
+                self._ids_ordenados.agregar(producto.id)
+        self.compactar()
+        return len(lote)
+
+    def actualizar_lote(self, cambios: Iterable[Tuple[int, int]]) -> int:
+        """
+        Actualiza la cantidad de varios productos con una sola escritura en disco.
+
+        Args:
+            cambios: Pares (id_producto, nueva_cantidad)
+
+        Returns:
+            Número de actualizaciones aplicadas
+
+        Raises:
+            ValueError: Si algún ID no existe o alguna cantidad es inválida (no se aplica ninguna)
+        """
+        total = 0
+        with self.transaccion():
+            for id_producto, nueva_cantidad in cambios:
+                if not self.actualizar_cantidad(id_producto, nueva_cantidad):
+                    raise ValueError(f"No existe producto con ID {id_producto}")
+                total += 1
+        return total
+
     def buscar_por_id(self, id_producto: int) -> Optional[Producto]:
         """Búsqueda optimizada mediante la llave del diccionario."""
         return self._productos.get(id_producto)
 
     def buscar_por_nombre(self, nombre_busqueda: str) -> List[Producto]:
-        """Búsqueda por nombre recorriendo los valores del diccionario."""
+        """
+        Búsqueda por subcadena del nombre (insensible a mayúsculas) usando el índice de trigramas.
+
+        Los resultados de las últimas TAMANO_CACHE_BUSQUEDAS consultas distintas se recuerdan
+        hasta que se agrega, elimina o renombra algún producto (ver estadisticas_cache).
+        """
         nombre_normalizado = nombre_busqueda.strip().lower()
-        return [
-            producto for producto in self._productos.values()
-            if nombre_normalizado in producto.nombre.lower()
-        ]
+        resultado = self._cache_busquedas.obtener(nombre_normalizado, self._version_nombres)
+        if resultado is None:
+            ids = self._obtener_indice_nombres().buscar(nombre_normalizado)
+            resultado = tuple(self._productos[id_producto] for id_producto in ids)
+            if len(resultado) <= self.MAXIMO_RESULTADOS_CACHE:
+                self._cache_busquedas.guardar(nombre_normalizado, self._version_nombres, resultado)
+        # Una lista nueva en cada llamada: quien la modifique no altera la caché
+        return list(resultado)
+
+    def estadisticas_cache(self) -> dict:
+        """Aciertos, fallos, tasa de aciertos e invalidaciones de la caché de buscar_por_nombre."""
+        return self._cache_busquedas.estadisticas()
+
+    def buscar_aproximado(self, texto: str, limite: int = 10) -> List[Producto]:
+        """
+        Búsqueda tolerante a errores de escritura: 'Teclao' o 'Mouce' encuentran 'Teclado' y 'Mouse'.
+
+        Cada palabra de la consulta debe parecerse a alguna palabra del nombre (1 error hasta
+        5 letras, 2 en palabras más largas; sin distinguir mayúsculas ni tildes).
+
+        Returns:
+            Hasta 'limite' productos, primero los de menos errores y, a igual número, por ID
+        """
+        return [self._productos[id_producto] for id_producto, _ in self._obtener_indice_difuso().buscar(texto, limite)]
+
+    def _por_rango(self, campo: str, desde, hasta) -> List[Producto]:
+        rango = self._obtener_indice_valores(campo).rango((desde,), (hasta, math.inf))
+        return [self._productos[id_producto] for _, id_producto in rango]
+
+    def por_rango_precio(self, desde: float, hasta: float) -> List[Producto]:
+        """Productos con precio entre desde y hasta (ambos incluidos), ordenados por precio e ID."""
+        return self._por_rango('precio', desde, hasta)
+
+    def por_rango_cantidad(self, desde: int, hasta: int) -> List[Producto]:
+        """Productos con cantidad entre desde y hasta (ambos incluidos), ordenados por cantidad e ID."""
+        return self._por_rango('cantidad', desde, hasta)
+
+    def top_k(self, campo: str, k: int, mayores: bool = False) -> List[Producto]:
+        """
+        Los k productos con menor (o mayor) valor del campo, en O(log n + k).
+
+        Ejemplo:
+            inventario.top_k('cantidad', 100)             # los 100 con menos stock
+            inventario.top_k('precio', 10, mayores=True)  # los 10 más caros
+
+        Raises:
+            ValueError: Si el campo no es 'precio' ni 'cantidad' o k es negativo
+        """
+        if k < 0:
+            raise ValueError("k no puede ser negativo")
+        indice = self._obtener_indice_valores(campo)
+        recorrido = reversed(indice) if mayores else iter(indice)
+        return [self._productos[id_producto] for _, id_producto in islice(recorrido, k)]
+
+    def reporte_reposicion(self, dias_cobertura: float = 7.0) -> List[Tuple[Producto, float, float]]:
+        """
+        Productos cuyo stock no alcanza para dias_cobertura días al ritmo de salida reciente.
+
+        Usa las salidas de la ventana del registro de movimientos, que se mantienen al día con
+        cada cambio: el costo es O(productos con salidas), sin recorrer el historial.
+
+        Returns:
+            (producto, consumo diario promedio, días de stock restantes), del más urgente al menos
+
+        Raises:
+            ValueError: Si el inventario no registra movimientos
+        """
+        if self._movimientos is None:
+            raise ValueError("El inventario no registra movimientos (use registrar_movimientos=True)")
+        return calcular_reposicion(self._movimientos, self._productos.get, dias_cobertura)
 
     def obtener_todos(self) -> List[Producto]:
-        """Retorna todos los productos ordenados por ID."""
-        return sorted(self._productos.values(), key=lambda p: p.id)
+        """Retorna todos los productos ordenados por ID (recorre el índice ordenado, sin ordenar)."""
+        return [self._productos[id_producto] for id_producto in self._ids_ordenados]
+
+    def rango_ids(self, desde: int, hasta: int) -> List[Producto]:
+        """Retorna, ordenados por ID, los productos con ID entre desde y hasta (ambos incluidos)."""
+        return [self._productos[id_producto] for id_producto in self._ids_ordenados.rango(desde, hasta)]
+
+    def pagina(self, numero: int, tamaño: int) -> List[Producto]:
+        """
+        Retorna una página del listado ordenado por ID.
+
+        Args:
+            numero: Número de página, empezando en 1
+            tamaño: Cantidad de productos por página
+
+        Returns:
+            Productos de la página (vacía si el número supera el total de páginas)
+        """
+        if numero < 1 or tamaño < 1:
+            raise ValueError("El número y el tamaño de página deben ser positivos")
+        ids = self._ids_ordenados.porcion((numero - 1) * tamaño, tamaño)
+        return [self._productos[id_producto] for id_producto in ids]
+
+    def recorrer(self, tamaño_bloque: int = 10000) -> Iterator[Producto]:
+        """
+        Recorre todos los productos ordenados por ID pidiéndolos a pagina() de a tamaño_bloque,
+        sin construir la lista completa: la memoria usada no depende del tamaño del inventario.
+        Si el inventario cambia durante el recorrido, un producto puede omitirse o repetirse.
+        """
+        numero = 1
+        while True:
+            bloque = self.pagina(numero, tamaño_bloque)
+            yield from bloque
+            if len(bloque) < tamaño_bloque:
+                return
+            numero += 1
+
+    def total_paginas(self, tamaño: int) -> int:
+        """
+        Cantidad de páginas necesarias para listar el inventario con el tamaño indicado.
+
+        Raises:
+            ValueError: Si el tamaño de página no es positivo
+        """
+        if tamaño < 1:
+            raise ValueError("El tamaño de página debe ser positivo")
+        return (len(self._productos) + tamaño - 1) // tamaño
 
     def esta_vacio(self) -> bool:
         return len(self._productos) == 0
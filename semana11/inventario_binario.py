@@ -0,0 +1,384 @@
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Iterator, List, Optional, Sequence
+
+from producto import Producto
+
+
+# Cabecera: firma, versión, registros totales, registros activos
+CABECERA = struct.Struct('<4sIQQ')
+# Registro: id, cantidad, precio en centavos, desplazamiento y longitud del nombre, activo
+REGISTRO = struct.Struct('<qqqQIB3x')
+FIRMA = b'INVB'
+VERSION = 1
+_DESP_ACTIVOS = 16          # posición del contador de activos dentro de la cabecera
+_DESP_ACTIVO_REGISTRO = 36  # posición del indicador 'activo' dentro de cada registro
+
+
+def escribir_inventario_binario(ruta: str, productos: Sequence[Producto]):
+    """
+    Escribe el inventario en formato binario de registros de tamaño fijo.
+
+    Estructura del archivo:
+        cabecera | registros ordenados por ID | tabla de nombres (UTF-8 concatenados)
+
+    Args:
+        ruta: Archivo de destino (se sobrescribe)
+        productos: Productos ordenados por ID, p. ej. inventario.obtener_todos()
+
+    Raises:
+        ValueError: Si los productos no están ordenados por ID o hay IDs repetidos
+    """
+    with open(ruta, 'wb') as archivo:
+        _escribir(archivo, productos)
+
+
+def _escribir(archivo, productos: Sequence[Producto]):
+    nombres = [producto.nombre.encode('utf-8') for producto in productos]
+    archivo.write(CABECERA.pack(FIRMA, VERSION, len(productos), len(productos)))
+    desplazamiento = 0
+    anterior = 0
+    registros = []
+    for producto, nombre in zip(productos, nombres):
+        if producto.id <= anterior:
+            raise ValueError("Los productos deben estar ordenados por ID y sin repetir")
+        anterior = producto.id
+        registros.append(REGISTRO.pack(producto.id, producto.cantidad, round(producto.precio * 100),
+                                       desplazamiento, len(nombre), 1))
+        desplazamiento += len(nombre)
+    archivo.write(b''.join(registros))
+    archivo.write(b''.join(nombres))
+
+
+def publicar_inventario_binario(ruta: str, productos: Sequence[Producto]):
+    """
+    Publica una instantánea inmutable: la escribe en un temporal, la sincroniza con fsync y la
+    renombra sobre ruta con os.replace.
+
+    Un lector que ya tiene mapeada la instantánea anterior la sigue viendo completa (el sistema
+    conserva el archivo reemplazado mientras esté abierto) y los que abren ruta después ven la
+    nueva; nadie ve una a medio escribir. En Windows el reemplazo falla si algún lector tiene
+    mapeado el archivo.
+    """
+    temporal = ruta + ".tmp"
+    try:
+        with open(temporal, 'wb') as archivo:
+            _escribir(archivo, productos)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, ruta)
+    except PermissionError:
+        raise PermissionError(f"Permiso denegado para escribir en '{ruta}'")
+    except ValueError:
+        raise
+    except Exception as e:
+        raise Exception(f"Fallo inesperado al publicar la instantánea: {e}")
+
+
+class InventarioBinario:
+    """
+    Inventario de solo consulta (con actualizaciones en sitio) sobre un archivo binario mapeado con mmap.
+
+    Abrir el archivo no lee los productos: buscar_por_id hace una búsqueda binaria sobre los
+    registros mapeados y actualizar_cantidad/actualizar_precio reescriben solo los bytes del
+    registro afectado. Las bajas marcan el registro como inactivo. Las altas no están
+    disponibles (agregar_producto lanza ValueError, como cualquier alta rechazada); para
+    agregar productos se regenera el archivo con escribir_inventario_binario.
+    """
+
+    def __init__(self, ruta_archivo: str = "inventario.bin", solo_lectura: bool = False):
+        """
+        Abre y mapea el archivo binario.
+
+        Raises:
+            ValueError: Si el archivo no tiene el formato esperado
+        """
+        self._ruta_archivo = ruta_archivo
+        self._archivo = open(ruta_archivo, 'rb' if solo_lectura else 'r+b')
+        try:
+            tamaño = os.fstat(self._archivo.fileno()).st_size
+            if tamaño < CABECERA.size:
+                raise ValueError(f"'{ruta_archivo}' no es un inventario binario válido "
+                                 f"({tamaño} bytes, menos que la cabecera)")
+            acceso = mmap.ACCESS_READ if solo_lectura else mmap.ACCESS_WRITE
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=acceso)
+        except BaseException:
+            self._archivo.close()
+            raise
+        try:
+            firma, version, self._total, _ = CABECERA.unpack_from(self._mapa, 0)
+            if firma != FIRMA or version != VERSION:
+                raise ValueError(f"'{ruta_archivo}' no es un inventario binario válido")
+            self._inicio_nombres = CABECERA.size + self._total * REGISTRO.size
+            if tamaño < self._fin_nombres():
+                raise ValueError(f"'{ruta_archivo}' está incompleto: la cabecera indica {self._total} "
+                                 f"registro(s) que no caben en {tamaño} bytes")
+        except BaseException:
+            self.cerrar()
+            raise
+
+    def _fin_nombres(self) -> int:
+        """Fin de la tabla de nombres según el último registro (los nombres se escriben en orden)."""
+        if self._total == 0 or len(self._mapa) < self._inicio_nombres:
+            return self._inicio_nombres
+        _, _, _, desplazamiento, longitud, _ = REGISTRO.unpack_from(self._mapa, self._desplazamiento(self._total - 1))
+        return self._inicio_nombres + desplazamiento + longitud
+
+    def cerrar(self):
+        """Libera el mapeo y cierra el archivo."""
+        self._mapa.close()
+        self._archivo.close()
+
+    def guardar_en_archivo(self):
+        """Fuerza la escritura a disco de las páginas modificadas."""
+        self._mapa.flush()
+
+    def _desplazamiento(self, fila: int) -> int:
+        return CABECERA.size + fila * REGISTRO.size
+
+    def _buscar_fila(self, id_producto: int) -> Optional[int]:
+        """Búsqueda binaria del ID sobre los registros mapeados (incluye registros inactivos)."""
+        bajo, alto = 0, self._total
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            id_medio = struct.unpack_from('<q', self._mapa, self._desplazamiento(medio))[0]
+            if id_medio < id_producto:
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo < self._total and struct.unpack_from('<q', self._mapa, self._desplazamiento(bajo))[0] == id_producto:
+            return bajo
+        return None
+
+    def _fila_activa(self, id_producto: int) -> Optional[int]:
+        fila = self._buscar_fila(id_producto)
+        if fila is None or not self._mapa[self._desplazamiento(fila) + _DESP_ACTIVO_REGISTRO]:
+            return None
+        return fila
+
+    def _producto_en(self, fila: int) -> Producto:
+        id_producto, cantidad, centavos, desplazamiento, longitud, _ = REGISTRO.unpack_from(
+            self._mapa, self._desplazamiento(fila))
+        inicio = self._inicio_nombres + desplazamiento
+        nombre = self._mapa[inicio:inicio + longitud].decode('utf-8')
+        return Producto(id_producto, nombre, cantidad, centavos / 100)
+
+    def _sincronizar(self, desplazamiento: int, longitud: int):
+        """Escribe a disco solo las páginas que contienen el rango modificado."""
+        inicio = desplazamiento - desplazamiento % mmap.ALLOCATIONGRANULARITY
+        self._mapa.flush(inicio, desplazamiento + longitud - inicio)
+
+    def _escribir_entero(self, fila: int, campo: int, valor: int):
+        desplazamiento = self._desplazamiento(fila) + 8 * campo
+        struct.pack_into('<q', self._mapa, desplazamiento, valor)
+        self._sincronizar(desplazamiento, 8)
+
+    def agregar_producto(self, producto: Producto) -> bool:
+        """
+        Raises:
+            ValueError: Siempre; el archivo no admite altas (la tabla de nombres va a continuación
+                de los registros, así que cada alta obligaría a desplazarla entera)
+        """
+        raise ValueError("El inventario binario no admite altas; regenere el archivo con "
+                         "escribir_inventario_binario")
+
+    def eliminar_producto(self, id_producto: int) -> bool:
+        """Marca el registro como inactivo, sin mover los demás."""
+        fila = self._fila_activa(id_producto)
+        if fila is None:
+            return False
+        desplazamiento = self._desplazamiento(fila) + _DESP_ACTIVO_REGISTRO
+        self._mapa[desplazamiento] = 0
+        activos = struct.unpack_from('<Q', self._mapa, _DESP_ACTIVOS)[0]
+        struct.pack_into('<Q', self._mapa, _DESP_ACTIVOS, activos - 1)
+        self._sincronizar(desplazamiento, 1)
+        self._sincronizar(_DESP_ACTIVOS, 8)
+        return True
+
+    def actualizar_cantidad(self, id_producto: int, nueva_cantidad: int) -> bool:
+        fila = self._fila_activa(id_producto)
+        if fila is None:
+            return False
+        if nueva_cantidad < 0:
+            raise ValueError("La cantidad no puede ser negativa")
+        self._escribir_entero(fila, 1, nueva_cantidad)
+        return True
+
+    def actualizar_precio(self, id_producto: int, nuevo_precio: float) -> bool:
+        fila = self._fila_activa(id_producto)
+        if fila is None:
+            return False
+        if nuevo_precio < 0:
+            raise ValueError("El precio no puede ser negativo")
+        self._escribir_entero(fila, 2, round(nuevo_precio * 100))
+        return True
+
+    def buscar_por_id(self, id_producto: int) -> Optional[Producto]:
+        fila = self._fila_activa(id_producto)
+        return None if fila is None else self._producto_en(fila)
+
+    def _filas_activas(self) -> Iterator[int]:
+        for fila in range(self._total):
+            if self._mapa[self._desplazamiento(fila) + _DESP_ACTIVO_REGISTRO]:
+                yield fila
+
+    def buscar_por_nombre(self, nombre_busqueda: str) -> List[Producto]:
+        """Recorre la tabla de nombres; no construye índices para que la apertura siga siendo inmediata."""
+        nombre_normalizado = nombre_busqueda.strip().lower()
+        resultados = []
+        for fila in self._filas_activas():
+            producto = self._producto_en(fila)
+            if nombre_normalizado in producto.nombre.lower():
+                resultados.append(producto)
+        return resultados
+
+    def obtener_todos(self) -> List[Producto]:
+        """Los registros ya están ordenados por ID en el archivo."""
+        return [self._producto_en(fila) for fila in self._filas_activas()]
+
+    def recorrer(self) -> Iterator[Producto]:
+        """Como obtener_todos, pero genera los productos de a uno sin construir la lista."""
+        for fila in self._filas_activas():
+            yield self._producto_en(fila)
+
+    def esta_vacio(self) -> bool:
+        return self.obtener_tamaño() == 0
+
+    def obtener_tamaño(self) -> int:
+        return struct.unpack_from('<Q', self._mapa, _DESP_ACTIVOS)[0]
+
+
+class ReplicaLectura:
+    """
+    Réplica de solo lectura para procesos que solo consultan (p. ej. terminales de consulta de precios).
+
+    Mapea la última instantánea publicada con publicar_inventario_binario (o
+    Inventario.publicar_instantanea): abrirla no analiza nada y las páginas mapeadas son las de
+    la caché del sistema, compartidas por todos los procesos lectores, así que N lectores no
+    multiplican ni el costo de carga ni la memoria.
+
+    Cada intervalo_revision segundos, la siguiente consulta comprueba con os.stat si se publicó
+    una instantánea nueva (otro archivo en la misma ruta) y, si es así, pasa a usarla. La
+    anterior se libera cuando termina la última consulta que la estaba usando.
+    """
+
+    def __init__(self, ruta_archivo: str = "inventario.bin", intervalo_revision: Optional[float] = 1.0):
+        """
+        Args:
+            ruta_archivo: Ruta donde se publican las instantáneas
+            intervalo_revision: Segundos entre comprobaciones de una instantánea nueva
+                (None: solo al llamar a revisar())
+
+        Raises:
+            FileNotFoundError: Si todavía no se publicó ninguna instantánea
+            ValueError: Si el archivo no tiene el formato esperado
+        """
+        self._ruta_archivo = ruta_archivo
+        self._intervalo_revision = intervalo_revision
+        self._binario, self._identidad = self._abrir()
+        self._ultima_revision = time.monotonic()
+
+    def _abrir(self):
+        binario = InventarioBinario(self._ruta_archivo, solo_lectura=True)
+        # La identidad se toma del archivo ya abierto: si se publica otro entre open y stat,
+        # la próxima revisión lo detecta
+        estado = os.fstat(binario._archivo.fileno())
+        return binario, (estado.st_dev, estado.st_ino)
+
+    def revisar(self) -> bool:
+        """Pasa a la instantánea más reciente si hay una nueva. Devuelve True si cambió."""
+        self._ultima_revision = time.monotonic()
+        try:
+            estado = os.stat(self._ruta_archivo)
+        except FileNotFoundError:
+            return False
+        if (estado.st_dev, estado.st_ino) == self._identidad:
+            return False
+        try:
+            binario, identidad = self._abrir()
+        except (ValueError, FileNotFoundError):
+            # Un archivo incompleto (copiado a mano, no publicado con os.replace) no reemplaza
+            # a la instantánea vigente; se vuelve a intentar en la próxima revisión
+            return False
+        # No se cierra la anterior: una consulta en curso en otro hilo podría estar usándola;
+        # se libera al perder su última referencia
+        self._binario, self._identidad = binario, identidad
+        return True
+
+    def _vigente(self) -> InventarioBinario:
+        if (self._intervalo_revision is not None
+                and time.monotonic() - self._ultima_revision >= self._intervalo_revision):
+            self.revisar()
+        return self._binario
+
+    def cerrar(self):
+        self._binario.cerrar()
+
+    def buscar_por_id(self, id_producto: int) -> Optional[Producto]:
+        return self._vigente().buscar_por_id(id_producto)
+
+    def buscar_por_nombre(self, nombre_busqueda: str) -> List[Producto]:
+        return self._vigente().buscar_por_nombre(nombre_busqueda)
+
+    def obtener_todos(self) -> List[Producto]:
+        return self._vigente().obtener_todos()
+
+    def esta_vacio(self) -> bool:
+        return self._vigente().esta_vacio()
+
+    def obtener_tamaño(self) -> int:
+        return self._vigente().obtener_tamaño()
+
+
+class PublicadorInstantaneas:
+    """
+    Hilo que publica una instantánea del inventario cada 'intervalo' segundos, solo si hubo
+    cambios desde la anterior (compara Inventario.version).
+
+    Ejemplo:
+        publicador = PublicadorInstantaneas(inventario, "inventario.bin", intervalo=5.0)
+        publicador.iniciar()
+        ...
+        publicador.detener()
+    """
+
+    def __init__(self, inventario, ruta_archivo: str = "inventario.bin", intervalo: float = 5.0):
+        self._inventario = inventario
+        self._ruta_archivo = ruta_archivo
+        self._intervalo = intervalo
+        self._version_publicada: Optional[int] = None
+        self._detenido = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def publicar_si_cambio(self) -> bool:
+        """Publica de inmediato si el inventario cambió. Devuelve True si publicó."""
+        if self._inventario.version == self._version_publicada:
+            return False
+        self._version_publicada = self._inventario.publicar_instantanea(self._ruta_archivo)
+        return True
+
+    def iniciar(self):
+        """Publica la primera instantánea (antes de retornar) y arranca el hilo."""
+        self.publicar_si_cambio()
+        self._detenido.clear()
+        self._hilo = threading.Thread(target=self._bucle, name="publicador-instantaneas", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """Detiene el hilo y publica los últimos cambios."""
+        self._detenido.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+        self.publicar_si_cambio()
+
+    def _bucle(self):
+        while not self._detenido.wait(self._intervalo):
+            try:
+                self.publicar_si_cambio()
+            except Exception as e:
+                # Se reintenta en el siguiente intervalo; los lectores siguen con la anterior
+                print(f"--- Error: No se pudo publicar la instantánea: {e} ---")
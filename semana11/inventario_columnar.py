@@ -0,0 +1,556 @@
+import json
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from busqueda_difusa import IndiceDifuso
+from cache_lru import CacheLRU
+from metricas import Metricas, desinstrumentar, instrumentar
+from movimientos import RegistroMovimientos, calcular_reposicion
+from producto import Producto
+from indice_trigramas import IndiceTrigramas
+from lista_ordenada import ListaOrdenada
+
+
+class InventarioColumnar:
+    """
+    Variante de Inventario que almacena los datos por columnas en arreglos de NumPy.
+
+    Los IDs, cantidades y precios viven en arreglos contiguos y los nombres en una lista
+    paralela, de modo que los reportes sobre todo el inventario (valor total, productos con
+    poco stock, estadísticas de precio) se calculan con operaciones vectorizadas.
+    Usa el mismo formato de archivo JSON y acepta los mismos argumentos que Inventario, con
+    los métodos que usan main.py, comandos_inventario y csv_inventario (transacciones,
+    métricas, movimientos, búsqueda aproximada y caché de búsquedas). No ofrece diario de
+    cambios ni escritura diferida (cada cambio confirmado reescribe el archivo), ni los
+    índices por precio y cantidad (por_rango_*, top_k) ni publicar_instantanea.
+
+    Nota: buscar_por_id y los listados devuelven objetos Producto construidos a partir de la
+    fila; para modificar un producto se deben usar los métodos actualizar_* del inventario.
+    """
+
+    CAPACIDAD_INICIAL = 1024
+    METODOS_MEDIDOS = (
+        'cargar_desde_archivo', 'guardar_en_archivo', 'compactar', 'agregar_producto', 'eliminar_producto',
+        'actualizar_cantidad', 'actualizar_precio', 'actualizar_nombre', 'incrementar_cantidad',
+        'decrementar_si_hay', 'agregar_lote', 'actualizar_lote', 'buscar_por_id', 'buscar_por_nombre',
+        'buscar_aproximado', 'obtener_todos', 'pagina', 'reporte_reposicion',
+    )
+    TAMANO_CACHE_BUSQUEDAS = 256
+    MAXIMO_RESULTADOS_CACHE = 10000
+
+    def __init__(self, ruta_archivo: str = "inventario.json", usar_diario: bool = False,
+                 umbral_compactacion: int = 1000, progreso: Optional[Callable[[int, int], None]] = None,
+                 escritura_diferida: Optional[float] = None, metricas: Optional[Metricas] = None,
+                 registrar_movimientos: bool = False):
+        """
+        Inicializa el inventario columnar y carga los datos desde el archivo.
+
+        Args:
+            usar_diario, umbral_compactacion, progreso, escritura_diferida: Se aceptan por
+                compatibilidad con Inventario; los cambios se guardan al momento en el archivo
+            metricas: Si se indica, se miden las operaciones (ver Inventario.activar_metricas)
+            registrar_movimientos: Si es True, los cambios de cantidad se registran en
+                ruta_archivo + '.mov' (ver reporte_reposicion)
+        """
+        self._ruta_archivo = ruta_archivo
+        # IDs de los resultados de las últimas búsquedas por nombre; se invalidan cuando cambia
+        # el conjunto de nombres
+        self._version_nombres = 0
+        self._cache_busquedas = CacheLRU(self.TAMANO_CACHE_BUSQUEDAS)
+        # Transacción activa y copia previa de cada ID que modificó (None si no existía)
+        self._en_transaccion = False
+        self._respaldo: Dict[int, Optional[Producto]] = {}
+        self._movimientos: Optional[RegistroMovimientos] = None
+        if registrar_movimientos:
+            self._movimientos = RegistroMovimientos(ruta_archivo + ".mov")
+        self._metricas: Optional[Metricas] = None
+        self._vaciar()
+        if metricas is not None:
+            self.activar_metricas(metricas)
+        self.cargar_desde_archivo()
+
+    @property
+    def movimientos(self) -> Optional[RegistroMovimientos]:
+        """Registro de movimientos de stock, o None si no se registran."""
+        return self._movimientos
+
+    @property
+    def metricas(self) -> Optional[Metricas]:
+        """Métricas en las que se registran las operaciones, o None si la medición está desactivada."""
+        return self._metricas
+
+    def activar_metricas(self, metricas: Optional[Metricas] = None) -> Metricas:
+        """Empieza a registrar el conteo y la latencia de cada llamada a METODOS_MEDIDOS."""
+        self.desactivar_metricas()
+        self._metricas = metricas if metricas is not None else Metricas()
+        instrumentar(self, self.METODOS_MEDIDOS, self._metricas)
+        return self._metricas
+
+    def desactivar_metricas(self):
+        desinstrumentar(self, self.METODOS_MEDIDOS)
+        self._metricas = None
+
+    def _vaciar(self):
+        """Deja las columnas vacías con la capacidad inicial."""
+        self._n = 0
+        self._ids = np.zeros(self.CAPACIDAD_INICIAL, dtype=np.int64)
+        self._cantidades = np.zeros(self.CAPACIDAD_INICIAL, dtype=np.int64)
+        self._precios = np.zeros(self.CAPACIDAD_INICIAL, dtype=np.float64)
+        self._nombres: List[str] = []
+        self._fila: Dict[int, int] = {}  # ID -> fila en las columnas
+        self._indice_nombres = IndiceTrigramas()
+        self._indice_difuso: Optional[IndiceDifuso] = None  # se construye en la primera búsqueda aproximada
+        self._version_nombres += 1
+        self._ids_ordenados = ListaOrdenada()
+
+    def _asegurar_capacidad(self, adicionales: int):
+        """Amplía las columnas (duplicando su tamaño) si no caben 'adicionales' filas más."""
+        necesaria = self._n + adicionales
+        if necesaria <= len(self._ids):
+            return
+        capacidad = max(2 * len(self._ids), necesaria)
+        for columna in ('_ids', '_cantidades', '_precios'):
+            anterior = getattr(self, columna)
+            nueva = np.zeros(capacidad, dtype=anterior.dtype)
+            nueva[:self._n] = anterior[:self._n]
+            setattr(self, columna, nueva)
+
+    def _anexar_columnas(self, ids: np.ndarray, nombres: List[str], cantidades: np.ndarray, precios: np.ndarray):
+        """Añade filas ya validadas al final de las columnas y actualiza los índices."""
+        inicio = self._n
+        total = len(ids)
+        self._asegurar_capacidad(total)
+        self._ids[inicio:inicio + total] = ids
+        self._cantidades[inicio:inicio + total] = cantidades
+        self._precios[inicio:inicio + total] = precios
+        self._nombres.extend(nombres)
+        self._n += total
+        lista_ids = ids.tolist()
+        for desplazamiento, (id_producto, nombre) in enumerate(zip(lista_ids, nombres)):
+            self._fila[id_producto] = inicio + desplazamiento
+            self._indexar_nombre(id_producto, nombre)
+        if inicio == 0:
+            # En una carga completa se ordena una sola vez en lugar de insertar uno a uno
+            self._ids_ordenados = ListaOrdenada(lista_ids)
+        else:
+            for id_producto in lista_ids:
+                self._ids_ordenados.agregar(id_producto)
+
+    def _indexar_nombre(self, id_producto: int, nombre: str):
+        self._version_nombres += 1
+        self._indice_nombres.agregar(id_producto, nombre)
+        if self._indice_difuso is not None:
+            self._indice_difuso.agregar(id_producto, nombre)
+
+    def _desindexar_nombre(self, id_producto: int):
+        self._version_nombres += 1
+        self._indice_nombres.eliminar(id_producto)
+        if self._indice_difuso is not None:
+            self._indice_difuso.eliminar(id_producto)
+
+    def _quitar_fila(self, id_producto: int) -> bool:
+        """Elimina en O(1) moviendo la última fila al hueco que deja el producto."""
+        fila = self._fila.pop(id_producto, None)
+        if fila is None:
+            return False
+        ultima = self._n - 1
+        if fila != ultima:
+            self._ids[fila] = self._ids[ultima]
+            self._cantidades[fila] = self._cantidades[ultima]
+            self._precios[fila] = self._precios[ultima]
+            self._nombres[fila] = self._nombres[ultima]
+            self._fila[int(self._ids[fila])] = fila
+        self._nombres.pop()
+        self._n -= 1
+        self._desindexar_nombre(id_producto)
+        self._ids_ordenados.eliminar(id_producto)
+        return True
+
+    def _producto_en(self, fila: int) -> Producto:
+        return Producto(int(self._ids[fila]), self._nombres[fila],
+                        int(self._cantidades[fila]), float(self._precios[fila]))
+
+    def cargar_desde_archivo(self):
+        """Lee el archivo JSON y reconstruye las columnas validándolas de forma vectorizada."""
+        try:
+            with open(self._ruta_archivo, 'r', encoding='utf-8') as archivo:
+                datos = json.load(archivo)
+
+            # Si un ID se repite prevalece el último registro, igual que en Inventario
+            ultimo: Dict[int, dict] = {item['id']: item for item in datos}
+            registros = list(ultimo.values())
+            total = len(registros)
+            ids = np.fromiter((item['id'] for item in registros), dtype=np.int64, count=total)
+            cantidades = np.fromiter((item['cantidad'] for item in registros), dtype=np.int64, count=total)
+            precios = np.fromiter((round(item['precio'], 2) for item in registros), dtype=np.float64, count=total)
+            nombres = [str(item['nombre']).strip() for item in registros]
+
+            if (ids <= 0).any():
+                raise ValueError("El ID debe ser un número positivo")
+            if (cantidades < 0).any():
+                raise ValueError("La cantidad no puede ser negativa")
+            if (precios < 0).any():
+                raise ValueError("El precio no puede ser negativo")
+            if not all(nombres):
+                raise ValueError("El nombre no puede estar vacío")
+
+            self._vaciar()
+            self._anexar_columnas(ids, nombres, cantidades, precios)
+            print(f"--- Sistema: Inventario cargado exitosamente desde '{self._ruta_archivo}' ---")
+
+        except FileNotFoundError:
+            print(f"--- Sistema: Archivo '{self._ruta_archivo}' no encontrado. Se creará automáticamente al guardar. ---")
+            try:
+                with open(self._ruta_archivo, 'w', encoding='utf-8') as archivo:
+                    json.dump([], archivo)
+            except PermissionError:
+                print("--- Error Crítico: No hay permisos para crear el archivo en este directorio. ---")
+        except json.JSONDecodeError:
+            print(f"--- Error: El archivo '{self._ruta_archivo}' está corrupto. Se inicia con inventario vacío. ---")
+        except PermissionError:
+            print(f"--- Error: Permisos insuficientes para leer '{self._ruta_archivo}'. ---")
+        except Exception as e:
+            print(f"--- Error inesperado al cargar el archivo: {e} ---")
+
+    def guardar_en_archivo(self):
+        """Serializa las columnas con el mismo formato JSON que Inventario."""
+        n = self._n
+        datos = [
+            {'id': id_producto, 'nombre': nombre, 'cantidad': cantidad, 'precio': precio}
+            for id_producto, nombre, cantidad, precio in zip(
+                self._ids[:n].tolist(), self._nombres, self._cantidades[:n].tolist(), self._precios[:n].tolist()
+            )
+        ]
+        try:
+            with open(self._ruta_archivo, 'w', encoding='utf-8') as archivo:
+                json.dump(datos, archivo, indent=4)
+        except PermissionError:
+            raise PermissionError(f"Permiso denegado para escribir en '{self._ruta_archivo}'")
+        except Exception as e:
+            raise Exception(f"Fallo inesperado al guardar el archivo: {e}")
+
+    def compactar(self):
+        """Sin diario de cambios equivale a guardar_en_archivo (compatibilidad con Inventario)."""
+        self.guardar_en_archivo()
+        self._volcar_movimientos()
+
+    def sincronizar(self):
+        """Los cambios confirmados ya están en el archivo; solo quedan por escribir los movimientos."""
+        self._volcar_movimientos()
+
+    def cerrar(self):
+        """Escribe los movimientos pendientes (compatibilidad con Inventario)."""
+        self._volcar_movimientos()
+
+    def _volcar_movimientos(self):
+        """Escribe los movimientos pendientes, salvo los de una transacción sin confirmar."""
+        if self._movimientos is not None and not self._en_transaccion:
+            self._movimientos.volcar()
+
+    def _persistir(self):
+        """Guarda un cambio; dentro de una transacción se guarda una sola vez al confirmarla."""
+        if self._en_transaccion:
+            return
+        self.guardar_en_archivo()
+        self._volcar_movimientos()
+
+    def _respaldar(self, id_producto: int):
+        """Guarda una copia del producto la primera vez que una transacción lo modifica."""
+        if self._en_transaccion and id_producto not in self._respaldo:
+            self._respaldo[id_producto] = self.buscar_por_id(id_producto)
+
+    def _registrar_movimiento(self, id_producto: int, delta: int):
+        if self._movimientos is not None and delta:
+            self._movimientos.registrar(id_producto, delta)
+
+    def _revertir(self, respaldo: Dict[int, Optional[Producto]]):
+        """Restaura en las columnas el estado previo de los productos modificados por una transacción."""
+        for id_producto, anterior in respaldo.items():
+            fila = self._fila.get(id_producto)
+            if anterior is None:
+                if fila is not None:
+                    self._quitar_fila(id_producto)
+            elif fila is None:
+                self._anexar_columnas(np.array([anterior.id], dtype=np.int64), [anterior.nombre],
+                                      np.array([anterior.cantidad], dtype=np.int64),
+                                      np.array([anterior.precio], dtype=np.float64))
+            else:
+                self._cantidades[fila] = anterior.cantidad
+                self._precios[fila] = anterior.precio
+                if self._nombres[fila] != anterior.nombre:
+                    self._nombres[fila] = anterior.nombre
+                    self._indexar_nombre(id_producto, anterior.nombre)
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Agrupa varios cambios para guardarlos una sola vez al finalizar el bloque.
+
+        Si ocurre una excepción dentro del bloque se revierten todos y la excepción se propaga.
+        Una transacción anidada se integra a la externa.
+        """
+        if self._en_transaccion:
+            yield self
+            return
+
+        self._en_transaccion = True
+        self._respaldo = {}
+        marca = self._movimientos.marca() if self._movimientos is not None else 0
+        try:
+            yield self
+        except BaseException:
+            respaldo = self._respaldo
+            self._en_transaccion = False
+            self._respaldo = {}
+            self._revertir(respaldo)
+            if self._movimientos is not None:
+                self._movimientos.deshacer_hasta(marca)
+            raise
+        modificados = len(self._respaldo)
+        self._en_transaccion = False
+        self._respaldo = {}
+        if modificados:
+            self._persistir()
+
+    def agregar_producto(self, producto: Producto) -> bool:
+        if producto.id in self._fila:
+            return False
+        self._respaldar(producto.id)
+        self._anexar_columnas(np.array([producto.id], dtype=np.int64), [producto.nombre],
+                              np.array([producto.cantidad], dtype=np.int64),
+                              np.array([producto.precio], dtype=np.float64))
+        self._persistir()
+        return True
+
+    def eliminar_producto(self, id_producto: int) -> bool:
+        """Elimina en O(1) moviendo la última fila al hueco que deja el producto."""
+        if id_producto not in self._fila:
+            return False
+        self._respaldar(id_producto)
+        self._quitar_fila(id_producto)
+        self._persistir()
+        return True
+
+    def actualizar_cantidad(self, id_producto: int, nueva_cantidad: int) -> bool:
+        fila = self._fila.get(id_producto)
+        if fila is None:
+            return False
+        if nueva_cantidad < 0:
+            raise ValueError("La cantidad no puede ser negativa")
+        self._respaldar(id_producto)
+        self._registrar_movimiento(id_producto, nueva_cantidad - int(self._cantidades[fila]))
+        self._cantidades[fila] = nueva_cantidad
+        self._persistir()
+        return True
+
+    def actualizar_precio(self, id_producto: int, nuevo_precio: float) -> bool:
+        fila = self._fila.get(id_producto)
+        if fila is None:
+            return False
+        if nuevo_precio < 0:
+            raise ValueError("El precio no puede ser negativo")
+        self._respaldar(id_producto)
+        self._precios[fila] = round(nuevo_precio, 2)
+        self._persistir()
+        return True
+
+    def actualizar_nombre(self, id_producto: int, nuevo_nombre: str) -> bool:
+        fila = self._fila.get(id_producto)
+        if fila is None:
+            return False
+        if not nuevo_nombre or not nuevo_nombre.strip():
+            raise ValueError("El nombre no puede estar vacío")
+        self._respaldar(id_producto)
+        self._nombres[fila] = nuevo_nombre.strip()
+        self._indexar_nombre(id_producto, self._nombres[fila])
+        self._persistir()
+        return True
+
+    def incrementar_cantidad(self, id_producto: int, delta: int) -> bool:
+        """
+        Suma delta (positivo o negativo) a la cantidad actual del producto.
+
+        Raises:
+            ValueError: Si la cantidad resultante sería negativa
+        """
+        fila = self._fila.get(id_producto)
+        if fila is None:
+            return False
+        return self.actualizar_cantidad(id_producto, int(self._cantidades[fila]) + delta)
+
+    def decrementar_si_hay(self, id_producto: int, cantidad: int) -> bool:
+        """
+        Descuenta cantidad unidades solo si hay existencias suficientes.
+
+        Returns:
+            True si se descontó; False si el producto no existe o no alcanza el stock
+
+        Raises:
+            ValueError: Si la cantidad a descontar no es positiva
+        """
+        if cantidad <= 0:
+            raise ValueError("La cantidad a descontar debe ser positiva")
+        fila = self._fila.get(id_producto)
+        if fila is None or self._cantidades[fila] < cantidad:
+            return False
+        return self.actualizar_cantidad(id_producto, int(self._cantidades[fila]) - cantidad)
+
+    def agregar_lote(self, productos: Iterable[Producto]) -> int:
+        """
+        Agrega varios productos con una sola escritura en disco.
+
+        Raises:
+            ValueError: Si algún ID ya existe o se repite en el lote (no se agrega ninguno)
+        """
+        lote = list(productos)
+        vistos = set()
+        for producto in lote:
+            if producto.id in self._fila or producto.id in vistos:
+                raise ValueError(f"Ya existe un producto con ID {producto.id}")
+            vistos.add(producto.id)
+        if lote:
+            for producto in lote:
+                self._respaldar(producto.id)
+            self._anexar_columnas(
+                np.fromiter((p.id for p in lote), dtype=np.int64, count=len(lote)),
+                [p.nombre for p in lote],
+                np.fromiter((p.cantidad for p in lote), dtype=np.int64, count=len(lote)),
+                np.fromiter((p.precio for p in lote), dtype=np.float64, count=len(lote)),
+            )
+            self._persistir()
+        return len(lote)
+
+    def actualizar_lote(self, cambios: Iterable[Tuple[int, int]]) -> int:
+        """
+        Actualiza la cantidad de varios productos con una asignación vectorizada y una sola escritura.
+
+        Raises:
+            ValueError: Si algún ID no existe o alguna cantidad es negativa (no se aplica ninguna)
+        """
+        pares = list(cambios)
+        filas = []
+        for id_producto, nueva_cantidad in pares:
+            fila = self._fila.get(id_producto)
+            if fila is None:
+                raise ValueError(f"No existe producto con ID {id_producto}")
+            if nueva_cantidad < 0:
+                raise ValueError("La cantidad no puede ser negativa")
+            filas.append(fila)
+        if pares:
+            for id_producto, _ in pares:
+                self._respaldar(id_producto)
+            if self._movimientos is not None:
+                # Variaciones en el orden de los cambios, como si se aplicaran uno a uno
+                actuales: Dict[int, int] = {}
+                for (id_producto, nueva_cantidad), fila in zip(pares, filas):
+                    anterior = actuales.get(id_producto, int(self._cantidades[fila]))
+                    self._registrar_movimiento(id_producto, nueva_cantidad - anterior)
+                    actuales[id_producto] = nueva_cantidad
+            # Con índices repetidos NumPy conserva la última asignación, como un bucle secuencial
+            self._cantidades[np.array(filas, dtype=np.int64)] = np.array([c for _, c in pares], dtype=np.int64)
+            self._persistir()
+        return len(pares)
+
+    def buscar_por_id(self, id_producto: int) -> Optional[Producto]:
+        fila = self._fila.get(id_producto)
+        return None if fila is None else self._producto_en(fila)
+
+    def buscar_por_nombre(self, nombre_busqueda: str) -> List[Producto]:
+        """
+        Búsqueda por subcadena con el índice de trigramas. Los IDs encontrados por las últimas
+        consultas se recuerdan hasta que se agrega, elimina o renombra algún producto.
+        """
+        nombre_normalizado = nombre_busqueda.strip().lower()
+        ids = self._cache_busquedas.obtener(nombre_normalizado, self._version_nombres)
+        if ids is None:
+            ids = tuple(self._indice_nombres.buscar(nombre_normalizado))
+            if len(ids) <= self.MAXIMO_RESULTADOS_CACHE:
+                self._cache_busquedas.guardar(nombre_normalizado, self._version_nombres, ids)
+        # Los productos se construyen en cada llamada con las cantidades y precios actuales
+        return [self._producto_en(self._fila[id_producto]) for id_producto in ids]
+
+    def estadisticas_cache(self) -> dict:
+        """Aciertos, fallos, tasa de aciertos e invalidaciones de la caché de buscar_por_nombre."""
+        return self._cache_busquedas.estadisticas()
+
+    def buscar_aproximado(self, texto: str, limite: int = 10) -> List[Producto]:
+        """Búsqueda tolerante a errores de escritura, como Inventario.buscar_aproximado."""
+        if self._indice_difuso is None:
+            self._indice_difuso = IndiceDifuso()
+            for id_producto, fila in self._fila.items():
+                self._indice_difuso.agregar(id_producto, self._nombres[fila])
+        return [self._producto_en(self._fila[id_producto])
+                for id_producto, _ in self._indice_difuso.buscar(texto, limite)]
+
+    def reporte_reposicion(self, dias_cobertura: float = 7.0) -> List[Tuple[Producto, float, float]]:
+        """
+        Productos cuyo stock no alcanza para dias_cobertura días, como Inventario.reporte_reposicion.
+
+        Raises:
+            ValueError: Si el inventario no registra movimientos
+        """
+        if self._movimientos is None:
+            raise ValueError("El inventario no registra movimientos (use registrar_movimientos=True)")
+        return calcular_reposicion(self._movimientos, self.buscar_por_id, dias_cobertura)
+
+    def obtener_todos(self) -> List[Producto]:
+        return [self._producto_en(self._fila[id_producto]) for id_producto in self._ids_ordenados]
+
+    def rango_ids(self, desde: int, hasta: int) -> List[Producto]:
+        return [self._producto_en(self._fila[id_producto]) for id_producto in self._ids_ordenados.rango(desde, hasta)]
+
+    def pagina(self, numero: int, tamaño: int) -> List[Producto]:
+        if numero < 1 or tamaño < 1:
+            raise ValueError("El número y el tamaño de página deben ser positivos")
+        ids = self._ids_ordenados.porcion((numero - 1) * tamaño, tamaño)
+        return [self._producto_en(self._fila[id_producto]) for id_producto in ids]
+
+    def recorrer(self, tamaño_bloque: int = 10000) -> Iterator[Producto]:
+        """Recorre todos los productos ordenados por ID de a tamaño_bloque, sin construir la lista completa."""
+        numero = 1
+        while True:
+            bloque = self.pagina(numero, tamaño_bloque)
+            yield from bloque
+            if len(bloque) < tamaño_bloque:
+                return
+            numero += 1
+
+    def total_paginas(self, tamaño: int) -> int:
+        if tamaño < 1:
+            raise ValueError("El tamaño de página debe ser positivo")
+        return (self._n + tamaño - 1) // tamaño
+
+    def esta_vacio(self) -> bool:
+        return self._n == 0
+
+    def obtener_tamaño(self) -> int:
+        return self._n
+
+    # Reportes vectorizados
+    def valor_total(self) -> float:
+        """Valor del stock completo: suma de cantidad * precio calculada con un producto punto."""
+        n = self._n
+        return round(float(np.dot(self._cantidades[:n], self._precios[:n])), 2)
+
+    def bajo_stock(self, umbral: int) -> List[Producto]:
+        """Productos cuya cantidad es menor que el umbral de reposición, ordenados por ID."""
+        n = self._n
+        filas = np.flatnonzero(self._cantidades[:n] < umbral)
+        filas = filas[np.argsort(self._ids[filas], kind='stable')]
+        return [self._producto_en(int(fila)) for fila in filas]
+
+    def estadisticas_precio(self) -> dict:
+        """Mínimo, máximo, promedio, mediana y desviación estándar de los precios."""
+        precios = self._precios[:self._n]
+        if precios.size == 0:
+            return {'productos': 0, 'minimo': 0.0, 'maximo': 0.0, 'promedio': 0.0, 'mediana': 0.0, 'desviacion': 0.0}
+        return {
+            'productos': int(precios.size),
+            'minimo': float(precios.min()),
+            'maximo': float(precios.max()),
+            'promedio': round(float(precios.mean()), 2),
+            'mediana': round(float(np.median(precios)), 2),
+            'desviacion': round(float(precios.std()), 2),
+        }
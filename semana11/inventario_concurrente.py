@@ -0,0 +1,165 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from inventario import Inventario
+from metricas import Metricas
+from producto import Producto
+
+
+class InventarioConcurrente(Inventario):
+    """
+    Variante de Inventario que puede compartirse entre varios hilos de un mismo proceso.
+
+    Usa cerrojos por franjas: cada ID se asigna a uno de 'franjas' cerrojos (id % franjas),
+    de modo que los cambios sobre productos distintos no se esperan entre sí y los de un
+    mismo producto se aplican (y se registran en el diario) en orden. Las operaciones que
+    modifican las estructuras compartidas (altas, bajas, renombres, índice de nombres y
+    listado ordenado) toman además un cerrojo de estructura.
+
+    Los índices secundarios de precio y cantidad, que los setters de Producto actualizan
+    desde cualquier franja, tienen su propio cerrojo, que se toma siempre en último lugar.
+
+    Orden de adquisición, para evitar bloqueos mutuos: estructura -> franjas en orden
+    ascendente -> índices. Las transacciones y los lotes toman estructura y franjas.
+    """
+
+    def __init__(self, ruta_archivo: str = "inventario.json", usar_diario: bool = False,
+                 umbral_compactacion: int = 1000, progreso: Optional[Callable[[int, int], None]] = None,
+                 escritura_diferida: Optional[float] = None, franjas: int = 64,
+                 metricas: Optional[Metricas] = None, registrar_movimientos: bool = False):
+        """
+        Args:
+            franjas: Número de cerrojos entre los que se reparten los IDs
+            (el resto de los argumentos son los de Inventario)
+        """
+        if franjas < 1:
+            raise ValueError("Debe haber al menos una franja de cerrojos")
+        # Reentrantes: incrementar_cantidad llama a actualizar_cantidad con la franja ya tomada
+        self._cerrojos = [threading.RLock() for _ in range(franjas)]
+        self._cerrojo_estructura = threading.RLock()
+        self._cerrojo_indices = threading.RLock()
+        super().__init__(ruta_archivo, usar_diario, umbral_compactacion, progreso, escritura_diferida, metricas,
+                         registrar_movimientos)
+
+    def _cerrojo_de(self, id_producto: int) -> threading.RLock:
+        return self._cerrojos[id_producto % len(self._cerrojos)]
+
+    @contextmanager
+    def _exclusivo(self):
+        """Toma todos los cerrojos: ningún otro hilo puede leer ni modificar productos mientras tanto."""
+        with self._cerrojo_estructura:
+            for cerrojo in self._cerrojos:
+                cerrojo.acquire()
+            try:
+                yield
+            finally:
+                for cerrojo in reversed(self._cerrojos):
+                    cerrojo.release()
+
+    def cargar_desde_archivo(self):
+        with self._exclusivo():
+            super().cargar_desde_archivo()
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Igual que Inventario.transaccion, pero el bloque se ejecuta con todos los cerrojos
+        tomados: los demás hilos esperan y no ven cambios a medio aplicar ni se mezclan con ellos.
+        """
+        with self._exclusivo():
+            with super().transaccion():
+                yield self
+
+    def agregar_producto(self, producto: Producto) -> bool:
+        with self._cerrojo_estructura, self._cerrojo_de(producto.id):
+            return super().agregar_producto(producto)
+
+    def eliminar_producto(self, id_producto: int) -> bool:
+        with self._cerrojo_estructura, self._cerrojo_de(id_producto):
+            return super().eliminar_producto(id_producto)
+
+    def actualizar_cantidad(self, id_producto: int, nueva_cantidad: int) -> bool:
+        with self._cerrojo_de(id_producto):
+            return super().actualizar_cantidad(id_producto, nueva_cantidad)
+
+    def actualizar_precio(self, id_producto: int, nuevo_precio: float) -> bool:
+        with self._cerrojo_de(id_producto):
+            return super().actualizar_precio(id_producto, nuevo_precio)
+
+    def actualizar_nombre(self, id_producto: int, nuevo_nombre: str) -> bool:
+        with self._cerrojo_estructura, self._cerrojo_de(id_producto):
+            return super().actualizar_nombre(id_producto, nuevo_nombre)
+
+    def incrementar_cantidad(self, id_producto: int, delta: int) -> bool:
+        """Lectura y escritura de la cantidad en un solo paso atómico respecto de los demás hilos."""
+        with self._cerrojo_de(id_producto):
+            return super().incrementar_cantidad(id_producto, delta)
+
+    def decrementar_si_hay(self, id_producto: int, cantidad: int) -> bool:
+        """Comprobación de stock y descuento en un solo paso: dos hilos no pueden vender la misma unidad."""
+        with self._cerrojo_de(id_producto):
+            return super().decrementar_si_hay(id_producto, cantidad)
+
+    def agregar_lote(self, productos: Iterable[Producto]) -> int:
+        with self._exclusivo():
+            return super().agregar_lote(productos)
+
+    def actualizar_lote(self, cambios: Iterable[Tuple[int, int]]) -> int:
+        with self._exclusivo():
+            return super().actualizar_lote(cambios)
+
+    def _vincular(self, producto: Producto):
+        with self._cerrojo_indices:
+            super()._vincular(producto)
+
+    def _desvincular(self, producto: Producto):
+        with self._cerrojo_indices:
+            super()._desvincular(producto)
+
+    def producto_modificado(self, producto: Producto, campo: str, anterior):
+        if campo == 'nombre':
+            # Un renombre toca el índice de nombres, que las búsquedas leen bajo el cerrojo de
+            # estructura: se toma antes que el de índices, en el orden documentado
+            with self._cerrojo_estructura, self._cerrojo_indices:
+                super().producto_modificado(producto, campo, anterior)
+            return
+        with self._cerrojo_indices:
+            super().producto_modificado(producto, campo, anterior)
+
+    def por_rango_precio(self, desde: float, hasta: float) -> List[Producto]:
+        with self._cerrojo_indices:
+            return super().por_rango_precio(desde, hasta)
+
+    def por_rango_cantidad(self, desde: int, hasta: int) -> List[Producto]:
+        with self._cerrojo_indices:
+            return super().por_rango_cantidad(desde, hasta)
+
+    def top_k(self, campo: str, k: int, mayores: bool = False) -> List[Producto]:
+        with self._cerrojo_indices:
+            return super().top_k(campo, k, mayores)
+
+    def buscar_por_nombre(self, nombre_busqueda: str) -> List[Producto]:
+        # El índice de nombres y la caché de búsquedas se construyen o modifican bajo el cerrojo de estructura
+        with self._cerrojo_estructura:
+            return super().buscar_por_nombre(nombre_busqueda)
+
+    def buscar_aproximado(self, texto: str, limite: int = 10) -> List[Producto]:
+        with self._cerrojo_estructura:
+            return super().buscar_aproximado(texto, limite)
+
+    def reporte_reposicion(self, dias_cobertura: float = 7.0) -> List[Tuple[Producto, float, float]]:
+        with self._cerrojo_estructura:
+            return super().reporte_reposicion(dias_cobertura)
+
+    def obtener_todos(self) -> List[Producto]:
+        with self._cerrojo_estructura:
+            return super().obtener_todos()
+
+    def rango_ids(self, desde: int, hasta: int) -> List[Producto]:
+        with self._cerrojo_estructura:
+            return super().rango_ids(desde, hasta)
+
+    def pagina(self, numero: int, tamaño: int) -> List[Producto]:
+        with self._cerrojo_estructura:
+            return super().pagina(numero, tamaño)
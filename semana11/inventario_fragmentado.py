@@ -0,0 +1,357 @@
+import glob
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, List, Optional, Set, Tuple
+
+from inventario import Inventario, _serializar_productos
+from lector_json import iterar_arreglo_json
+from metricas import Metricas
+from producto import Producto
+
+ESTRATEGIAS = ('hash', 'rango')
+
+
+def _fragmento_de(id_producto: int, fragmentos: int, estrategia: str, tamano_rango: int) -> int:
+    """Fragmento (0 .. fragmentos - 1) al que pertenece un ID."""
+    if estrategia == 'hash':
+        return id_producto % fragmentos
+    # Por rango: IDs 1..tamano_rango en el primero, y así sucesivamente; el último recibe el resto
+    return min((id_producto - 1) // tamano_rango, fragmentos - 1)
+
+
+def _leer_fragmento(ruta: str, numero: Optional[int], fragmentos: int, estrategia: str,
+                    tamano_rango: int) -> Tuple[List[dict], int, int]:
+    """
+    Lee y valida un archivo de fragmento (se ejecuta en un proceso del pool).
+
+    Args:
+        ruta: Archivo JSON del fragmento
+        numero: Fragmento que debería contener según la distribución actual, o None si el
+            archivo pertenece a otra distribución
+
+    Returns:
+        Filas del fragmento, bytes leídos y cuántas filas no corresponden a este fragmento
+    """
+    try:
+        with open(ruta + ".sha256", 'r', encoding='utf-8') as archivo:
+            suma_guardada = archivo.read().strip()
+    except OSError:
+        suma_guardada = None
+
+    # El archivo se analiza por flujo y la suma se calcula con los mismos bloques, sin
+    # mantener en memoria el texto completo junto con las filas
+    suma = hashlib.sha256()
+    leidos = 0
+
+    def al_leer(bloque: bytes):
+        nonlocal leidos
+        suma.update(bloque)
+        leidos += len(bloque)
+
+    with open(ruta, 'rb') as archivo:
+        filas = list(iterar_arreglo_json(archivo, al_leer=al_leer))
+    if suma_guardada != suma.hexdigest():
+        # Las mismas validaciones que la carga de Inventario; se devuelven los valores normalizados
+        filas = [producto.to_dict() for producto in Producto.desde_filas(filas, validar=True)]
+    if numero is None:
+        fuera_de_lugar = len(filas)
+    else:
+        fuera_de_lugar = sum(1 for fila in filas
+                             if _fragmento_de(fila['id'], fragmentos, estrategia, tamano_rango) != numero)
+    return filas, leidos, fuera_de_lugar
+
+
+def _archivos_de_fragmentos(ruta_archivo: str) -> List[str]:
+    """Fragmentos de ruta_archivo en cualquier distribución (raiz-NNdeMM.ext), ordenados por nombre."""
+    raiz, extension = os.path.splitext(ruta_archivo)
+    patron = re.compile(re.escape(os.path.basename(raiz)) + r"-\d+de\d+" + re.escape(extension) + "$")
+    return sorted(ruta for ruta in glob.glob(glob.escape(raiz) + "-*de*" + glob.escape(extension))
+                  if patron.match(os.path.basename(ruta)))
+
+
+def fusionar_fragmentos(ruta_archivo: str) -> int:
+    """
+    Vuelve al inventario sin fragmentar: reúne en ruta_archivo los productos de todos sus
+    fragmentos y los elimina.
+
+    Los fragmentos se escribieron a partir de ruta_archivo y de su diario (.log), así que si
+    quedan restos de ellos (una migración interrumpida) se descartan en lugar de aplicarse.
+
+    Returns:
+        Número de productos reunidos (0 si no había fragmentos)
+
+    Raises:
+        Exception: Si algún fragmento no se puede leer; no se modifica ningún archivo
+    """
+    archivos = _archivos_de_fragmentos(ruta_archivo)
+    if not archivos:
+        return 0
+    filas_por_id = {}
+    for ruta in archivos:
+        try:
+            filas, _, _ = _leer_fragmento(ruta, None, 1, 'hash', 1)
+        except Exception as e:
+            raise Exception(f"No se pudo leer el fragmento '{ruta}' ({e}); se conservan los fragmentos sin cambios")
+        filas_por_id.update((fila['id'], fila) for fila in filas)
+
+    print(f"--- Sistema: Reuniendo {len(archivos)} fragmento(s) en '{ruta_archivo}' ---")
+    # Hasta que se escriba la nueva instantánea los fragmentos siguen en disco: una interrupción
+    # se recupera repitiendo la fusión en el próximo inicio
+    for archivo in (ruta_archivo, ruta_archivo + ".sha256", ruta_archivo + ".log"):
+        try:
+            os.remove(archivo)
+        except FileNotFoundError:
+            pass
+    inventario = Inventario(ruta_archivo, usar_diario=True)
+    try:
+        inventario.agregar_lote(Producto.desde_filas(list(filas_por_id.values()), validar=False))
+        inventario.compactar()
+    finally:
+        inventario.cerrar()
+    for ruta in archivos:
+        for archivo in (ruta, ruta + ".sha256"):
+            try:
+                os.remove(archivo)
+            except FileNotFoundError:
+                pass
+    return len(filas_por_id)
+
+
+class InventarioFragmentado(Inventario):
+    """
+    Variante de Inventario que reparte los productos en varios archivos JSON (fragmentos).
+
+    Con ruta_archivo="inventario.json" y 4 fragmentos se usan inventario-01de04.json ...
+    inventario-04de04.json, cada uno con su suma .sha256. Un producto va al fragmento
+    id % fragmentos (estrategia 'hash') o al de su tramo de IDs (estrategia 'rango').
+
+    Al iniciar, los fragmentos se leen y validan en paralelo en un pool de procesos. Cada
+    guardado reescribe solo los fragmentos que contienen productos modificados, agregados o
+    eliminados, así que su costo depende del tamaño del fragmento y no del inventario.
+
+    Si al cargar se encuentran archivos de otra distribución (otro número de fragmentos, otra
+    estrategia o un único inventario.json sin fragmentar), sus productos se cargan y se
+    redistribuyen en la distribución actual, y los archivos anteriores se eliminan. Del
+    inventario sin fragmentar se aplica también su diario de cambios (.log) antes de
+    redistribuirlo. Para volver a un solo archivo se usa fusionar_fragmentos.
+    """
+
+    def __init__(self, ruta_archivo: str = "inventario.json", fragmentos: int = 4,
+                 estrategia: str = 'hash', tamano_rango: int = 100000, procesos: Optional[int] = None,
+                 progreso: Optional[Callable[[int, int], None]] = None,
+                 escritura_diferida: Optional[float] = None, metricas: Optional[Metricas] = None,
+                 registrar_movimientos: bool = False):
+        """
+        Args:
+            fragmentos: Número de archivos entre los que se reparten los productos
+            estrategia: 'hash' (id % fragmentos) o 'rango' (tramos consecutivos de tamano_rango IDs)
+            tamano_rango: IDs por fragmento con la estrategia 'rango'
+            procesos: Procesos del pool de carga (por defecto, los núcleos disponibles; 1 carga
+                en este mismo proceso)
+            (el resto de los argumentos son los de Inventario; no usa diario de cambios, porque
+            cada guardado ya escribe solo los fragmentos afectados)
+        """
+        if fragmentos < 1:
+            raise ValueError("Debe haber al menos un fragmento")
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estrategia desconocida: {estrategia!r} (use {' o '.join(ESTRATEGIAS)})")
+        if tamano_rango < 1:
+            raise ValueError("El tamaño del rango debe ser positivo")
+        self._fragmentos = fragmentos
+        self._estrategia = estrategia
+        self._tamano_rango = tamano_rango
+        self._procesos = procesos
+        # IDs de cada fragmento, para reescribir uno sin recorrer todo el inventario
+        self._ids_fragmento: List[Set[int]] = [set() for _ in range(fragmentos)]
+        super().__init__(ruta_archivo, usar_diario=False, progreso=progreso, escritura_diferida=escritura_diferida,
+                         metricas=metricas, registrar_movimientos=registrar_movimientos)
+
+    def _fragmento(self, id_producto: int) -> int:
+        return _fragmento_de(id_producto, self._fragmentos, self._estrategia, self._tamano_rango)
+
+    def ruta_fragmento(self, numero: int) -> str:
+        """Archivo del fragmento numero (base 0)."""
+        raiz, extension = os.path.splitext(self._ruta_archivo)
+        return f"{raiz}-{numero + 1:02d}de{self._fragmentos:02d}{extension}"
+
+    def _archivos_anteriores(self) -> List[str]:
+        """
+        Archivos de otras distribuciones: otro número de fragmentos o el inventario sin
+        fragmentar (también si solo queda su diario de cambios).
+        """
+        actuales = {self.ruta_fragmento(k) for k in range(self._fragmentos)}
+        anteriores = [ruta for ruta in _archivos_de_fragmentos(self._ruta_archivo) if ruta not in actuales]
+        if os.path.exists(self._ruta_archivo) or os.path.exists(self._ruta_diario):
+            anteriores.insert(0, self._ruta_archivo)
+        return anteriores
+
+    def _leer_sin_fragmentar(self) -> Tuple[List[dict], int, int]:
+        """Como _leer_fragmento para el inventario sin fragmentar, que puede no tener instantánea."""
+        if not os.path.exists(self._ruta_archivo):
+            return [], 0, 0
+        return _leer_fragmento(self._ruta_archivo, None, self._fragmentos, self._estrategia, self._tamano_rango)
+
+    def cargar_desde_archivo(self):
+        """
+        Lee todos los fragmentos en paralelo y reconstruye el inventario.
+
+        Un fragmento corrupto o ilegible se informa y se omite sin afectar a los demás.
+        """
+        anteriores = self._archivos_anteriores()
+        actuales = [(self.ruta_fragmento(k), k) for k in range(self._fragmentos)
+                    if os.path.exists(self.ruta_fragmento(k))]
+        # Los de la distribución actual se aplican al final: ante un ID repetido (una
+        # redistribución interrumpida) prevalece su versión
+        tareas = [(ruta, None) for ruta in anteriores] + actuales
+        if not tareas:
+            print(f"--- Sistema: No se encontraron fragmentos de '{self._ruta_archivo}'. "
+                  f"Se crearán automáticamente al guardar. ---")
+            self._reconstruir_indices()
+            return
+
+        total = sum(os.path.getsize(ruta) for ruta, _ in tareas if os.path.exists(ruta))
+        leidos = 0
+        fuera_de_lugar = 0
+        cargados: Set[str] = set()
+        procesos = self._procesos if self._procesos is not None else os.cpu_count() or 1
+        pool = ProcessPoolExecutor(max_workers=min(procesos, len(tareas))) if procesos > 1 and len(tareas) > 1 else None
+        distribucion = (self._fragmentos, self._estrategia, self._tamano_rango)
+        try:
+            # Cada elemento es una función sin argumentos que devuelve el resultado de un fragmento
+            # (el inventario sin fragmentar se lee aquí, porque luego se le aplica su diario)
+            if pool is None:
+                pendientes = [partial(_leer_fragmento, ruta, numero, *distribucion) for ruta, numero in tareas]
+            else:
+                pendientes = [pool.submit(_leer_fragmento, ruta, numero, *distribucion).result
+                              if ruta != self._ruta_archivo else None for ruta, numero in tareas]
+            pendientes = [self._leer_sin_fragmentar if ruta == self._ruta_archivo else pendiente
+                          for (ruta, _), pendiente in zip(tareas, pendientes)]
+            for (ruta, _), pendiente in zip(tareas, pendientes):
+                try:
+                    filas, tamano, fuera = pendiente()
+                except json.JSONDecodeError:
+                    print(f"--- Error: El fragmento '{ruta}' está corrupto. Se omiten sus productos. ---")
+                    continue
+                except PermissionError:
+                    print(f"--- Error: Permisos insuficientes para leer '{ruta}'. ---")
+                    continue
+                except Exception as e:
+                    print(f"--- Error inesperado al cargar el fragmento '{ruta}': {e} ---")
+                    continue
+                for producto in Producto.desde_filas(filas, validar=False):
+                    self._productos[producto.id] = producto
+                if ruta == self._ruta_archivo:
+                    # Cambios del inventario sin fragmentar que aún no se habían compactado
+                    try:
+                        self._reproducir_diario()
+                    except Exception as e:
+                        print(f"--- Error: No se pudo aplicar el diario '{self._ruta_diario}' ({e}). "
+                              f"Se conserva junto a '{ruta}'. ---")
+                        continue
+                fuera_de_lugar += fuera
+                cargados.add(ruta)
+                leidos += tamano
+                if self._progreso is not None:
+                    self._progreso(leidos, total)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        self._reconstruir_indices()
+        print(f"--- Sistema: Inventario cargado exitosamente desde {len(cargados)} archivo(s) de '{self._ruta_archivo}' ---")
+        if anteriores or fuera_de_lugar:
+            print(f"--- Sistema: Redistribuyendo el inventario en {self._fragmentos} fragmento(s) ---")
+            self.guardar_en_archivo()
+            # Un archivo anterior que no se pudo leer se conserva para recuperarlo a mano
+            for ruta in anteriores:
+                if ruta not in cargados:
+                    continue
+                sobrantes = (ruta, ruta + ".sha256")
+                if ruta == self._ruta_archivo:
+                    sobrantes += (self._ruta_diario,)
+                for archivo in sobrantes:
+                    try:
+                        os.remove(archivo)
+                    except FileNotFoundError:
+                        pass
+
+    def _reconstruir_indices(self):
+        super()._reconstruir_indices()
+        self._ids_fragmento = [set() for _ in range(self._fragmentos)]
+        for id_producto in self._productos:
+            self._ids_fragmento[self._fragmento(id_producto)].add(id_producto)
+
+    def _vincular(self, producto: Producto):
+        super()._vincular(producto)
+        self._ids_fragmento[self._fragmento(producto.id)].add(producto.id)
+
+    def _desvincular(self, producto: Producto):
+        super()._desvincular(producto)
+        self._ids_fragmento[self._fragmento(producto.id)].discard(producto.id)
+
+    def guardar_en_archivo(self):
+        """Reescribe todos los fragmentos, cada uno de forma atómica y con su suma SHA-256."""
+        with self._cerrojo_disco:
+            # Las altas masivas de agregar_lote no pasan por _vincular: se recalcula el reparto
+            self._ids_fragmento = [set() for _ in range(self._fragmentos)]
+            for id_producto in list(self._productos):
+                self._ids_fragmento[self._fragmento(id_producto)].add(id_producto)
+            self._guardar_fragmentos(range(self._fragmentos))
+
+    def compactar(self):
+        """
+        Sin diario no hay nada que fusionar: se reescriben solo los fragmentos con productos
+        marcados o cuyo reparto cambió (las altas masivas de agregar_lote no se marcan), de
+        modo que cerrar sin cambios no escribe nada.
+        """
+        with self._cerrojo_disco:
+            with self._condicion_escritura:
+                sucios, self._sucios = self._sucios, set()
+            reparto = [set() for _ in range(self._fragmentos)]
+            for id_producto in list(self._productos):
+                reparto[self._fragmento(id_producto)].add(id_producto)
+            cambiados = {self._fragmento(id_producto) for id_producto in sucios}
+            cambiados.update(numero for numero in range(self._fragmentos)
+                             if reparto[numero] != self._ids_fragmento[numero]
+                             or not os.path.exists(self.ruta_fragmento(numero)))
+            anterior, self._ids_fragmento = self._ids_fragmento, reparto
+            try:
+                self._guardar_fragmentos(sorted(cambiados))
+            except Exception:
+                # Con el reparto anterior, la próxima compactación vuelve a detectar los cambios
+                self._ids_fragmento = anterior
+                with self._condicion_escritura:
+                    self._sucios |= sucios
+                raise
+            self._volcar_movimientos()
+
+    def _guardar_fragmentos(self, numeros):
+        """Reescribe los fragmentos indicados con los productos que contienen ahora."""
+        for numero in numeros:
+            ruta = self.ruta_fragmento(numero)
+            productos = [self._productos[id_producto] for id_producto in list(self._ids_fragmento[numero])]
+            try:
+                self._escribir_atomico(ruta, _serializar_productos(productos))
+            except PermissionError:
+                raise PermissionError(f"Permiso denegado para escribir en '{ruta}'")
+            except Exception as e:
+                raise Exception(f"Fallo inesperado al guardar el fragmento '{ruta}': {e}")
+
+    def _persistir(self):
+        """Reescribe solo los fragmentos que contienen productos marcados desde el último guardado."""
+        with self._cerrojo_disco:
+            with self._condicion_escritura:
+                sucios, self._sucios = self._sucios, set()
+            if not sucios:
+                return
+            try:
+                self._guardar_fragmentos(sorted({self._fragmento(id_producto) for id_producto in sucios}))
+            except Exception:
+                with self._condicion_escritura:
+                    self._sucios |= sucios
+                raise
+            self._volcar_movimientos()
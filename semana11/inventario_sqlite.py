@@ -0,0 +1,440 @@
+import sqlite3
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from busqueda_difusa import IndiceDifuso
+from cache_lru import CacheLRU
+from metricas import Metricas, desinstrumentar, instrumentar
+from movimientos import RegistroMovimientos, calcular_reposicion
+from producto import Producto
+
+
+class InventarioSQLite:
+    """
+    Implementación de Inventario respaldada por una base de datos SQLite (módulo estándar sqlite3).
+
+    Acepta los mismos argumentos y ofrece los métodos de Inventario que usan main.py,
+    comandos_inventario, csv_inventario y servidor.py (incluidos métricas, movimientos,
+    búsqueda aproximada y caché de búsquedas), de modo que pueden usarla cambiando solo la
+    importación. No ofrece los índices por precio y cantidad (por_rango_*, top_k) ni
+    publicar_instantanea. Los datos no se cargan en memoria: cada operación es una
+    consulta con parámetros sobre la tabla 'productos', por lo que admite inventarios mayores
+    que la RAM. La base se abre en modo WAL, que permite varios procesos lectores mientras
+    uno escribe.
+
+    La caché de buscar_por_nombre y el índice de buscar_aproximado (que sí vive en memoria y
+    se construye en la primera búsqueda aproximada) se invalidan con los cambios propios y con
+    los confirmados por otros procesos (PRAGMA data_version).
+    """
+
+    METODOS_MEDIDOS = (
+        'guardar_en_archivo', 'compactar', 'agregar_producto', 'eliminar_producto', 'actualizar_cantidad',
+        'actualizar_precio', 'actualizar_nombre', 'incrementar_cantidad', 'decrementar_si_hay', 'agregar_lote',
+        'actualizar_lote', 'buscar_por_id', 'buscar_por_nombre', 'buscar_aproximado', 'obtener_todos', 'pagina',
+        'reporte_reposicion',
+    )
+    TAMANO_CACHE_BUSQUEDAS = 256
+    MAXIMO_RESULTADOS_CACHE = 10000
+
+    # Sentencias fijas con parámetros: sqlite3 las prepara una vez y las reutiliza desde su caché
+    _SQL_ESQUEMA = (
+        "CREATE TABLE IF NOT EXISTS productos ("
+        " id INTEGER PRIMARY KEY CHECK (id > 0),"
+        " nombre TEXT NOT NULL CHECK (length(trim(nombre)) > 0),"
+        " nombre_min TEXT NOT NULL,"
+        " cantidad INTEGER NOT NULL CHECK (cantidad >= 0),"
+        " precio REAL NOT NULL CHECK (precio >= 0))",
+        # nombre_min guarda nombre.lower() de Python (SQLite solo convierte ASCII con lower()). No
+        # lleva índice: la búsqueda es por subcadena (instr), que un índice B-tree no puede resolver,
+        # y el índice encarecía inserciones y renombres. Se borra de las bases creadas antes
+        "DROP INDEX IF EXISTS idx_productos_nombre_min",
+    )
+    _SQL_INSERTAR = "INSERT OR IGNORE INTO productos (id, nombre, nombre_min, cantidad, precio) VALUES (?, ?, ?, ?, ?)"
+    _SQL_ELIMINAR = "DELETE FROM productos WHERE id = ?"
+    _SQL_CANTIDAD = "UPDATE productos SET cantidad = ? WHERE id = ?"
+    _SQL_LEER_CANTIDAD = "SELECT cantidad FROM productos WHERE id = ?"
+    _SQL_DESCONTAR = "UPDATE productos SET cantidad = cantidad - ? WHERE id = ? AND cantidad >= ?"
+    _SQL_PRECIO = "UPDATE productos SET precio = ? WHERE id = ?"
+    _SQL_NOMBRE = "UPDATE productos SET nombre = ?, nombre_min = ? WHERE id = ?"
+    _SQL_POR_ID = "SELECT id, nombre, cantidad, precio FROM productos WHERE id = ?"
+    _SQL_POR_NOMBRE = "SELECT id, nombre, cantidad, precio FROM productos WHERE instr(nombre_min, ?) > 0 ORDER BY id"
+    _SQL_TODOS = "SELECT id, nombre, cantidad, precio FROM productos ORDER BY id"
+    _SQL_RANGO = "SELECT id, nombre, cantidad, precio FROM productos WHERE id BETWEEN ? AND ? ORDER BY id"
+    _SQL_PAGINA = "SELECT id, nombre, cantidad, precio FROM productos ORDER BY id LIMIT ? OFFSET ?"
+    _SQL_SIGUIENTES = "SELECT id, nombre, cantidad, precio FROM productos WHERE id > ? ORDER BY id LIMIT ?"
+    _SQL_TAMANO = "SELECT count(*) FROM productos"
+    _SQL_HAY_ALGUNO = "SELECT EXISTS (SELECT 1 FROM productos)"
+    _SQL_NOMBRES = "SELECT id, nombre FROM productos"
+
+    def __init__(self, ruta_archivo: str = "inventario.db", usar_diario: bool = False,
+                 umbral_compactacion: int = 1000, progreso: Optional[Callable[[int, int], None]] = None,
+                 escritura_diferida: Optional[float] = None, metricas: Optional[Metricas] = None,
+                 registrar_movimientos: bool = False):
+        """
+        Abre (o crea) la base de datos.
+
+        Args:
+            ruta_archivo: Ruta del archivo SQLite
+            usar_diario, umbral_compactacion, progreso, escritura_diferida: Se aceptan por
+                compatibilidad con Inventario; el diario WAL de SQLite cumple la función del
+                diario de cambios y cada cambio se confirma al momento
+            metricas: Si se indica, se miden las operaciones (ver Inventario.activar_metricas)
+            registrar_movimientos: Si es True, los cambios de cantidad se registran en
+                ruta_archivo + '.mov' al confirmarse (ver reporte_reposicion)
+        """
+        self._ruta_archivo = ruta_archivo
+        self._profundidad_transaccion = 0
+        self._conexion: Optional[sqlite3.Connection] = None
+        # Cambios hechos por esta conexión (todos y los que afectan a los nombres); los de otras
+        # conexiones se detectan con PRAGMA data_version
+        self._version = 0
+        self._version_nombres = 0
+        self._cache_busquedas = CacheLRU(self.TAMANO_CACHE_BUSQUEDAS)
+        self._indice_difuso: Optional[IndiceDifuso] = None
+        self._version_difuso = None
+        self._movimientos: Optional[RegistroMovimientos] = None
+        if registrar_movimientos:
+            self._movimientos = RegistroMovimientos(ruta_archivo + ".mov")
+        self._metricas: Optional[Metricas] = None
+        self.cargar_desde_archivo()
+        if metricas is not None:
+            self.activar_metricas(metricas)
+
+    @property
+    def movimientos(self) -> Optional[RegistroMovimientos]:
+        """Registro de movimientos de stock, o None si no se registran."""
+        return self._movimientos
+
+    @property
+    def metricas(self) -> Optional[Metricas]:
+        """Métricas en las que se registran las operaciones, o None si la medición está desactivada."""
+        return self._metricas
+
+    def activar_metricas(self, metricas: Optional[Metricas] = None) -> Metricas:
+        """Empieza a registrar el conteo y la latencia de cada llamada a METODOS_MEDIDOS."""
+        self.desactivar_metricas()
+        self._metricas = metricas if metricas is not None else Metricas()
+        instrumentar(self, self.METODOS_MEDIDOS, self._metricas)
+        return self._metricas
+
+    def desactivar_metricas(self):
+        desinstrumentar(self, self.METODOS_MEDIDOS)
+        self._metricas = None
+
+    def cargar_desde_archivo(self):
+        """Abre la conexión en modo WAL y crea el esquema si no existe."""
+        try:
+            # isolation_level=None: cada sentencia se confirma sola salvo dentro de transaccion()
+            self._conexion = sqlite3.connect(self._ruta_archivo, isolation_level=None)
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            for sentencia in self._SQL_ESQUEMA:
+                self._conexion.execute(sentencia)
+            print(f"--- Sistema: Inventario SQLite abierto desde '{self._ruta_archivo}' ---")
+        except sqlite3.DatabaseError as e:
+            raise Exception(f"No se pudo abrir la base de datos '{self._ruta_archivo}': {e}")
+
+    def guardar_en_archivo(self):
+        """Los cambios ya se confirman en cada operación; aquí solo se traslada el WAL a la base."""
+        self._conexion.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def compactar(self):
+        """Vuelca el WAL completo a la base y lo vacía."""
+        self._conexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    @property
+    def escritura_diferida(self) -> bool:
+        """Siempre False: cada cambio se confirma al momento (compatibilidad con Inventario)."""
+        return False
+
+    def tomar_error_escritura(self) -> Optional[Exception]:
+        """No hay guardados en segundo plano: nunca hay errores pendientes (compatibilidad con Inventario)."""
+        return None
+
+    def sincronizar(self):
+        """Los cambios ya están confirmados; solo quedan por escribir los movimientos."""
+        self._volcar_movimientos()
+
+    def cerrar(self):
+        """Escribe los movimientos pendientes y cierra la conexión con la base de datos."""
+        try:
+            self._volcar_movimientos()
+        finally:
+            self._conexion.close()
+
+    def _volcar_movimientos(self):
+        """Escribe los movimientos pendientes, salvo los de una transacción sin confirmar."""
+        if self._movimientos is not None and not self._profundidad_transaccion:
+            self._movimientos.volcar()
+
+    def _cambio(self, nombres: bool = False):
+        """Anota un cambio hecho por esta conexión; fuera de una transacción ya está confirmado."""
+        self._version += 1
+        if nombres:
+            self._version_nombres += 1
+        self._volcar_movimientos()
+
+    def _version_datos(self) -> int:
+        """Cambia cada vez que otra conexión (de este u otro proceso) confirma cambios."""
+        return self._conexion.execute("PRAGMA data_version").fetchone()[0]
+
+    def _registrar_movimiento(self, id_producto: int, delta: int):
+        if self._movimientos is not None and delta:
+            self._movimientos.registrar(id_producto, delta)
+
+    def _ejecutar(self, sql: str, parametros: tuple = ()) -> sqlite3.Cursor:
+        try:
+            return self._conexion.execute(sql, parametros)
+        except sqlite3.OperationalError as e:
+            if "readonly" in str(e):
+                raise PermissionError(f"Permiso denegado para escribir en '{self._ruta_archivo}'")
+            raise Exception(f"Fallo inesperado en la base de datos: {e}")
+
+    @staticmethod
+    def _a_producto(fila: tuple) -> Producto:
+        return Producto(fila[0], fila[1], fila[2], fila[3])
+
+    @staticmethod
+    def _fila_de(producto: Producto) -> tuple:
+        return producto.id, producto.nombre, producto.nombre.lower(), producto.cantidad, producto.precio
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Agrupa varios cambios en una sola transacción de SQLite.
+
+        Si ocurre una excepción dentro del bloque se hace ROLLBACK y la excepción se propaga.
+        Una transacción anidada se integra a la externa.
+        """
+        if self._profundidad_transaccion:
+            self._profundidad_transaccion += 1
+            try:
+                yield self
+            finally:
+                self._profundidad_transaccion -= 1
+            return
+
+        self._conexion.execute("BEGIN IMMEDIATE")
+        self._profundidad_transaccion = 1
+        marca = self._movimientos.marca() if self._movimientos is not None else 0
+        try:
+            yield self
+        except BaseException:
+            self._profundidad_transaccion = 0
+            self._conexion.execute("ROLLBACK")
+            # Lo que se guardó en la caché o el índice durante el bloque ya no vale
+            self._version += 1
+            self._version_nombres += 1
+            if self._movimientos is not None:
+                self._movimientos.deshacer_hasta(marca)
+            raise
+        self._profundidad_transaccion = 0
+        self._conexion.execute("COMMIT")
+        self._volcar_movimientos()
+
+    def agregar_producto(self, producto: Producto) -> bool:
+        if self._ejecutar(self._SQL_INSERTAR, self._fila_de(producto)).rowcount != 1:
+            return False
+        self._cambio(nombres=True)
+        return True
+
+    def eliminar_producto(self, id_producto: int) -> bool:
+        if self._ejecutar(self._SQL_ELIMINAR, (id_producto,)).rowcount != 1:
+            return False
+        self._cambio(nombres=True)
+        return True
+
+    def actualizar_cantidad(self, id_producto: int, nueva_cantidad: int) -> bool:
+        if nueva_cantidad < 0:
+            raise ValueError("La cantidad no puede ser negativa")
+        if self._movimientos is None:
+            if self._ejecutar(self._SQL_CANTIDAD, (nueva_cantidad, id_producto)).rowcount != 1:
+                return False
+            self._cambio()
+            return True
+        # Para registrar la variación hace falta la cantidad anterior, leída en la misma transacción
+        with self.transaccion():
+            fila = self._ejecutar(self._SQL_LEER_CANTIDAD, (id_producto,)).fetchone()
+            if fila is None:
+                return False
+            self._ejecutar(self._SQL_CANTIDAD, (nueva_cantidad, id_producto))
+            self._registrar_movimiento(id_producto, nueva_cantidad - fila[0])
+            self._cambio()
+        return True
+
+    def actualizar_precio(self, id_producto: int, nuevo_precio: float) -> bool:
+        if nuevo_precio < 0:
+            raise ValueError("El precio no puede ser negativo")
+        if self._ejecutar(self._SQL_PRECIO, (round(nuevo_precio, 2), id_producto)).rowcount != 1:
+            return False
+        self._cambio()
+        return True
+
+    def actualizar_nombre(self, id_producto: int, nuevo_nombre: str) -> bool:
+        if not nuevo_nombre or not nuevo_nombre.strip():
+            raise ValueError("El nombre no puede estar vacío")
+        nombre = nuevo_nombre.strip()
+        if self._ejecutar(self._SQL_NOMBRE, (nombre, nombre.lower(), id_producto)).rowcount != 1:
+            return False
+        self._cambio(nombres=True)
+        return True
+
+    def incrementar_cantidad(self, id_producto: int, delta: int) -> bool:
+        """
+        Suma delta (positivo o negativo) a la cantidad actual del producto, de forma atómica
+        también frente a otros procesos.
+
+        Raises:
+            ValueError: Si la cantidad resultante sería negativa
+        """
+        with self.transaccion():
+            fila = self._ejecutar(self._SQL_LEER_CANTIDAD, (id_producto,)).fetchone()
+            if fila is None:
+                return False
+            if fila[0] + delta < 0:
+                raise ValueError("La cantidad no puede ser negativa")
+            self._ejecutar(self._SQL_CANTIDAD, (fila[0] + delta, id_producto))
+            self._registrar_movimiento(id_producto, delta)
+            self._cambio()
+        return True
+
+    def decrementar_si_hay(self, id_producto: int, cantidad: int) -> bool:
+        """
+        Descuenta cantidad unidades solo si hay existencias suficientes, con una sola sentencia.
+
+        Returns:
+            True si se descontó; False si el producto no existe o no alcanza el stock
+
+        Raises:
+            ValueError: Si la cantidad a descontar no es positiva
+        """
+        if cantidad <= 0:
+            raise ValueError("La cantidad a descontar debe ser positiva")
+        if self._ejecutar(self._SQL_DESCONTAR, (cantidad, id_producto, cantidad)).rowcount != 1:
+            return False
+        self._registrar_movimiento(id_producto, -cantidad)
+        self._cambio()
+        return True
+
+    def agregar_lote(self, productos: Iterable[Producto]) -> int:
+        """
+        Agrega varios productos en una sola transacción.
+
+        Raises:
+            ValueError: Si algún ID ya existe o se repite en el lote (no se agrega ninguno)
+        """
+        total = 0
+        with self.transaccion():
+            for producto in productos:
+                if not self.agregar_producto(producto):
+                    raise ValueError(f"Ya existe un producto con ID {producto.id}")
+                total += 1
+        return total
+
+    def actualizar_lote(self, cambios: Iterable[Tuple[int, int]]) -> int:
+        """
+        Actualiza la cantidad de varios productos en una sola transacción.
+
+        Raises:
+            ValueError: Si algún ID no existe o alguna cantidad es inválida (no se aplica ninguna)
+        """
+        total = 0
+        with self.transaccion():
+            for id_producto, nueva_cantidad in cambios:
+                if not self.actualizar_cantidad(id_producto, nueva_cantidad):
+                    raise ValueError(f"No existe producto con ID {id_producto}")
+                total += 1
+        return total
+
+    def buscar_por_id(self, id_producto: int) -> Optional[Producto]:
+        fila = self._ejecutar(self._SQL_POR_ID, (id_producto,)).fetchone()
+        return None if fila is None else self._a_producto(fila)
+
+    def buscar_por_nombre(self, nombre_busqueda: str) -> List[Producto]:
+        """
+        Búsqueda por subcadena sobre la columna normalizada, ordenada por ID.
+
+        Las filas de las últimas TAMANO_CACHE_BUSQUEDAS consultas distintas se recuerdan hasta
+        el próximo cambio de esta u otra conexión (ver estadisticas_cache).
+        """
+        nombre_normalizado = nombre_busqueda.strip().lower()
+        version = (self._version_datos(), self._version)
+        filas = self._cache_busquedas.obtener(nombre_normalizado, version)
+        if filas is None:
+            filas = tuple(self._ejecutar(self._SQL_POR_NOMBRE, (nombre_normalizado,)))
+            if len(filas) <= self.MAXIMO_RESULTADOS_CACHE:
+                self._cache_busquedas.guardar(nombre_normalizado, version, filas)
+        # Se guardan las filas y no los productos, que quien los recibe podría modificar
+        return [self._a_producto(fila) for fila in filas]
+
+    def estadisticas_cache(self) -> dict:
+        """Aciertos, fallos, tasa de aciertos e invalidaciones de la caché de buscar_por_nombre."""
+        return self._cache_busquedas.estadisticas()
+
+    def buscar_aproximado(self, texto: str, limite: int = 10) -> List[Producto]:
+        """
+        Búsqueda tolerante a errores de escritura, como Inventario.buscar_aproximado.
+
+        El índice de palabras se construye en memoria en la primera llamada (recorriendo los
+        nombres) y se reconstruye en la siguiente búsqueda si cambiaron los nombres.
+        """
+        version = (self._version_datos(), self._version_nombres)
+        if self._indice_difuso is None or self._version_difuso != version:
+            self._indice_difuso = IndiceDifuso()
+            for id_producto, nombre in self._ejecutar(self._SQL_NOMBRES):
+                self._indice_difuso.agregar(id_producto, nombre)
+            self._version_difuso = version
+        resultado = []
+        for id_producto, _ in self._indice_difuso.buscar(texto, limite):
+            producto = self.buscar_por_id(id_producto)
+            if producto is not None:
+                resultado.append(producto)
+        return resultado
+
+    def reporte_reposicion(self, dias_cobertura: float = 7.0) -> List[Tuple[Producto, float, float]]:
+        """
+        Productos cuyo stock no alcanza para dias_cobertura días, como Inventario.reporte_reposicion.
+
+        Raises:
+            ValueError: Si el inventario no registra movimientos
+        """
+        if self._movimientos is None:
+            raise ValueError("El inventario no registra movimientos (use registrar_movimientos=True)")
+        return calcular_reposicion(self._movimientos, self.buscar_por_id, dias_cobertura)
+
+    def obtener_todos(self) -> List[Producto]:
+        return [self._a_producto(fila) for fila in self._ejecutar(self._SQL_TODOS)]
+
+    def rango_ids(self, desde: int, hasta: int) -> List[Producto]:
+        return [self._a_producto(fila) for fila in self._ejecutar(self._SQL_RANGO, (desde, hasta))]
+
+    def pagina(self, numero: int, tamaño: int) -> List[Producto]:
+        if numero < 1 or tamaño < 1:
+            raise ValueError("El número y el tamaño de página deben ser positivos")
+        filas = self._ejecutar(self._SQL_PAGINA, (tamaño, (numero - 1) * tamaño))
+        return [self._a_producto(fila) for fila in filas]
+
+    def recorrer(self, tamaño_bloque: int = 10000) -> Iterator[Producto]:
+        """
+        Recorre todos los productos ordenados por ID de a tamaño_bloque. Cada bloque continúa
+        desde el último ID leído (no con OFFSET, que obliga a SQLite a saltar de nuevo todas
+        las filas anteriores), así que el recorrido completo es lineal.
+        """
+        ultimo = 0
+        while True:
+            bloque = [self._a_producto(fila) for fila in self._ejecutar(self._SQL_SIGUIENTES, (ultimo, tamaño_bloque))]
+            yield from bloque
+            if len(bloque) < tamaño_bloque:
+                return
+            ultimo = bloque[-1].id
+
+    def total_paginas(self, tamaño: int) -> int:
+        if tamaño < 1:
+            raise ValueError("El tamaño de página debe ser positivo")
+        return (self.obtener_tamaño() + tamaño - 1) // tamaño
+
+    def esta_vacio(self) -> bool:
+        return not self._ejecutar(self._SQL_HAY_ALGUNO).fetchone()[0]
+
+    def obtener_tamaño(self) -> int:
+        return self._ejecutar(self._SQL_TAMANO).fetchone()[0]
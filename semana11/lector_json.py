@@ -0,0 +1,87 @@
+import codecs
+import json
+import re
+from typing import BinaryIO, Callable, Iterator, Optional
+
+_DECODIFICADOR = json.JSONDecoder()
+_ESPACIOS = re.compile(r'[ \t\n\r]*')
+
+
+def iterar_arreglo_json(archivo: BinaryIO, tamano_bloque: int = 1 << 20,
+                        al_leer: Optional[Callable[[bytes], None]] = None) -> Iterator[object]:
+    """
+    Recorre un archivo cuyo contenido es un arreglo JSON devolviendo sus elementos uno a uno.
+
+    El archivo se lee por bloques y solo se mantiene en memoria el texto pendiente de
+    analizar, de modo que el consumo no depende del tamaño del archivo sino del de cada
+    elemento. Acepta el formato con sangría que escribe Inventario.guardar_en_archivo.
+
+    Args:
+        archivo: Archivo abierto en modo binario
+        tamano_bloque: Bytes leídos en cada lectura
+        al_leer: Función opcional que recibe cada bloque leído (para sumas de verificación
+            o para informar el progreso)
+
+    Raises:
+        json.JSONDecodeError: Si el contenido no es un arreglo JSON válido
+    """
+    decodificador = codecs.getincrementaldecoder('utf-8')()
+    texto = ''
+    pos = 0
+    fin_archivo = False
+
+    def leer_mas() -> bool:
+        nonlocal texto, pos, fin_archivo
+        if fin_archivo:
+            return False
+        bloque = archivo.read(tamano_bloque)
+        if al_leer is not None and bloque:
+            al_leer(bloque)
+        fin_archivo = not bloque
+        # Se descarta lo ya analizado para que el texto pendiente no crezca
+        texto = texto[pos:] + decodificador.decode(bloque, final=fin_archivo)
+        pos = 0
+        return True
+
+    def saltar_espacios() -> str:
+        """Avanza sobre los espacios y devuelve el siguiente carácter ('' al final del archivo)."""
+        nonlocal pos
+        while True:
+            pos = _ESPACIOS.match(texto, pos).end()
+            if pos < len(texto):
+                return texto[pos]
+            if not leer_mas():
+                return ''
+
+    if saltar_espacios() != '[':
+        raise json.JSONDecodeError("Se esperaba '[' al inicio del arreglo", texto, pos)
+    pos += 1
+
+    primero = True
+    while True:
+        caracter = saltar_espacios()
+        if caracter == ']':
+            pos += 1
+            break
+        if not primero:
+            if caracter != ',':
+                raise json.JSONDecodeError("Se esperaba ',' o ']' entre elementos", texto, pos)
+            pos += 1
+            saltar_espacios()
+        primero = False
+
+        while True:
+            try:
+                elemento, fin = _DECODIFICADOR.raw_decode(texto, pos)
+                # Un valor que llega justo al final del texto podría estar cortado (p. ej. un número)
+                if fin < len(texto) or fin_archivo:
+                    break
+            except json.JSONDecodeError:
+                if fin_archivo:
+                    raise
+            leer_mas()
+        pos = fin
+        yield elemento
+
+    if saltar_espacios() != '':
+        raise json.JSONDecodeError("Contenido adicional después del arreglo", texto, pos)
@@ -0,0 +1,112 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable, Iterator, List
+
+
+class ListaOrdenada:
+    """
+    Lista ordenada dividida en bloques, al estilo de las hojas de un árbol B.
+
+    Admite cualquier valor comparable: enteros (IDs) o tuplas como (precio, id).
+
+    Insertar o eliminar solo desplaza los elementos de un bloque, por lo que el costo es
+    O(log n + tamaño del bloque) en lugar de O(n) como con insort sobre una única lista.
+    El recorrido en orden es O(n) y no requiere volver a ordenar.
+    """
+
+    TAMANO_BLOQUE = 1000
+
+    def __init__(self, valores: Iterable[int] = ()):
+        """Construye la lista a partir de valores en cualquier orden (se ordenan una sola vez)."""
+        ordenados = sorted(valores)
+        tamano = self.TAMANO_BLOQUE
+        self._bloques: List[List[int]] = [ordenados[i:i + tamano] for i in range(0, len(ordenados), tamano)]
+        # Último valor de cada bloque, para localizar el bloque de un valor con bisect
+        self._maximos: List[int] = [bloque[-1] for bloque in self._bloques]
+        self._longitud = len(ordenados)
+
+    def _bloque_de(self, valor: int) -> int:
+        return bisect_left(self._maximos, valor)
+
+    def agregar(self, valor: int):
+        """Inserta un valor manteniendo el orden."""
+        if not self._bloques:
+            self._bloques.append([valor])
+            self._maximos.append(valor)
+            self._longitud = 1
+            return
+
+        i = self._bloque_de(valor)
+        if i == len(self._bloques):
+            i -= 1
+        bloque = self._bloques[i]
+        insort(bloque, valor)
+        self._maximos[i] = bloque[-1]
+        self._longitud += 1
+
+        # Un bloque demasiado grande se divide en dos mitades
+        if len(bloque) > 2 * self.TAMANO_BLOQUE:
+            mitad = len(bloque) // 2
+            self._bloques[i:i + 1] = [bloque[:mitad], bloque[mitad:]]
+            self._maximos[i:i + 1] = [bloque[mitad - 1], bloque[-1]]
+
+    def eliminar(self, valor: int) -> bool:
+        """Quita un valor. Devuelve False si no estaba en la lista."""
+        i = self._bloque_de(valor)
+        if i == len(self._bloques):
+            return False
+        bloque = self._bloques[i]
+        j = bisect_left(bloque, valor)
+        if j == len(bloque) or bloque[j] != valor:
+            return False
+
+        del bloque[j]
+        self._longitud -= 1
+        if bloque:
+            self._maximos[i] = bloque[-1]
+        else:
+            del self._bloques[i]
+            del self._maximos[i]
+        return True
+
+    def rango(self, desde: int, hasta: int) -> Iterator[int]:
+        """Recorre en orden los valores comprendidos entre desde y hasta (ambos incluidos)."""
+        primero = self._bloque_de(desde)
+        for i in range(primero, len(self._bloques)):
+            bloque = self._bloques[i]
+            inicio = bisect_left(bloque, desde) if i == primero else 0
+            fin = bisect_right(bloque, hasta)
+            yield from bloque[inicio:fin]
+            if fin < len(bloque):
+                return
+
+    def porcion(self, inicio: int, cantidad: int) -> List[int]:
+        """Devuelve hasta 'cantidad' valores a partir de la posición 'inicio' (base 0)."""
+        resultado: List[int] = []
+        for bloque in self._bloques:
+            if inicio >= len(bloque):
+                inicio -= len(bloque)
+                continue
+            resultado.extend(bloque[inicio:inicio + cantidad - len(resultado)])
+            inicio = 0
+            if len(resultado) >= cantidad:
+                break
+        return resultado
+
+    def __iter__(self) -> Iterator[int]:
+        for bloque in self._bloques:
+            yield from bloque
+
+    def __reversed__(self) -> Iterator[int]:
+        for bloque in reversed(self._bloques):
+            yield from reversed(bloque)
+
+    def __contains__(self, valor: int) -> bool:
+        i = self._bloque_de(valor)
+        if i == len(self._bloques):
+            return False
+        bloque = self._bloques[i]
+        j = bisect_left(bloque, valor)
+        return j < len(bloque) and bloque[j] == valor
+
+    def __len__(self) -> int:
+        return self._longitud
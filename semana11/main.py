@@ -5,9 +5,22 @@ Menú interactivo con manejo de errores, validación y persistencia.
 """
 
 from inventario import Inventario
+from inventario_fragmentado import InventarioFragmentado, fusionar_fragmentos
+from inventario_sqlite import InventarioSQLite
 from producto import Producto
+from csv_inventario import exportar_csv, importar_csv
+from comandos_inventario import AYUDA, ejecutar_script
+from metricas import Metricas
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List
+import argparse
+import math
 import sys
 
+# Productos por página al listar en pantalla
+TAMANO_PAGINA = 20
+SEPARADOR_TABLA = "=" * 70
+
 def leer_entero(mensaje: str, positivo: bool = True) -> int:
     while True:
         try:
@@ -38,18 +51,103 @@ def leer_texto(mensaje: str, min_longitud: int = 1) -> str:
             continue
         return texto
 
-def mostrar_lista_productos(productos: list):
+def mostrar_progreso_carga(leidos: int, total: int):
+    """Muestra el avance de la carga solo para archivos grandes (más de 50 MB)."""
+    if total < 50 * 1024 * 1024:
+        return
+    final = '\n' if leidos >= total else ''
+    print(f"\r--- Sistema: Cargando inventario... {leidos * 100 // total}% ---", end=final, flush=True)
+
+def estado_guardado(inventario: Inventario) -> str:
+    """Con escritura diferida, un cambio confirmado en el menú todavía no está en el archivo."""
+    return "guardado pendiente" if inventario.escritura_diferida else "guardado en archivo"
+
+def informar_error_guardado(inventario: Inventario):
+    """Avisa por separado si falló un guardado en segundo plano, sin atribuirlo a la operación siguiente."""
+    error = inventario.tomar_error_escritura()
+    if error is not None:
+        print(f"\n[ADVERTENCIA] Falló el guardado en segundo plano (los cambios siguen en memoria "
+              f"y se reintentarán): {error}")
+
+def formatear_filas(productos: Iterable[Producto]) -> Iterator[str]:
+    for producto in productos:
+        yield f"{producto.id:<6} | {producto.nombre:<22} | {producto.cantidad:<10} | ${producto.precio:<11.2f}\n"
+
+def escribir_tabla(destino, productos: Iterable[Producto], filas_por_escritura: int = 1000) -> int:
+    """
+    Escribe la tabla de productos con una escritura por cada bloque de filas, en lugar de un
+    print por producto. Los productos se consumen a medida que se escriben, así que un
+    generador (p. ej. inventario.recorrer()) se escribe completo con memoria constante.
+
+    Returns:
+        Número de productos escritos
+    """
+    destino.write(f"{SEPARADOR_TABLA}\n{'ID':<6} | {'NOMBRE':<22} | {'CANTIDAD':<10} | {'PRECIO':<12}\n{SEPARADOR_TABLA}\n")
+    filas = formatear_filas(productos)
+    total = 0
+    while True:
+        bloque = list(islice(filas, filas_por_escritura))
+        if not bloque:
+            break
+        destino.write(''.join(bloque))
+        total += len(bloque)
+    destino.write(SEPARADOR_TABLA + "\n")
+    return total
+
+def exportar_listado(productos: Iterable[Producto]):
+    ruta = leer_texto("Ruta del archivo de destino: ")
+    try:
+        # Buffer de 1 MB: el archivo se escribe en pocas llamadas aunque tenga millones de filas
+        with open(ruta, 'w', encoding='utf-8', buffering=1 << 20) as archivo:
+            total = escribir_tabla(archivo, productos)
+            archivo.write(f"Total: {total} producto(s)\n")
+        print(f"\n[ÉXITO] {total} producto(s) exportado(s) a '{ruta}'")
+    except PermissionError:
+        print(f"\n[ERROR] Permiso denegado para escribir en '{ruta}'")
+    except Exception as e:
+        print(f"\n[ERROR CRÍTICO] Ocurrió un problema durante la exportación: {e}")
+
+def navegar_paginas(obtener_pagina: Callable[[int], List[Producto]], paginas: int, total: int,
+                    recorrer_todos: Callable[[], Iterable[Producto]]):
+    """
+    Muestra un listado de 'paginas' páginas de a TAMANO_PAGINA productos, pidiendo a
+    obtener_pagina(numero) solo la página visible, con navegación entre páginas y
+    exportación del listado completo.
+    """
+    numero = 1
+    while True:
+        productos = obtener_pagina(numero)
+        sys.stdout.write("\n")
+        escribir_tabla(sys.stdout, productos)
+        if paginas <= 1:
+            print(f"Total: {total} producto(s)")
+            return
+        primero = (numero - 1) * TAMANO_PAGINA + 1
+        print(f"Página {numero} de {paginas} (productos {primero}-{primero + len(productos) - 1} de {total})")
+        opcion = input("ENTER = siguiente, a = anterior, número = ir a página, e = exportar todo, v = volver: ")
+        opcion = opcion.strip().lower()
+        if opcion == '':
+            if numero == paginas:
+                return
+            numero += 1
+        elif opcion == 'a':
+            numero = max(1, numero - 1)
+        elif opcion.isdigit() and 1 <= int(opcion) <= paginas:
+            numero = int(opcion)
+        elif opcion == 'e':
+            exportar_listado(recorrer_todos())
+        elif opcion == 'v':
+            return
+        else:
+            print(f"Error: Opción no válida (las páginas van de 1 a {paginas})")
+
+def mostrar_lista_productos(productos: List[Producto]):
     if not productos:
         print("\nAdvertencia: No se encontraron productos")
         return
 
-    print("\n" + "=" * 70)
-    print(f"{'ID':<6} | {'NOMBRE':<22} | {'CANTIDAD':<10} | {'PRECIO':<12}")
-    print("=" * 70)
-    for producto in productos:
-        print(f"{producto.id:<6} | {producto.nombre:<22} | {producto.cantidad:<10} | ${producto.precio:<11.2f}")
-    print("=" * 70)
-    print(f"Total: {len(productos)} producto(s)")
+    navegar_paginas(lambda numero: productos[(numero - 1) * TAMANO_PAGINA:numero * TAMANO_PAGINA],
+                    math.ceil(len(productos) / TAMANO_PAGINA), len(productos), lambda: productos)
 
 def menu_agregar(inventario: Inventario):
     print("\n--- AGREGAR NUEVO PRODUCTO ---")
@@ -67,7 +165,7 @@ def menu_agregar(inventario: Inventario):
 
     try:
         if inventario.agregar_producto(producto):
-            print(f"\n[ÉXITO] Producto '{nombre}' agregado y guardado en archivo correctamente.")
+            print(f"\n[ÉXITO] Producto '{nombre}' agregado ({estado_guardado(inventario)}).")
         else:
             print("\n[ERROR] No se pudo agregar el producto.")
     except PermissionError as e:
@@ -85,7 +183,7 @@ def menu_eliminar(inventario: Inventario):
 
     try:
         if inventario.eliminar_producto(id_prod):
-            print(f"\n[ÉXITO] Producto con ID {id_prod} eliminado y cambios guardados en archivo.")
+            print(f"\n[ÉXITO] Producto con ID {id_prod} eliminado ({estado_guardado(inventario)}).")
         else:
             print(f"\n[ERROR] No se encontró producto con ID {id_prod}")
     except PermissionError as e:
@@ -114,11 +212,11 @@ def menu_actualizar(inventario: Inventario):
         if opcion == '1':
             nueva_cantidad = leer_entero("Nueva cantidad: ", positivo=False)
             if inventario.actualizar_cantidad(id_prod, nueva_cantidad):
-                print(f"\n[ÉXITO] Cantidad actualizada y guardada: {producto.nombre} -> {nueva_cantidad} unidades")
+                print(f"\n[ÉXITO] Cantidad actualizada ({estado_guardado(inventario)}): {producto.nombre} -> {nueva_cantidad} unidades")
         elif opcion == '2':
             nuevo_precio = leer_float("Nuevo precio: $")
             if inventario.actualizar_precio(id_prod, nuevo_precio):
-                print(f"\n[ÉXITO] Precio actualizado y guardado: {producto.nombre} -> ${nuevo_precio:.2f}")
+                print(f"\n[ÉXITO] Precio actualizado ({estado_guardado(inventario)}): {producto.nombre} -> ${nuevo_precio:.2f}")
         else:
             print("\nError: Opción no válida")
     except PermissionError as e:
@@ -134,6 +232,11 @@ def menu_buscar(inventario: Inventario):
     print("\n--- BUSCAR PRODUCTO POR NOMBRE ---")
     nombre_busqueda = leer_texto("Ingrese nombre o parte del nombre: ")
     resultados = inventario.buscar_por_nombre(nombre_busqueda)
+    if not resultados:
+        # Sin coincidencias exactas: se ofrecen los nombres parecidos (errores de escritura)
+        resultados = inventario.buscar_aproximado(nombre_busqueda)
+        if resultados:
+            print(f"\nNo hay productos con '{nombre_busqueda}'. ¿Quiso decir...?")
     mostrar_lista_productos(resultados)
 
 def menu_mostrar_todos(inventario: Inventario):
@@ -142,8 +245,105 @@ def menu_mostrar_todos(inventario: Inventario):
         return
 
     print("\n--- INVENTARIO COMPLETO ---")
-    productos = inventario.obtener_todos()
-    mostrar_lista_productos(productos)
+    # Solo se obtiene la página visible; exportar recorre el inventario de a bloques
+    navegar_paginas(lambda numero: inventario.pagina(numero, TAMANO_PAGINA), inventario.total_paginas(TAMANO_PAGINA),
+                    inventario.obtener_tamaño(), inventario.recorrer)
+
+def mostrar_resultado_importacion(resultado, estado: str, limite: int = 20):
+    print(f"\n[ÉXITO] {resultado.agregados} producto(s) importado(s) ({estado}).")
+    if resultado.rechazados:
+        print(f"[ADVERTENCIA] {len(resultado.rechazados)} línea(s) rechazada(s):")
+        for numero, motivo in resultado.rechazados[:limite]:
+            print(f"  Línea {numero}: {motivo}")
+        if len(resultado.rechazados) > limite:
+            print(f"  ... y {len(resultado.rechazados) - limite} más")
+
+def mostrar_resultado_script(resultado, estado: str, limite: int = 20):
+    print(f"\n[ÉXITO] {resultado.ejecutados} comando(s) ejecutado(s) ({estado}).")
+    if resultado.errores:
+        print(f"[ADVERTENCIA] {len(resultado.errores)} línea(s) con error:")
+        for numero, motivo in resultado.errores[:limite]:
+            print(f"  Línea {numero}: {motivo}")
+        if len(resultado.errores) > limite:
+            print(f"  ... y {len(resultado.errores) - limite} más")
+
+def menu_importar_csv(inventario: Inventario):
+    print("\n--- IMPORTAR PRODUCTOS DESDE CSV ---")
+    print("Formato esperado por línea: id,nombre,cantidad,precio")
+    ruta = leer_texto("Ruta del archivo CSV: ")
+    try:
+        mostrar_resultado_importacion(importar_csv(inventario, ruta), estado_guardado(inventario))
+    except FileNotFoundError:
+        print(f"\n[ERROR] No se encontró el archivo '{ruta}'")
+    except PermissionError as e:
+        print(f"\n[ADVERTENCIA] Importado en memoria, pero falló el guardado: {e}")
+    except Exception as e:
+        print(f"\n[ERROR CRÍTICO] Ocurrió un problema durante la importación: {e}")
+
+def menu_exportar_csv(inventario: Inventario):
+    print("\n--- EXPORTAR INVENTARIO A CSV ---")
+    ruta = leer_texto("Ruta del archivo CSV de destino: ")
+    try:
+        total = exportar_csv(inventario, ruta)
+        print(f"\n[ÉXITO] {total} producto(s) exportado(s) a '{ruta}'")
+    except PermissionError:
+        print(f"\n[ERROR] Permiso denegado para escribir en '{ruta}'")
+    except Exception as e:
+        print(f"\n[ERROR CRÍTICO] Ocurrió un problema durante la exportación: {e}")
+
+def menu_estadisticas(inventario: Inventario):
+    cache = inventario.estadisticas_cache()
+    print(f"\nCaché de búsquedas por nombre: {cache['aciertos']} acierto(s), {cache['fallos']} fallo(s) "
+          f"({cache['tasa_aciertos']:.0%}), {cache['invalidaciones']} invalidación(es), "
+          f"{cache['entradas']}/{cache['capacidad']} consultas guardadas")
+
+    metricas = inventario.metricas
+    if metricas is None:
+        print("\n[INFO] La medición de rendimiento está desactivada. Inicie el programa con --metricas.")
+        return
+
+    print("\n--- ESTADÍSTICAS DE RENDIMIENTO (ms) ---")
+    resumen = metricas.resumen()
+    if not resumen:
+        print("Aún no se registraron operaciones")
+        return
+    print("=" * 104)
+    print(f"{'OPERACIÓN':<22} | {'LLAMADAS':>8} | {'TOTAL':>10} | {'MEDIA':>9} | {'P50':>9} | "
+          f"{'P90':>9} | {'P99':>9} | {'MÁX':>9}")
+    print("=" * 104)
+    for operacion in metricas.operaciones():
+        datos = resumen[operacion]
+        print(f"{operacion:<22} | {datos['conteo']:>8} | {datos['total_ms']:>10.2f} | {datos['media_ms']:>9.3f} | "
+              f"{datos['p50_ms']:>9.3f} | {datos['p90_ms']:>9.3f} | {datos['p99_ms']:>9.3f} | {datos['max_ms']:>9.3f}")
+    print("=" * 104)
+
+    ruta = input("Ruta para guardar el detalle en JSON (ENTER para omitir): ").strip()
+    if ruta:
+        try:
+            metricas.guardar_json(ruta)
+            print(f"\n[ÉXITO] Métricas guardadas en '{ruta}'")
+        except Exception as e:
+            print(f"\n[ERROR] {e}")
+
+def menu_reposicion(inventario: Inventario):
+    if inventario.movimientos is None:
+        print("\n[INFO] El registro de movimientos está desactivado. Inicie el programa con --movimientos.")
+        return
+
+    print("\n--- REPORTE DE REPOSICIÓN ---")
+    dias = leer_float("Días de stock que deben quedar como mínimo: ")
+    reporte = inventario.reporte_reposicion(dias)
+    if not reporte:
+        print(f"\nNingún producto se agota en menos de {dias:g} días al ritmo de salida de los "
+              f"últimos {inventario.movimientos.dias_ventana} días")
+        return
+    print("\n" + "=" * 70)
+    print(f"{'ID':<6} | {'NOMBRE':<22} | {'CANTIDAD':<10} | {'SALIDA/DÍA':>10} | {'DÍAS':>8}")
+    print("=" * 70)
+    for producto, consumo, restantes in reporte:
+        print(f"{producto.id:<6} | {producto.nombre:<22} | {producto.cantidad:<10} | {consumo:>10.2f} | {restantes:>8.1f}")
+    print("=" * 70)
+    print(f"Total: {len(reporte)} producto(s) por reponer")
 
 def mostrar_menu():
     print("\n" + "=" * 50)
@@ -155,11 +355,124 @@ def mostrar_menu():
     print("4. Buscar producto por nombre")
     print("5. Mostrar todos los productos")
     print("6. Salir")
+    print("7. Importar productos desde CSV")
+    print("8. Exportar inventario a CSV")
+    print("9. Ver estadísticas de rendimiento")
+    print("10. Reporte de reposición")
     print("=" * 50)
 
+def leer_argumentos() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sistema de Gestion de Inventarios", epilog=AYUDA,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--archivo', default=None,
+                        help="Archivo del inventario (por defecto inventario.json, o inventario.db con --sqlite)")
+    parser.add_argument('--importar', metavar='CSV', help="Importa productos desde un CSV y termina")
+    parser.add_argument('--exportar', metavar='CSV', help="Exporta el inventario a un CSV y termina")
+    parser.add_argument('--script', metavar='RUTA',
+                        help="Ejecuta los comandos de RUTA ('-' = entrada estándar) sin menú, guarda una vez y termina")
+    parser.add_argument('--estricto', action='store_true',
+                        help="Con --script, se detiene en el primer error y descarta todos los cambios del script")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos para validar el CSV o cargar los fragmentos en paralelo")
+    parser.add_argument('--escritura-diferida', type=float, default=0, metavar='SEGUNDOS',
+                        help="Agrupa los guardados en segundo plano tras SEGUNDOS sin cambios; los cambios "
+                             "quedan con guardado pendiente hasta entonces (0, por defecto = guardar cada cambio)")
+    parser.add_argument('--fragmentos', type=int, default=0, metavar='N',
+                        help="Reparte el inventario en N archivos que se cargan en paralelo (0 = un solo archivo con diario)")
+    parser.add_argument('--sqlite', action='store_true',
+                        help="Guarda el inventario en una base SQLite en lugar de un archivo JSON")
+    parser.add_argument('--movimientos', action='store_true',
+                        help="Registra cada cambio de cantidad con su fecha para el reporte de reposición (opción 10)")
+    parser.add_argument('--metricas', action='store_true',
+                        help="Registra el conteo y la latencia de cada operación (opción 9 del menú)")
+    parser.add_argument('--metricas-json', metavar='RUTA',
+                        help="Al salir, guarda las métricas en RUTA como JSON (implica --metricas)")
+    argumentos = parser.parse_args()
+    if argumentos.sqlite and argumentos.fragmentos > 0:
+        parser.error("--sqlite y --fragmentos no pueden usarse juntos")
+    if argumentos.archivo is None:
+        argumentos.archivo = "inventario.db" if argumentos.sqlite else "inventario.json"
+    return argumentos
+
+def ejecutar_comandos(inventario: Inventario, argumentos: argparse.Namespace) -> int:
+    """Modo no interactivo: ejecuta --importar/--script/--exportar y devuelve el código de salida."""
+    codigo = 0
+    try:
+        if argumentos.importar:
+            resultado = importar_csv(inventario, argumentos.importar, procesos=argumentos.procesos)
+            mostrar_resultado_importacion(resultado, estado_guardado(inventario))
+        if argumentos.script:
+            if argumentos.script == '-':
+                resultado = ejecutar_script(inventario, sys.stdin, sys.stdout, argumentos.estricto)
+            else:
+                with open(argumentos.script, 'r', encoding='utf-8') as script:
+                    resultado = ejecutar_script(inventario, script, sys.stdout, argumentos.estricto)
+            mostrar_resultado_script(resultado, estado_guardado(inventario))
+            if resultado.errores:
+                codigo = 1
+        if argumentos.exportar:
+            total = exportar_csv(inventario, argumentos.exportar)
+            print(f"[ÉXITO] {total} producto(s) exportado(s) a '{argumentos.exportar}'")
+    except Exception as e:
+        print(f"[ERROR] {e}")
+        return 1
+    return codigo
+
+def guardar_metricas(inventario: Inventario, argumentos: argparse.Namespace):
+    """Con --metricas-json, vuelca las métricas acumuladas antes de terminar."""
+    if argumentos.metricas_json and inventario.metricas is not None:
+        try:
+            inventario.metricas.guardar_json(argumentos.metricas_json)
+        except Exception as e:
+            print(f"[ADVERTENCIA] {e}")
+
+def salir(inventario: Inventario, argumentos: argparse.Namespace):
+    """Compacta el diario, escribe lo que la escritura diferida aún no guardó y termina."""
+    try:
+        inventario.compactar()
+    except Exception as e:
+        print(f"[ADVERTENCIA] No se pudo compactar el diario: {e}")
+    try:
+        # Escribe lo que la escritura diferida aún no guardó y detiene su hilo
+        inventario.cerrar()
+    except Exception as e:
+        print(f"[ERROR CRÍTICO] No se pudieron guardar los últimos cambios: {e}")
+        sys.exit(1)
+    guardar_metricas(inventario, argumentos)
+    sys.exit(0)
+
 def main():
-    # Al inicializar, Inventario intentará cargar "inventario.json"
-    inventario = Inventario()
+    argumentos = leer_argumentos()
+    # Con --metricas se mide también la carga inicial
+    metricas = Metricas() if argumentos.metricas or argumentos.metricas_json else None
+    # Al inicializar, Inventario intentará cargar el archivo JSON y su diario de cambios
+    if argumentos.sqlite:
+        inventario = InventarioSQLite(argumentos.archivo, metricas=metricas,
+                                      registrar_movimientos=argumentos.movimientos)
+    elif argumentos.fragmentos > 0:
+        inventario = InventarioFragmentado(argumentos.archivo, fragmentos=argumentos.fragmentos,
+                                           procesos=argumentos.procesos, progreso=mostrar_progreso_carga,
+                                           escritura_diferida=argumentos.escritura_diferida or None,
+                                           metricas=metricas, registrar_movimientos=argumentos.movimientos)
+    else:
+        try:
+            # Si antes se usó --fragmentos, los productos están en los fragmentos
+            fusionar_fragmentos(argumentos.archivo)
+        except Exception as e:
+            print(f"[ERROR CRÍTICO] {e}")
+            sys.exit(1)
+        inventario = Inventario(argumentos.archivo, usar_diario=True, progreso=mostrar_progreso_carga,
+                                escritura_diferida=argumentos.escritura_diferida or None, metricas=metricas,
+                                registrar_movimientos=argumentos.movimientos)
+
+    if argumentos.importar or argumentos.script or argumentos.exportar:
+        codigo = ejecutar_comandos(inventario, argumentos)
+        try:
+            inventario.cerrar()
+        except Exception as e:
+            print(f"[ERROR] {e}")
+            codigo = 1
+        guardar_metricas(inventario, argumentos)
+        sys.exit(codigo)
 
     # Si el inventario está vacío (primera vez que se ejecuta o archivo borrado),
     # agregamos los datos de prueba automáticamente.
@@ -170,27 +483,41 @@ def main():
         inventario.agregar_producto(Producto(3, "Teclado", 30, 45.00))
         print("[INFO] Productos de ejemplo guardados en el archivo.")
 
-    while True:
-        mostrar_menu()
-        opcion = input("\nSeleccione una opción (1-6): ").strip()
+    try:
+        while True:
+            informar_error_guardado(inventario)
+            mostrar_menu()
+            opcion = input("\nSeleccione una opción (1-10): ").strip()
 
-        if opcion == '1':
-            menu_agregar(inventario)
-        elif opcion == '2':
-            menu_eliminar(inventario)
-        elif opcion == '3':
-            menu_actualizar(inventario)
-        elif opcion == '4':
-            menu_buscar(inventario)
-        elif opcion == '5':
-            menu_mostrar_todos(inventario)
-        elif opcion == '6':
-            print("\nGuardando últimos detalles y saliendo. ¡Gracias por usar el sistema!\n")
-            sys.exit(0)
-        else:
-            print("\nError: Opción no válida. Por favor seleccione 1-6")
+            if opcion == '1':
+                menu_agregar(inventario)
+            elif opcion == '2':
+                menu_eliminar(inventario)
+            elif opcion == '3':
+                menu_actualizar(inventario)
+            elif opcion == '4':
+                menu_buscar(inventario)
+            elif opcion == '5':
+                menu_mostrar_todos(inventario)
+            elif opcion == '6':
+                print("\nGuardando últimos detalles y saliendo. ¡Gracias por usar el sistema!\n")
+                salir(inventario, argumentos)
+            elif opcion == '7':
+                menu_importar_csv(inventario)
+            elif opcion == '8':
+                menu_exportar_csv(inventario)
+            elif opcion == '9':
+                menu_estadisticas(inventario)
+            elif opcion == '10':
+                menu_reposicion(inventario)
+            else:
+                print("\nError: Opción no válida. Por favor seleccione 1-10")
 
-        input("\nPresione ENTER para continuar...")
+            input("\nPresione ENTER para continuar...")
+    except (KeyboardInterrupt, EOFError):
+        # Ctrl+C o fin de la entrada: no se pierden los cambios con guardado pendiente
+        print("\n\nEntrada interrumpida. Guardando los cambios pendientes y saliendo...\n")
+        salir(inventario, argumentos)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,193 @@
+import functools
+import json
+import threading
+import time
+from typing import Dict, Iterable, List
+
+
+class HistogramaLatencias:
+    """
+    Histograma de latencias en nanosegundos con cubetas log-lineales, al estilo de HdrHistogram.
+
+    Cada potencia de dos se divide en 2**BITS_SUBCUBETA cubetas del mismo ancho, de modo que
+    cualquier valor se registra con un error relativo máximo de 1 / 2**BITS_SUBCUBETA (3 %)
+    y en memoria constante: CUBETAS contadores cubren desde 1 ns hasta 2**63 ns. Registrar es
+    O(1) y no guarda las muestras, así que sirve para procesos de larga duración; el conteo,
+    el mínimo y los percentiles se obtienen de las cubetas al pedir el resumen.
+    """
+
+    BITS_SUBCUBETA = 5
+    CUBETAS = (64 - BITS_SUBCUBETA) << BITS_SUBCUBETA
+
+    def __init__(self):
+        self.reiniciar()
+
+    def reiniciar(self):
+        self._cubetas: List[int] = [0] * self.CUBETAS  # muestras por índice de cubeta
+        self.total_ns = 0
+        self.maximo_ns = 0
+
+    @classmethod
+    def _indice(cls, valor: int) -> int:
+        # Los valores menores que 2**BITS tienen cubeta propia; para los demás, los BITS + 1 bits
+        # más significativos (de 2**BITS a 2**(BITS+1) - 1) eligen la subcubeta dentro de su potencia
+        desplazamiento = valor.bit_length() - cls.BITS_SUBCUBETA - 1
+        if desplazamiento <= 0:
+            return valor
+        return (desplazamiento << cls.BITS_SUBCUBETA) + (valor >> desplazamiento)
+
+    @classmethod
+    def _limites(cls, indice: int) -> tuple:
+        """Valores mínimo y máximo (en ns) que caen en una cubeta."""
+        if indice < 2 << cls.BITS_SUBCUBETA:
+            return indice, indice
+        desplazamiento = (indice >> cls.BITS_SUBCUBETA) - 1
+        superiores = indice - (desplazamiento << cls.BITS_SUBCUBETA)
+        return superiores << desplazamiento, ((superiores + 1) << desplazamiento) - 1
+
+    def registrar(self, nanosegundos: int):
+        # Igual que _indice, repetido aquí porque se llama en cada operación medida
+        bits = HistogramaLatencias.BITS_SUBCUBETA
+        desplazamiento = nanosegundos.bit_length() - bits - 1
+        indice = nanosegundos if desplazamiento <= 0 else (desplazamiento << bits) + (nanosegundos >> desplazamiento)
+        self._cubetas[indice] += 1
+        self.total_ns += nanosegundos
+        if nanosegundos > self.maximo_ns:
+            self.maximo_ns = nanosegundos
+
+    @property
+    def conteo(self) -> int:
+        return sum(self._cubetas)
+
+    def _no_vacias(self) -> List[int]:
+        return [indice for indice, muestras in enumerate(self._cubetas) if muestras]
+
+    def percentil(self, p: float) -> int:
+        """Latencia (ns) por debajo de la cual está el p % de las muestras (límite superior de su cubeta)."""
+        conteo = self.conteo
+        if not conteo:
+            return 0
+        objetivo = max(1, -(-conteo * p // 100))  # techo, sin pasar por float
+        acumulado = 0
+        for indice in self._no_vacias():
+            acumulado += self._cubetas[indice]
+            if acumulado >= objetivo:
+                return min(self._limites(indice)[1], self.maximo_ns)
+        return self.maximo_ns
+
+    def a_dict(self) -> dict:
+        """Resumen en milisegundos y cubetas no vacías como [desde_ns, hasta_ns, muestras]."""
+        ms = 1e-6
+        conteo = self.conteo
+        no_vacias = self._no_vacias()
+        return {
+            'conteo': conteo,
+            'total_ms': self.total_ns * ms,
+            'media_ms': self.total_ns / conteo * ms if conteo else 0.0,
+            'min_ms': self._limites(no_vacias[0])[0] * ms if no_vacias else 0.0,
+            'p50_ms': self.percentil(50) * ms,
+            'p90_ms': self.percentil(90) * ms,
+            'p99_ms': self.percentil(99) * ms,
+            'p999_ms': self.percentil(99.9) * ms,
+            'max_ms': self.maximo_ns * ms,
+            'cubetas': [[*self._limites(indice), self._cubetas[indice]] for indice in no_vacias],
+        }
+
+
+class Metricas:
+    """
+    Conteo y latencias por operación. Puede compartirse entre hilos: cada registro toma un cerrojo.
+
+    Ejemplo:
+        metricas = Metricas()
+        inventario = Inventario("inventario.json", metricas=metricas)
+        ...
+        print(metricas.a_json())
+    """
+
+    def __init__(self):
+        self._histogramas: Dict[str, HistogramaLatencias] = {}
+        self._cerrojo = threading.Lock()
+
+    def histograma(self, operacion: str) -> HistogramaLatencias:
+        """Histograma de una operación, creado la primera vez que se pide."""
+        with self._cerrojo:
+            histograma = self._histogramas.get(operacion)
+            if histograma is None:
+                histograma = self._histogramas[operacion] = HistogramaLatencias()
+            return histograma
+
+    def registrar(self, operacion: str, nanosegundos: int):
+        histograma = self.histograma(operacion)
+        with self._cerrojo:
+            histograma.registrar(nanosegundos)
+
+    def operaciones(self) -> List[str]:
+        """Operaciones con al menos una muestra, de la que más tiempo acumuló a la que menos."""
+        with self._cerrojo:
+            medidas = [nombre for nombre, histograma in self._histogramas.items() if histograma.conteo]
+            return sorted(medidas, key=lambda nombre: -self._histogramas[nombre].total_ns)
+
+    def resumen(self) -> Dict[str, dict]:
+        """Resumen (ver HistogramaLatencias.a_dict) de cada operación con al menos una muestra."""
+        with self._cerrojo:
+            return {operacion: histograma.a_dict()
+                    for operacion, histograma in self._histogramas.items() if histograma.conteo}
+
+    def reiniciar(self):
+        # Los histogramas se vacían sin reemplazarlos: las envolturas de instrumentar los conservan
+        with self._cerrojo:
+            for histograma in self._histogramas.values():
+                histograma.reiniciar()
+
+    def a_json(self) -> str:
+        return json.dumps(self.resumen(), indent=4, ensure_ascii=False)
+
+    def guardar_json(self, ruta: str):
+        """Escribe el resumen de todas las operaciones en un archivo JSON."""
+        try:
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                archivo.write(self.a_json())
+        except PermissionError:
+            raise PermissionError(f"Permiso denegado para escribir en '{ruta}'")
+        except Exception as e:
+            raise Exception(f"Fallo inesperado al guardar las métricas: {e}")
+
+
+def _medido(metodo, operacion: str, metricas: Metricas):
+    # Histograma, cerrojo y reloj se resuelven una vez, no en cada llamada
+    reloj = time.perf_counter_ns
+    registrar = metricas.histograma(operacion).registrar
+    tomar, soltar = metricas._cerrojo.acquire, metricas._cerrojo.release
+
+    @functools.wraps(metodo)
+    def envoltura(*args, **kwargs):
+        inicio = reloj()
+        try:
+            return metodo(*args, **kwargs)
+        finally:
+            transcurrido = reloj() - inicio
+            tomar()
+            try:
+                registrar(transcurrido)
+            finally:
+                soltar()
+
+    return envoltura
+
+
+def instrumentar(objeto, metodos: Iterable[str], metricas: Metricas):
+    """
+    Mide los métodos indicados de un objeto sustituyéndolos por envolturas en la propia instancia.
+
+    La clase no se modifica: los objetos sin instrumentar no pagan ningún costo adicional, y
+    las llamadas internas (p. ej. compactar -> guardar_en_archivo) también se miden.
+    """
+    for nombre in metodos:
+        setattr(objeto, nombre, _medido(getattr(type(objeto), nombre).__get__(objeto), nombre, metricas))
+
+
+def desinstrumentar(objeto, metodos: Iterable[str]):
+    """Quita las envolturas de instrumentar; la instancia vuelve a usar los métodos de su clase."""
+    for nombre in metodos:
+        objeto.__dict__.pop(nombre, None)
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Migración del inventario de semana10 (inventario.txt) a los formatos de almacenamiento de semana11.
+
+Lee por flujo el arreglo JSON con sangría que escribe inventario_mejorado.py, le aplica los
+cambios pendientes de su diario (inventario.txt.log) y escribe los productos en el formato
+elegido: 'json' (Inventario), 'fragmentos' (InventarioFragmentado), 'sqlite'
+(InventarioSQLite) o 'binario' (InventarioBinario).
+
+El destino se escribe en un directorio temporal junto a la ruta de salida y se vuelve a
+leer con su propia implementación; solo si la suma de verificación de sus productos
+coincide con la del origen se mueve a su lugar con os.replace. El origen solo se lee, así
+que el sistema anterior puede seguir en uso durante la migración; si sus archivos cambian
+mientras tanto, la migración se descarta y hay que repetirla.
+
+Uso:
+    python migracion.py ../semana10/inventario.txt --destino sqlite --salida inventario.db
+    python migracion.py inventario.txt --destino fragmentos --fragmentos 8 --salida inventario.json
+    python migracion.py inventario.txt --destino binario --salida inventario.bin --reemplazar
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from inventario import Inventario
+from inventario_binario import InventarioBinario, escribir_inventario_binario
+from inventario_fragmentado import InventarioFragmentado
+from inventario_sqlite import InventarioSQLite
+from lector_json import iterar_arreglo_json
+from producto import Producto
+
+DESTINOS = ('json', 'fragmentos', 'sqlite', 'binario')
+_MODULO_SUMA = 1 << 128
+
+
+def huella_producto(producto: Producto) -> int:
+    """
+    Huella de 128 bits de los datos de un producto. El precio entra en centavos, que es lo que
+    conservan todos los formatos (el binario lo guarda como entero).
+    """
+    texto = f"{producto.id}\x1f{producto.nombre}\x1f{producto.cantidad}\x1f{round(producto.precio * 100)}"
+    return int.from_bytes(hashlib.blake2b(texto.encode('utf-8'), digest_size=16).digest(), 'little')
+
+
+class SumaVerificacion:
+    """
+    Suma de las huellas de un conjunto de productos (módulo 2**128) y cantidad de productos.
+
+    No depende del orden en que se recorren, así que el origen (en el orden del archivo) y el
+    destino (ordenado por ID) se comparan sin ordenar ni guardar los productos; un producto
+    que falta, sobra o difiere en cualquier campo cambia la suma.
+    """
+
+    def __init__(self):
+        self.registros = 0
+        self.suma = 0
+
+    def agregar(self, producto: Producto):
+        self.registros += 1
+        self.suma = (self.suma + huella_producto(producto)) % _MODULO_SUMA
+
+    def __eq__(self, otra: object) -> bool:
+        if not isinstance(otra, SumaVerificacion):
+            return NotImplemented
+        return self.registros == otra.registros and self.suma == otra.suma
+
+    def __str__(self) -> str:
+        return f"{self.suma:032x} ({self.registros} productos)"
+
+
+class ResultadoMigracion:
+    """Resumen de una migración: volumen, tiempos, sumas de verificación y diferencias encontradas."""
+
+    def __init__(self, destino: str, ruta: str):
+        self.destino = destino
+        self.ruta = ruta
+        self.bytes_origen = 0
+        self.segundos_escritura = 0.0
+        self.segundos_verificacion = 0.0
+        self.suma_origen = SumaVerificacion()
+        self.suma_destino = SumaVerificacion()
+        self.diferencias: List[Tuple[int, str]] = []  # (ID, motivo), solo si las sumas no coinciden
+        self.publicado = False
+
+    @property
+    def registros(self) -> int:
+        return self.suma_origen.registros
+
+    @property
+    def registros_por_segundo(self) -> float:
+        return self.registros / self.segundos_escritura if self.segundos_escritura else 0.0
+
+    @property
+    def mb_por_segundo(self) -> float:
+        return self.bytes_origen / 2 ** 20 / self.segundos_escritura if self.segundos_escritura else 0.0
+
+
+def _leer_diario(ruta_diario: str) -> Tuple[Dict[int, Optional[dict]], Dict[int, dict]]:
+    """
+    Resume el diario de semana10 por producto, con la misma semántica que
+    InventarioMejorado._reproducir_diario.
+
+    Returns:
+        (reemplazos, modificaciones): reemplazos tiene el registro final de los IDs dados de alta
+        en el diario (None si su último cambio fue una baja); modificaciones, los campos que
+        cambiaron en productos del archivo, que solo se aplican si el producto está en él
+    """
+    reemplazos: Dict[int, Optional[dict]] = {}
+    modificaciones: Dict[int, dict] = {}
+    try:
+        with open(ruta_diario, 'r', encoding='utf-8') as diario:
+            for linea in diario:
+                try:
+                    registro = json.loads(linea)
+                except json.JSONDecodeError:
+                    # Una línea incompleta indica una escritura interrumpida: se descarta
+                    continue
+                operacion = registro['op']
+                id_producto = registro['id']
+                if operacion == 'agregar':
+                    modificaciones.pop(id_producto, None)
+                    reemplazos[id_producto] = {campo: registro[campo] for campo in ('id', 'nombre', 'cantidad', 'precio')}
+                elif operacion == 'eliminar':
+                    modificaciones.pop(id_producto, None)
+                    reemplazos[id_producto] = None
+                elif operacion in ('cantidad', 'precio', 'nombre'):
+                    if id_producto in reemplazos:
+                        if reemplazos[id_producto] is not None:
+                            reemplazos[id_producto][operacion] = registro['valor']
+                    else:
+                        modificaciones.setdefault(id_producto, {})[operacion] = registro['valor']
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        raise PermissionError(f"Permiso denegado para leer '{ruta_diario}'")
+    return reemplazos, modificaciones
+
+
+def iterar_origen(ruta_origen: str, ruta_diario: Optional[str] = None,
+                  al_leer: Optional[Callable[[bytes], None]] = None) -> Iterator[Producto]:
+    """
+    Productos del inventario de semana10 con los cambios del diario aplicados, validados y
+    de a uno: la memoria usada depende del tamaño del diario, no del archivo.
+
+    Args:
+        ruta_origen: inventario.txt de semana10
+        ruta_diario: Diario de cambios (por defecto ruta_origen + '.log'; si no existe, no hay cambios)
+        al_leer: Función que recibe cada bloque leído del archivo (ver iterar_arreglo_json)
+
+    Raises:
+        json.JSONDecodeError: Si el archivo no es un arreglo JSON válido
+        ValueError: Si algún producto no cumple las validaciones de Producto
+    """
+    reemplazos, modificaciones = _leer_diario(ruta_diario if ruta_diario is not None else ruta_origen + ".log")
+
+    def filas(archivo) -> Iterator[dict]:
+        for fila in iterar_arreglo_json(archivo, al_leer=al_leer):
+            id_producto = fila['id']
+            if id_producto in reemplazos:
+                continue
+            cambios = modificaciones.get(id_producto)
+            if cambios:
+                fila.update(cambios)
+            yield fila
+        # Las altas del diario (o reemplazos de productos del archivo) van al final, como en semana10
+        for fila in reemplazos.values():
+            if fila is not None:
+                yield fila
+
+    try:
+        with open(ruta_origen, 'rb') as archivo:
+            yield from Producto.desde_filas(filas(archivo), validar=True)
+    except PermissionError:
+        raise PermissionError(f"Permiso denegado para leer '{ruta_origen}'")
+
+
+def _contar(productos: Iterable[Producto], suma: SumaVerificacion) -> Iterator[Producto]:
+    for producto in productos:
+        suma.agregar(producto)
+        yield producto
+
+
+def _escribir_destino(destino: str, ruta: str, productos: Iterator[Producto], fragmentos: int, tamano_lote: int):
+    """Crea el almacenamiento del destino en ruta con los productos."""
+    if destino == 'sqlite':
+        # Por lotes: cada uno es una transacción y la memoria no depende del tamaño del origen
+        inventario = InventarioSQLite(ruta)
+        try:
+            while True:
+                lote = list(islice(productos, tamano_lote))
+                if not lote:
+                    break
+                inventario.agregar_lote(lote)
+            inventario.compactar()
+        finally:
+            inventario.cerrar()
+    elif destino == 'binario':
+        escribir_inventario_binario(ruta, sorted(productos, key=lambda producto: producto.id))
+    else:
+        # Inventario y InventarioFragmentado mantienen todo en memoria: una sola alta masiva,
+        # que se guarda con una única instantánea
+        if destino == 'json':
+            inventario = Inventario(ruta)
+        else:
+            inventario = InventarioFragmentado(ruta, fragmentos=fragmentos, procesos=1)
+        inventario.agregar_lote(productos)
+        inventario.cerrar()
+
+
+def _recorrer_destino(destino: str, ruta: str, fragmentos: int) -> Iterator[Producto]:
+    """Productos del destino leídos desde sus archivos con su propia implementación."""
+    if destino == 'sqlite':
+        inventario = InventarioSQLite(ruta)
+    elif destino == 'binario':
+        inventario = InventarioBinario(ruta, solo_lectura=True)
+    elif destino == 'json':
+        inventario = Inventario(ruta)
+    else:
+        inventario = InventarioFragmentado(ruta, fragmentos=fragmentos)
+    try:
+        yield from inventario.recorrer()
+    finally:
+        inventario.cerrar()
+
+
+def _archivos_destino(destino: str, ruta: str) -> List[str]:
+    """Archivos existentes de un inventario en ruta, que la migración reemplazaría."""
+    if destino == 'sqlite':
+        candidatos = [ruta, ruta + "-wal", ruta + "-shm", ruta + "-journal"]
+    elif destino == 'binario':
+        candidatos = [ruta]
+    else:
+        candidatos = [ruta, ruta + ".sha256", ruta + ".log"]
+        if destino == 'fragmentos':
+            # Fragmentos de cualquier distribución: InventarioFragmentado los cargaría junto con los nuevos
+            raiz, extension = os.path.splitext(ruta)
+            anteriores = glob.glob(glob.escape(raiz) + "-*de*" + glob.escape(extension))
+            candidatos += [archivo + sufijo for archivo in sorted(anteriores) for sufijo in ("", ".sha256")]
+    return [archivo for archivo in candidatos if os.path.exists(archivo)]
+
+
+def _buscar_diferencias(ruta_origen: str, ruta_diario: str, destino: str, ruta: str, fragmentos: int,
+                        limite: int = 20) -> List[Tuple[int, str]]:
+    """Compara producto a producto (por ID) el origen con el destino; solo se usa si las sumas no coinciden."""
+    huellas = {producto.id: huella_producto(producto) for producto in iterar_origen(ruta_origen, ruta_diario)}
+    diferencias = []
+    for producto in _recorrer_destino(destino, ruta, fragmentos):
+        huella = huellas.pop(producto.id, None)
+        if huella is None:
+            diferencias.append((producto.id, "sobra en el destino"))
+        elif huella != huella_producto(producto):
+            diferencias.append((producto.id, "datos distintos"))
+    diferencias += [(id_producto, "falta en el destino") for id_producto in huellas]
+    return sorted(diferencias)[:limite]
+
+
+def _firma(ruta: str) -> Optional[Tuple[int, int]]:
+    try:
+        estado = os.stat(ruta)
+    except FileNotFoundError:
+        return None
+    return estado.st_size, estado.st_mtime_ns
+
+
+def migrar(ruta_origen: str, destino: str, ruta_destino: str, fragmentos: int = 4, tamano_lote: int = 50000,
+           reemplazar: bool = False, progreso: Optional[Callable[[int, int], None]] = None) -> ResultadoMigracion:
+    """
+    Migra el inventario de semana10 al formato 'destino' y verifica el resultado.
+
+    Args:
+        ruta_origen: inventario.txt de semana10 (se aplica también su diario, ruta_origen + '.log')
+        destino: Uno de DESTINOS
+        ruta_destino: Archivo del nuevo inventario (con 'fragmentos', la base de sus nombres)
+        fragmentos: Número de fragmentos del destino 'fragmentos'
+        tamano_lote: Productos por transacción del destino 'sqlite'
+        reemplazar: Si es True, un inventario existente en ruta_destino se reemplaza; debe
+            estar detenido, porque sus archivos se sustituyen (y sus diarios se eliminan)
+        progreso: Función (bytes_leidos, bytes_totales) llamada al leer cada bloque del origen
+
+    Returns:
+        El resultado; si las sumas no coinciden, publicado es False, el destino no se crea y
+        diferencias lista los primeros productos distintos
+
+    Raises:
+        FileNotFoundError: Si no existe el origen
+        FileExistsError: Si ya hay un inventario en ruta_destino y reemplazar es False
+        ValueError: Si un producto del origen no es válido o tiene el ID repetido, o si los
+            archivos del origen cambiaron durante la migración
+        PermissionError, Exception: Si falla la escritura del destino
+    """
+    if destino not in DESTINOS:
+        raise ValueError(f"Destino desconocido: {destino!r} (use {', '.join(DESTINOS)})")
+    ruta_diario = ruta_origen + ".log"
+    firmas = (_firma(ruta_origen), _firma(ruta_diario))
+    if firmas[0] is None:
+        raise FileNotFoundError(f"No existe el archivo de origen '{ruta_origen}'")
+    existentes = _archivos_destino(destino, ruta_destino)
+    if existentes and not reemplazar:
+        raise FileExistsError(f"Ya existe un inventario en '{ruta_destino}' ({', '.join(existentes)})")
+
+    directorio = os.path.dirname(os.path.abspath(ruta_destino))
+    try:
+        # En el mismo sistema de archivos que el destino, para que os.replace no copie
+        temporal = tempfile.mkdtemp(prefix=".migracion-", dir=directorio)
+    except PermissionError:
+        raise PermissionError(f"Permiso denegado para escribir en '{directorio}'")
+    ruta_temporal = os.path.join(temporal, os.path.basename(ruta_destino))
+    resultado = ResultadoMigracion(destino, ruta_destino)
+    bytes_totales = firmas[0][0]
+
+    def al_leer(bloque: bytes):
+        resultado.bytes_origen += len(bloque)
+        if progreso is not None:
+            progreso(resultado.bytes_origen, bytes_totales)
+
+    try:
+        inicio = time.perf_counter()
+        productos = _contar(iterar_origen(ruta_origen, ruta_diario, al_leer), resultado.suma_origen)
+        _escribir_destino(destino, ruta_temporal, productos, fragmentos, tamano_lote)
+        resultado.segundos_escritura = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for producto in _recorrer_destino(destino, ruta_temporal, fragmentos):
+            resultado.suma_destino.agregar(producto)
+        resultado.segundos_verificacion = time.perf_counter() - inicio
+
+        if (_firma(ruta_origen), _firma(ruta_diario)) != firmas:
+            raise ValueError(f"'{ruta_origen}' o su diario cambiaron durante la migración; vuelva a ejecutarla")
+        if resultado.suma_origen != resultado.suma_destino:
+            resultado.diferencias = _buscar_diferencias(ruta_origen, ruta_diario, destino, ruta_temporal, fragmentos)
+            return resultado
+
+        nuevos = os.listdir(temporal)
+        try:
+            for archivo in _archivos_destino(destino, ruta_destino):
+                if os.path.basename(archivo) not in nuevos:
+                    os.remove(archivo)
+            for nombre in nuevos:
+                os.replace(os.path.join(temporal, nombre), os.path.join(directorio, nombre))
+        except PermissionError:
+            raise PermissionError(f"Permiso denegado para escribir en '{directorio}'")
+        resultado.publicado = True
+        return resultado
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+
+
+def mostrar_progreso(leidos: int, total: int):
+    final = '\n' if leidos >= total else ''
+    print(f"\r--- Sistema: Migrando... {leidos * 100 // max(total, 1)}% ---", end=final, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migra el inventario de semana10 a un formato de semana11")
+    parser.add_argument('origen', help="inventario.txt de semana10 (se aplica también su diario .log)")
+    parser.add_argument('--destino', choices=DESTINOS, required=True, help="Formato del nuevo inventario")
+    parser.add_argument('--salida', required=True, metavar='RUTA', help="Archivo del nuevo inventario")
+    parser.add_argument('--fragmentos', type=int, default=4, metavar='N', help="fragmentos: número de archivos")
+    parser.add_argument('--lote', type=int, default=50000, help="sqlite: productos por transacción")
+    parser.add_argument('--reemplazar', action='store_true',
+                        help="Reemplaza un inventario existente en la salida (debe estar detenido)")
+    argumentos = parser.parse_args()
+
+    try:
+        resultado = migrar(argumentos.origen, argumentos.destino, argumentos.salida, argumentos.fragmentos,
+                           argumentos.lote, argumentos.reemplazar, progreso=mostrar_progreso)
+    except (FileNotFoundError, FileExistsError, ValueError, PermissionError) as e:
+        print(f"--- Error: {e} ---")
+        raise SystemExit(1)
+
+    print(f"Productos:          {resultado.registros}")
+    print(f"Escritura:          {resultado.segundos_escritura:.2f} s "
+          f"({resultado.registros_por_segundo:,.0f} productos/s, {resultado.mb_por_segundo:.1f} MB/s)")
+    print(f"Verificación:       {resultado.segundos_verificacion:.2f} s")
+    print(f"Suma del origen:    {resultado.suma_origen}")
+    print(f"Suma del destino:   {resultado.suma_destino}")
+    if not resultado.publicado:
+        print("--- Error: El destino no coincide con el origen; no se publicó ---")
+        for id_producto, motivo in resultado.diferencias:
+            print(f"    ID {id_producto}: {motivo}")
+        raise SystemExit(1)
+    print(f"--- Sistema: Inventario migrado a '{resultado.ruta}' ({resultado.destino}) ---")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+import os
+import struct
+import threading
+import time
+from datetime import date, datetime, timedelta
+from itertools import chain
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Un movimiento: momento (segundos desde la época), ID del producto y variación de la cantidad
+FORMATO = struct.Struct('<dqq')
+# Movimientos leídos del archivo en cada lectura
+MOVIMIENTOS_POR_LECTURA = 4096
+
+
+class RegistroMovimientos:
+    """
+    Registro de movimientos de stock (variaciones de cantidad con fecha y hora) en un archivo
+    binario de solo agregado, de 24 bytes por movimiento.
+
+    Mantiene al día, con cada movimiento, las salidas (unidades descontadas) de cada producto
+    por día durante los últimos 'dias_ventana' días y su suma. Al cambiar de día solo se restan
+    las salidas del día que sale de la ventana, así que consultar el consumo de un producto
+    es O(1) y un reporte de reposición es O(productos), sin volver a recorrer los movimientos.
+
+    Los días son los del calendario local. Los momentos registrados nunca disminuyen (si el
+    reloj retrocede, se usa el del movimiento anterior), así que el archivo queda ordenado:
+    al abrirlo se localiza por búsqueda binaria el primer movimiento de la ventana y solo se
+    leen los posteriores.
+    """
+
+    def __init__(self, ruta: Optional[str] = None, dias_ventana: int = 7):
+        """
+        Args:
+            ruta: Archivo de movimientos; con None se mantienen solo en memoria
+            dias_ventana: Días (incluido el actual) que abarca la suma de salidas
+        """
+        if dias_ventana < 1:
+            raise ValueError("La ventana debe abarcar al menos un día")
+        self._ruta = ruta
+        self._dias_ventana = dias_ventana
+        # Movimientos registrados aún no escritos en el archivo, ya codificados
+        self._pendientes = bytearray()
+        self._registrados = 0  # movimientos registrados desde que se abrió el registro
+        self._volcados = 0     # de ellos, los ya escritos en el archivo
+        self._ultimo_momento = float('-inf')  # momento del último movimiento registrado
+        # Día -> ID -> unidades que salieron ese día, solo para los días de la ventana
+        self._salidas_por_dia: Dict[int, Dict[int, int]] = {}
+        self._salidas_ventana: Dict[int, int] = {}
+        self._dia_actual = date.today().toordinal()
+        self._inicio_dia, self._fin_dia = self._limites_dia(self._dia_actual)
+        self._cerrojo = threading.Lock()
+        if ruta is not None:
+            self._cargar_ventana()
+
+    @property
+    def dias_ventana(self) -> int:
+        return self._dias_ventana
+
+    @staticmethod
+    def _limites_dia(dia: int) -> Tuple[float, float]:
+        """Momentos de inicio y fin (excluido) de un día del calendario local."""
+        inicio = datetime.combine(date.fromordinal(dia), datetime.min.time())
+        return inicio.timestamp(), (inicio + timedelta(days=1)).timestamp()
+
+    def _dia_de(self, momento: float) -> int:
+        # Casi todos los movimientos son del día actual: se evita la conversión a fecha
+        if self._inicio_dia <= momento < self._fin_dia:
+            return self._dia_actual
+        return date.fromtimestamp(momento).toordinal()
+
+    def _avanzar(self, dia: int):
+        """Pasa al día indicado, descontando de la suma las salidas de los días que salen de la ventana."""
+        if dia <= self._dia_actual:
+            return
+        self._dia_actual = dia
+        self._inicio_dia, self._fin_dia = self._limites_dia(dia)
+        for vencido in [d for d in self._salidas_por_dia if d <= dia - self._dias_ventana]:
+            for id_producto, unidades in self._salidas_por_dia.pop(vencido).items():
+                restante = self._salidas_ventana[id_producto] - unidades
+                if restante:
+                    self._salidas_ventana[id_producto] = restante
+                else:
+                    del self._salidas_ventana[id_producto]
+
+    def _acumular(self, momento: float, id_producto: int, delta: int):
+        """Suma una salida (delta negativo) a los agregados; con delta positivo la descuenta al deshacerla."""
+        dia = self._dia_de(momento)
+        if dia > self._dia_actual:
+            self._avanzar(dia)
+        elif dia <= self._dia_actual - self._dias_ventana:
+            return
+        salidas = self._salidas_por_dia.get(dia)
+        if salidas is None:
+            salidas = self._salidas_por_dia[dia] = {}
+        unidades = salidas.get(id_producto, 0) - delta
+        if unidades:
+            salidas[id_producto] = unidades
+        else:
+            del salidas[id_producto]
+        unidades = self._salidas_ventana.get(id_producto, 0) - delta
+        if unidades:
+            self._salidas_ventana[id_producto] = unidades
+        else:
+            del self._salidas_ventana[id_producto]
+
+    def registrar(self, id_producto: int, delta: int, momento: Optional[float] = None):
+        """Registra una variación de la cantidad de un producto (negativa para las salidas)."""
+        if momento is None:
+            momento = time.time()
+        with self._cerrojo:
+            # Un ajuste del reloj hacia atrás no debe desordenar el archivo
+            momento = max(momento, self._ultimo_momento)
+            self._ultimo_momento = momento
+            self._pendientes += FORMATO.pack(momento, id_producto, delta)
+            self._registrados += 1
+            if delta < 0:
+                self._acumular(momento, id_producto, delta)
+
+    def marca(self) -> int:
+        """Posición actual del registro, para deshacer con deshacer_hasta lo registrado después."""
+        return self._registrados
+
+    def deshacer_hasta(self, marca: int):
+        """
+        Descarta los movimientos registrados después de la marca (p. ej. al revertir una transacción).
+
+        Raises:
+            ValueError: Si alguno de ellos ya se escribió en el archivo
+        """
+        with self._cerrojo:
+            if marca < self._volcados:
+                raise ValueError("No se pueden deshacer movimientos ya escritos en el archivo")
+            inicio = (marca - self._volcados) * FORMATO.size
+            for momento, id_producto, delta in FORMATO.iter_unpack(bytes(self._pendientes[inicio:])):
+                if delta < 0:
+                    self._acumular(momento, id_producto, -delta)
+            del self._pendientes[inicio:]
+            self._registrados = marca
+
+    def volcar(self):
+        """Agrega al archivo los movimientos pendientes."""
+        if self._ruta is None:
+            return
+        with self._cerrojo:
+            if not self._pendientes:
+                return
+            try:
+                with open(self._ruta, 'ab') as archivo:
+                    archivo.write(self._pendientes)
+            except PermissionError:
+                raise PermissionError(f"Permiso denegado para escribir en '{self._ruta}'")
+            except Exception as e:
+                raise Exception(f"Fallo inesperado al escribir los movimientos: {e}")
+            self._pendientes.clear()
+            self._volcados = self._registrados
+
+    def _cargar_ventana(self):
+        """Reconstruye los agregados leyendo solo los movimientos de los días de la ventana."""
+        try:
+            with open(self._ruta, 'r+b') as archivo:
+                tamano = os.fstat(archivo.fileno()).st_size
+                if tamano % FORMATO.size:
+                    # Un movimiento a medio escribir (p. ej. un corte de luz): se descarta para
+                    # que los siguientes queden alineados
+                    tamano -= tamano % FORMATO.size
+                    archivo.truncate(tamano)
+                    print(f"--- Sistema: Se descartó un movimiento incompleto al final de '{self._ruta}' ---")
+                total = tamano // FORMATO.size
+                if total:
+                    archivo.seek((total - 1) * FORMATO.size)
+                    self._ultimo_momento = FORMATO.unpack(archivo.read(FORMATO.size))[0]
+                desde = self._limites_dia(self._dia_actual - self._dias_ventana + 1)[0]
+                archivo.seek(self._buscar_momento(archivo, total, desde) * FORMATO.size)
+                for bloque in iter(lambda: archivo.read(MOVIMIENTOS_POR_LECTURA * FORMATO.size), b''):
+                    for momento, id_producto, delta in FORMATO.iter_unpack(bloque):
+                        if delta < 0:
+                            self._acumular(momento, id_producto, delta)
+        except FileNotFoundError:
+            return
+        except PermissionError:
+            print(f"--- Error: Permisos insuficientes para leer '{self._ruta}'. ---")
+            return
+
+    @staticmethod
+    def _buscar_momento(archivo, total: int, momento: float) -> int:
+        """Índice del primer movimiento del archivo con fecha igual o posterior a 'momento'."""
+        bajo, alto = 0, total
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            archivo.seek(medio * FORMATO.size)
+            if FORMATO.unpack(archivo.read(FORMATO.size))[0] < momento:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return bajo
+
+    def movimientos(self, id_producto: Optional[int] = None, desde: Optional[float] = None,
+                    hasta: Optional[float] = None) -> Iterator[Tuple[float, int, int]]:
+        """
+        Historial de movimientos (momento, id, delta) en orden de registro, opcionalmente de un
+        solo producto y entre dos momentos (desde incluido, hasta excluido). Con 'desde' se
+        empieza a leer por búsqueda binaria en lugar de desde el principio del archivo; el
+        archivo se lee de a MOVIMIENTOS_POR_LECTURA movimientos y la lectura termina al
+        pasar 'hasta'.
+        """
+        archivo = None
+        with self._cerrojo:
+            # Pendientes y tamaño del archivo del mismo instante: un volcado posterior no repite
+            # movimientos ni los omite
+            pendientes = bytes(self._pendientes)
+            total = 0
+            if self._ruta is not None:
+                try:
+                    archivo = open(self._ruta, 'rb')
+                    total = os.fstat(archivo.fileno()).st_size // FORMATO.size
+                except FileNotFoundError:
+                    pass
+        bloques = iter(())
+        if archivo is not None:
+            bloques = self._leer_bloques(archivo, total, desde)
+        for bloque in chain(bloques, (pendientes,)):
+            for momento, id_mov, delta in FORMATO.iter_unpack(bloque):
+                if hasta is not None and momento >= hasta:
+                    return
+                if id_producto is not None and id_mov != id_producto:
+                    continue
+                if desde is not None and momento < desde:
+                    continue
+                yield momento, id_mov, delta
+
+    def _leer_bloques(self, archivo, total: int, desde: Optional[float]) -> Iterator[bytes]:
+        """Los 'total' primeros movimientos del archivo desde 'desde', de a MOVIMIENTOS_POR_LECTURA."""
+        with archivo:
+            inicio = 0 if desde is None else self._buscar_momento(archivo, total, desde)
+            archivo.seek(inicio * FORMATO.size)
+            for posicion in range(inicio, total, MOVIMIENTOS_POR_LECTURA):
+                yield archivo.read(min(MOVIMIENTOS_POR_LECTURA, total - posicion) * FORMATO.size)
+
+    def _al_dia(self):
+        dia = date.today().toordinal()
+        if dia > self._dia_actual:
+            self._avanzar(dia)
+
+    def salida_del_dia(self, id_producto: int) -> int:
+        """Unidades del producto que salieron hoy."""
+        with self._cerrojo:
+            self._al_dia()
+            return self._salidas_por_dia.get(self._dia_actual, {}).get(id_producto, 0)
+
+    def salida_ventana(self, id_producto: int) -> int:
+        """Unidades del producto que salieron en los últimos dias_ventana días (incluido hoy)."""
+        with self._cerrojo:
+            self._al_dia()
+            return self._salidas_ventana.get(id_producto, 0)
+
+    def salidas_ventana(self) -> Dict[int, int]:
+        """Copia de las salidas de la ventana de todos los productos con alguna salida."""
+        with self._cerrojo:
+            self._al_dia()
+            return dict(self._salidas_ventana)
+
+    def consumo_diario(self, id_producto: int) -> float:
+        """Promedio de unidades por día del producto en la ventana."""
+        return self.salida_ventana(id_producto) / self._dias_ventana
+
+
+def calcular_reposicion(registro: RegistroMovimientos, buscar_por_id: Callable[[int], Optional[object]],
+                        dias_cobertura: float) -> List[Tuple[object, float, float]]:
+    """
+    Productos cuyo stock no alcanza para dias_cobertura días al ritmo de salida de la ventana.
+
+    Solo consulta los productos con salidas en la ventana, sin recorrer el historial.
+
+    Args:
+        registro: Movimientos del inventario
+        buscar_por_id: Función que da el producto de un ID, o None si ya no existe
+
+    Returns:
+        (producto, consumo diario promedio, días de stock restantes), del más urgente al menos
+    """
+    reporte = []
+    for id_producto, unidades in registro.salidas_ventana().items():
+        producto = buscar_por_id(id_producto)
+        if producto is None:
+            continue
+        consumo = unidades / registro.dias_ventana
+        restantes = producto.cantidad / consumo
+        if restantes < dias_cobertura:
+            reporte.append((producto, consumo, restantes))
+    reporte.sort(key=lambda fila: (fila[2], fila[0].id))
+    return reporte
@@ -1,9 +1,18 @@
+from typing import Iterable, Iterator
+
+
 class Producto:
     """
     Clase que representa un producto en el inventario.
     Atributos con validación para garantizar integridad de datos.
+    Usa __slots__ para no reservar un __dict__ por instancia en inventarios grandes.
+
+    Si el producto pertenece a un inventario, los setters le avisan de cada cambio
+    (producto_modificado) para que mantenga sus índices al día.
     """
 
+    __slots__ = ('_id', '_nombre', '_cantidad', '_precio', '_inventario')
+
     def __init__(self, id_producto: int, nombre: str, cantidad: int, precio: float):
         """
         Constructor de la clase Producto.
@@ -30,6 +39,46 @@ class Producto:
         self._nombre = nombre.strip()
         self._cantidad = cantidad
         self._precio = round(precio, 2)  # Precisión de 2 decimales para moneda
+        self._inventario = None  # Inventario al que se notifican los cambios (lo asigna el inventario)
+
+    @classmethod
+    def desde_filas(cls, filas: Iterable[dict], validar: bool = True) -> Iterator['Producto']:
+        """
+        Construye muchos productos a partir de diccionarios con las claves del archivo JSON.
+
+        Los productos se generan a medida que se consumen las filas, por lo que admite
+        lectores por flujo. Evita la llamada a __init__ por fila. Con validar=True aplica las mismas validaciones
+        que el constructor en una sola pasada; con validar=False copia los valores tal cual,
+        lo que solo debe usarse con datos de confianza (p. ej. un archivo cuya suma de
+        verificación coincide con la que se escribió al guardarlo).
+
+        Raises:
+            ValueError: Si alguna fila no cumple las validaciones (solo con validar=True)
+        """
+        nuevo = object.__new__
+        for fila in filas:
+            id_producto = fila['id']
+            nombre = fila['nombre']
+            cantidad = fila['cantidad']
+            precio = fila['precio']
+            if validar:
+                if id_producto <= 0:
+                    raise ValueError("El ID debe ser un número positivo")
+                nombre = nombre.strip() if nombre else nombre
+                if not nombre:
+                    raise ValueError("El nombre no puede estar vacío")
+                if cantidad < 0:
+                    raise ValueError("La cantidad no puede ser negativa")
+                if precio < 0:
+                    raise ValueError("El precio no puede ser negativo")
+                precio = round(precio, 2)
+            producto = nuevo(cls)
+            producto._id = id_producto
+            producto._nombre = nombre
+            producto._cantidad = cantidad
+            producto._precio = precio
+            producto._inventario = None
+            yield producto
 
     # Getters
     @property
@@ -53,19 +102,28 @@ class Producto:
     def nombre(self, nuevo_nombre: str):
         if not nuevo_nombre or not nuevo_nombre.strip():
             raise ValueError("El nombre no puede estar vacío")
+        anterior = self._nombre
         self._nombre = nuevo_nombre.strip()
+        if self._inventario is not None and anterior != self._nombre:
+            self._inventario.producto_modificado(self, 'nombre', anterior)
 
     @cantidad.setter
     def cantidad(self, nueva_cantidad: int):
         if nueva_cantidad < 0:
             raise ValueError("La cantidad no puede ser negativa")
+        anterior = self._cantidad
         self._cantidad = nueva_cantidad
+        if self._inventario is not None and anterior != nueva_cantidad:
+            self._inventario.producto_modificado(self, 'cantidad', anterior)
 
     @precio.setter
     def precio(self, nuevo_precio: float):
         if nuevo_precio < 0:
             raise ValueError("El precio no puede ser negativo")
+        anterior = self._precio
         self._precio = round(nuevo_precio, 2)
+        if self._inventario is not None and anterior != self._precio:
+            self._inventario.producto_modificado(self, 'precio', anterior)
 
     def __str__(self) -> str:
         """Representación en cadena para visualización amigable"""
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Servidor TCP del Sistema de Gestion de Inventarios (asyncio).
+
+Protocolo: una petición JSON por línea y una respuesta JSON por línea, en el mismo orden.
+    -> {"id": 7, "op": "buscar_id", "id_producto": 3}
+    <- {"id": 7, "ok": true, "resultado": {"id": 3, "nombre": "Teclado", "cantidad": 30, "precio": 45.0}}
+    <- {"id": 8, "ok": false, "error": "Petición inválida: La cantidad no puede ser negativa"}
+
+El cliente puede enviar varias peticiones sin esperar las respuestas (pipelining). Los
+cambios se guardan con la escritura diferida de Inventario, por lo que una ráfaga de
+peticiones de muchos clientes produce un solo guardado.
+
+Uso:
+    python servidor.py --archivo inventario.json --puerto 8765
+    python servidor.py --replica inventario.bin   (publica réplicas para procesos de solo consulta)
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+from typing import Callable, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from inventario import Inventario
+from inventario_binario import PublicadorInstantaneas
+from producto import Producto
+
+# Longitud máxima de una línea de petición; una más larga cierra la conexión
+LIMITE_LINEA = 64 * 1024
+# Respuestas sin enviar a partir de las cuales se deja de leer la conexión
+LIMITE_SALIDA = 256 * 1024
+
+
+def _como_dict(producto):
+    return None if producto is None else producto.to_dict()
+
+
+def _es_error_de_guardado(error: BaseException) -> bool:
+    """Indica si el error viene del disco (Inventario envuelve algunos OSError en Exception)."""
+    return isinstance(error, OSError) or isinstance(error.__context__, OSError)
+
+
+def _codificar(respuesta: dict) -> bytes:
+    return json.dumps(respuesta, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+class ServidorInventario:
+    """Atiende conexiones TCP y traduce cada petición JSON en una llamada al inventario."""
+
+    def __init__(self, inventario: Inventario):
+        self._inventario = inventario
+        self._operaciones: Dict[str, Callable[[dict], object]] = {
+            'ping': lambda p: 'pong',
+            'tamano': lambda p: inventario.obtener_tamaño(),
+            'buscar_id': lambda p: _como_dict(inventario.buscar_por_id(p['id_producto'])),
+            'buscar_nombre': lambda p: [x.to_dict() for x in inventario.buscar_por_nombre(p['nombre'])],
+            'buscar_aproximado': lambda p: [x.to_dict()
+                                            for x in inventario.buscar_aproximado(p['texto'], p.get('limite', 10))],
+            'pagina': lambda p: [x.to_dict() for x in inventario.pagina(p['numero'], p['tamano'])],
+            'agregar': lambda p: inventario.agregar_producto(
+                Producto(p['id_producto'], p['nombre'], p['cantidad'], p['precio'])),
+            'eliminar': lambda p: inventario.eliminar_producto(p['id_producto']),
+            'cantidad': lambda p: inventario.actualizar_cantidad(p['id_producto'], p['valor']),
+            'precio': lambda p: inventario.actualizar_precio(p['id_producto'], p['valor']),
+            'incrementar': lambda p: inventario.incrementar_cantidad(p['id_producto'], p['delta']),
+            'decrementar_si_hay': lambda p: inventario.decrementar_si_hay(p['id_producto'], p['cantidad']),
+        }
+
+    def procesar(self, linea: bytes) -> bytes:
+        """Ejecuta una petición y devuelve la línea de respuesta (siempre JSON, nunca lanza)."""
+        try:
+            peticion = json.loads(linea)
+            if not isinstance(peticion, dict):
+                raise ValueError("La petición debe ser un objeto JSON")
+        except ValueError as e:
+            return _codificar({'id': None, 'ok': False, 'error': f"Petición inválida: {e}"})
+
+        respuesta = {'id': peticion.get('id')}
+        operacion = self._operaciones.get(peticion.get('op'))
+        if operacion is None:
+            respuesta.update(ok=False, error=f"Operación desconocida: {peticion.get('op')!r}")
+            return _codificar(respuesta)
+        try:
+            respuesta.update(ok=True, resultado=operacion(peticion))
+        except KeyError as e:
+            respuesta.update(ok=False, error=f"Falta el campo {e}")
+        except (ValueError, TypeError, AttributeError) as e:
+            # Argumentos con tipo o valor incorrecto: el inventario no llegó a cambiar
+            respuesta.update(ok=False, error=f"Petición inválida: {e}")
+        except Exception as e:
+            if _es_error_de_guardado(e):
+                # El cambio quedó en memoria y se volverá a intentar guardar con el siguiente
+                respuesta.update(ok=False, error=f"Aplicado en memoria, pero falló el guardado: {e}")
+            else:
+                respuesta.update(ok=False, error=f"Error interno: {e}")
+        error_diferido = self._inventario.tomar_error_escritura()
+        if error_diferido is not None:
+            print(f"--- Error: Falló el guardado en segundo plano: {error_diferido} ---")
+        return _codificar(respuesta)
+
+    async def ejecutar(self, host: str, puerto: int):
+        bucle = asyncio.get_running_loop()
+        servidor = await bucle.create_server(lambda: ProtocoloInventario(self), host, puerto, backlog=4096)
+        direcciones = ', '.join(str(s.getsockname()) for s in servidor.sockets)
+        print(f"--- Sistema: Servidor de inventario escuchando en {direcciones} ---")
+        for senal in (signal.SIGINT, signal.SIGTERM):
+            try:
+                # Cierra el servidor de forma ordenada para que main() guarde los cambios pendientes
+                bucle.add_signal_handler(senal, servidor.close)
+            except NotImplementedError:
+                pass  # Windows: Ctrl+C llega como KeyboardInterrupt
+        async with servidor:
+            try:
+                await servidor.serve_forever()
+            except asyncio.CancelledError:
+                pass
+        print("--- Sistema: Deteniendo el servidor ---")
+
+
+class ProtocoloInventario(asyncio.Protocol):
+    """
+    Una conexión de cliente.
+
+    Todas las peticiones completas que llegan en una lectura se procesan seguidas y sus
+    respuestas se envían con una sola escritura (pipelining). Si el cliente no consume las
+    respuestas y el búfer de salida supera LIMITE_SALIDA, se deja de leer esa conexión
+    hasta que se vacíe (contrapresión por conexión), sin afectar a las demás.
+    """
+
+    def __init__(self, servidor: ServidorInventario):
+        self._servidor = servidor
+        self._transporte: Optional[asyncio.Transport] = None
+        self._incompleto = b''
+
+    def connection_made(self, transporte: asyncio.Transport):
+        self._transporte = transporte
+        transporte.set_write_buffer_limits(high=LIMITE_SALIDA)
+
+    def data_received(self, datos: bytes):
+        *lineas, self._incompleto = (self._incompleto + datos).split(b'\n')
+        respuestas = [self._servidor.procesar(linea) for linea in lineas if linea.strip()]
+        if len(self._incompleto) > LIMITE_LINEA:
+            respuestas.append(_codificar({'id': None, 'ok': False, 'error': "Línea demasiado larga"}))
+            self._transporte.write(b''.join(respuestas))
+            self._transporte.close()
+            return
+        if respuestas:
+            self._transporte.write(b''.join(respuestas))
+
+    def pause_writing(self):
+        self._transporte.pause_reading()
+
+    def resume_writing(self):
+        self._transporte.resume_reading()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor TCP del inventario (JSON por líneas)")
+    parser.add_argument('--archivo', default="inventario.json", help="Archivo JSON del inventario")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--escritura-diferida', type=float, default=0.2, metavar='SEGUNDOS',
+                        help="Segundos sin cambios tras los cuales se guardan los cambios acumulados")
+    parser.add_argument('--replica', metavar='RUTA',
+                        help="Publica periódicamente una instantánea binaria de solo lectura en RUTA")
+    parser.add_argument('--intervalo-replica', type=float, default=5.0, metavar='SEGUNDOS',
+                        help="Segundos entre publicaciones de la réplica (solo si hubo cambios)")
+    argumentos = parser.parse_args()
+
+    if resource is not None:
+        # Cada conexión usa un descriptor de archivo; se sube el límite blando hasta el máximo permitido
+        _, maximo = resource.getrlimit(resource.RLIMIT_NOFILE)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (maximo, maximo))
+        except (ValueError, OSError):
+            pass
+
+    inventario = Inventario(argumentos.archivo, usar_diario=True,
+                            escritura_diferida=argumentos.escritura_diferida or None)
+    publicador = None
+    if argumentos.replica:
+        publicador = PublicadorInstantaneas(inventario, argumentos.replica, argumentos.intervalo_replica)
+        publicador.iniciar()
+        print(f"--- Sistema: Publicando réplicas de solo lectura en '{argumentos.replica}' ---")
+    try:
+        asyncio.run(ServidorInventario(inventario).ejecutar(argumentos.host, argumentos.puerto))
+    except KeyboardInterrupt:
+        print("\n--- Sistema: Deteniendo el servidor ---")
+    finally:
+        if publicador is not None:
+            try:
+                publicador.detener()
+            except Exception as e:
+                print(f"[ERROR] No se pudo publicar la última réplica: {e}")
+        try:
+            inventario.cerrar()
+        except Exception as e:
+            print(f"[ERROR CRÍTICO] No se pudieron guardar los últimos cambios: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos de la semana se importan por nombre (from producto import Producto), como en main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
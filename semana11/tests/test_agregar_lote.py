@@ -0,0 +1,45 @@
+import pytest
+
+from inventario import Inventario
+from producto import Producto
+
+
+def _lote(desde: int, hasta: int):
+    return [Producto(i, f"Producto {i}", i, 1.5) for i in range(desde, hasta)]
+
+
+@pytest.fixture(params=[False, True], ids=['sin_diario', 'con_diario'])
+def inventario(request, tmp_path, monkeypatch):
+    inventario = Inventario(str(tmp_path / "inventario.json"), usar_diario=request.param, umbral_compactacion=50)
+    compactaciones = []
+    compactar = inventario.compactar
+    monkeypatch.setattr(inventario, 'compactar', lambda: (compactaciones.append(1), compactar()))
+    inventario.compactaciones = compactaciones
+    yield inventario
+    inventario.cerrar()
+
+
+def test_lote_vacio_no_escribe(inventario, tmp_path):
+    inventario.agregar_lote(_lote(1, 4))
+    archivos = {ruta.name: ruta.stat().st_mtime_ns for ruta in tmp_path.iterdir()}
+    assert inventario.agregar_lote([]) == 0
+    assert inventario.compactaciones == []
+    assert {ruta.name: ruta.stat().st_mtime_ns for ruta in tmp_path.iterdir()} == archivos
+
+
+def test_lote_pequeno_conserva_indices_de_valores(inventario):
+    inventario.agregar_lote(_lote(1, 11))
+    assert [p.id for p in inventario.por_rango_cantidad(3, 5)] == [3, 4, 5]
+    inventario.agregar_lote(_lote(11, 21))
+    assert inventario.compactaciones == []
+    assert [p.id for p in inventario.por_rango_cantidad(9, 12)] == [9, 10, 11, 12]
+    # Los productos agregados quedan vinculados: cambiar su cantidad actualiza el índice
+    inventario.buscar_por_id(15).cantidad = 3
+    assert [p.id for p in inventario.por_rango_cantidad(3, 3)] == [3, 15]
+
+
+def test_lote_grande_guarda_instantanea(inventario, tmp_path):
+    inventario.agregar_lote(_lote(1, 101))
+    assert inventario.compactaciones == [1]
+    assert [p.id for p in inventario.por_rango_cantidad(98, 200)] == [98, 99, 100]
+    assert len(Inventario(str(tmp_path / "inventario.json")).obtener_todos()) == 100
@@ -0,0 +1,174 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from metricas import Metricas
+from producto import Producto
+
+
+def _sqlite():
+    from inventario_sqlite import InventarioSQLite
+    return InventarioSQLite
+
+
+def _columnar():
+    pytest.importorskip('numpy')
+    from inventario_columnar import InventarioColumnar
+    return InventarioColumnar
+
+
+@pytest.fixture(params=['sqlite', 'columnar'])
+def crear(request, tmp_path):
+    clase = _sqlite() if request.param == 'sqlite' else _columnar()
+    extension = '.db' if request.param == 'sqlite' else '.json'
+    ruta = str(tmp_path / f"inventario{extension}")
+    abiertos = []
+
+    def crear_inventario(**opciones):
+        inventario = clase(ruta, **opciones)
+        abiertos.append(inventario)
+        return inventario
+
+    yield crear_inventario
+    for inventario in abiertos:
+        inventario.cerrar()
+
+
+def _cargar(inventario):
+    inventario.agregar_lote([
+        Producto(1, "Tornillo largo", 10, 0.5),
+        Producto(2, "Tuerca", 40, 0.2),
+        Producto(3, "Tornillo corto", 5, 0.4),
+    ])
+
+
+def test_acepta_los_argumentos_de_main(crear):
+    metricas = Metricas()
+    inventario = crear(usar_diario=True, progreso=lambda leidos, total: None, escritura_diferida=None,
+                       metricas=metricas, registrar_movimientos=True)
+    _cargar(inventario)
+    inventario.buscar_por_id(1)
+    assert inventario.metricas is metricas
+    assert inventario.movimientos is not None
+    assert 'buscar_por_id' in metricas.resumen()
+
+
+def test_cache_de_busquedas_se_invalida_al_renombrar(crear):
+    inventario = crear()
+    _cargar(inventario)
+    assert [p.id for p in inventario.buscar_por_nombre("tornillo")] == [1, 3]
+    assert [p.id for p in inventario.buscar_por_nombre("tornillo")] == [1, 3]
+    assert inventario.estadisticas_cache()['aciertos'] == 1
+    inventario.actualizar_nombre(2, "Tornillo de tuerca")
+    assert [p.id for p in inventario.buscar_por_nombre("tornillo")] == [1, 2, 3]
+    inventario.actualizar_cantidad(1, 99)
+    assert inventario.buscar_por_nombre("tornillo")[0].cantidad == 99
+
+
+def test_buscar_aproximado(crear):
+    inventario = crear()
+    _cargar(inventario)
+    assert inventario.buscar_aproximado("tornilo")[0].id in (1, 3)
+    inventario.eliminar_producto(1)
+    inventario.eliminar_producto(3)
+    assert all(p.id == 2 for p in inventario.buscar_aproximado("tornilo"))
+
+
+def test_incrementar_y_decrementar(crear):
+    inventario = crear()
+    _cargar(inventario)
+    assert inventario.incrementar_cantidad(1, 5)
+    assert inventario.decrementar_si_hay(1, 15)
+    assert not inventario.decrementar_si_hay(1, 1)
+    assert not inventario.decrementar_si_hay(99, 1)
+    with pytest.raises(ValueError):
+        inventario.incrementar_cantidad(2, -41)
+    assert inventario.buscar_por_id(1).cantidad == 0
+    assert inventario.buscar_por_id(2).cantidad == 40
+
+
+def test_transaccion_revierte_productos_y_movimientos(crear):
+    inventario = crear(registrar_movimientos=True)
+    _cargar(inventario)
+    inventario.actualizar_cantidad(2, 30)
+    with pytest.raises(RuntimeError):
+        with inventario.transaccion():
+            inventario.actualizar_cantidad(1, 1)
+            inventario.eliminar_producto(3)
+            inventario.agregar_producto(Producto(4, "Arandela", 3, 0.1))
+            raise RuntimeError("falla")
+    assert inventario.buscar_por_id(1).cantidad == 10
+    assert inventario.buscar_por_id(3).nombre == "Tornillo corto"
+    assert inventario.buscar_por_id(4) is None
+    inventario.cerrar()
+    assert [(id_producto, delta) for _, id_producto, delta in inventario.movimientos.movimientos()] == [(2, -10)]
+
+
+def test_reporte_reposicion(crear):
+    inventario = crear(registrar_movimientos=True)
+    _cargar(inventario)
+    inventario.decrementar_si_hay(3, 4)
+    inventario.decrementar_si_hay(2, 1)
+    reporte = inventario.reporte_reposicion(dias_cobertura=2)
+    assert [producto.id for producto, _, _ in reporte] == [3]
+
+
+def test_reporte_reposicion_sin_movimientos(crear):
+    with pytest.raises(ValueError):
+        crear().reporte_reposicion()
+
+
+def test_recorrer_en_bloques(crear):
+    inventario = crear()
+    inventario.agregar_lote([Producto(i, f"Producto {i}", i, 1.0) for i in range(1, 26)])
+    assert [p.id for p in inventario.recorrer(tamaño_bloque=10)] == list(range(1, 26))
+
+
+def test_cambios_persisten_al_reabrir(crear):
+    inventario = crear()
+    _cargar(inventario)
+    with inventario.transaccion():
+        inventario.actualizar_precio(1, 0.75)
+        inventario.eliminar_producto(2)
+    inventario.cerrar()
+    reabierto = crear()
+    assert [p.id for p in reabierto.obtener_todos()] == [1, 3]
+    assert reabierto.buscar_por_id(1).precio == 0.75
+
+
+def test_sqlite_cache_ve_cambios_de_otra_conexion(tmp_path):
+    ruta = str(tmp_path / "inventario.db")
+    inventario = _sqlite()(ruta)
+    _cargar(inventario)
+    assert [p.id for p in inventario.buscar_por_nombre("tuerca")] == [2]
+    conexion = sqlite3.connect(ruta)
+    with conexion:
+        conexion.execute("UPDATE productos SET nombre = 'Arandela', nombre_min = 'arandela' WHERE id = 2")
+    conexion.close()
+    assert inventario.buscar_por_nombre("tuerca") == []
+    inventario.cerrar()
+
+
+def test_sqlite_sin_indice_de_nombre(tmp_path):
+    ruta = str(tmp_path / "inventario.db")
+    _sqlite()(ruta).cerrar()
+    conexion = sqlite3.connect(ruta)
+    indices = [fila[0] for fila in conexion.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+    conexion.close()
+    assert 'idx_productos_nombre_min' not in indices
+
+
+def test_menu_con_sqlite_guarda_en_la_base(tmp_path):
+    ruta = str(tmp_path / "inventario.db")
+    main = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+    resultado = subprocess.run([sys.executable, main, "--sqlite", "--archivo", ruta],
+                               input="1\n7\nClavo\n5\n0.1\n\n6\n", capture_output=True, text=True, timeout=60)
+    assert resultado.returncode == 0, resultado.stdout + resultado.stderr
+    assert "agregado (guardado en archivo)" in resultado.stdout
+    inventario = _sqlite()(ruta)
+    assert inventario.buscar_por_id(7).nombre == "Clavo"
+    assert inventario.obtener_tamaño() == 4  # los tres productos de ejemplo y el nuevo
+    inventario.cerrar()
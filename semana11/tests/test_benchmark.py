@@ -0,0 +1,78 @@
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+import benchmark
+from comandos_inventario import ejecutar_script
+from inventario import Inventario
+from migracion import DESTINOS, migrar
+from producto import Producto
+
+SEMANA11 = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('n', [0, 1, 500])
+def test_cargas_leen_todo_el_archivo_generado(n):
+    with benchmark.directorio_con_inventario(n) as (_, ruta):
+        assert benchmark._cargar_completo(ruta) == n
+        assert benchmark._cargar_por_flujo(ruta) == n
+        assert Inventario(ruta).obtener_tamaño() == n
+
+
+@pytest.mark.parametrize('generacion', list(benchmark.GENERACIONES))
+def test_generaciones_abren_los_mismos_datos(generacion, tmp_path):
+    # Cada generación registra sus módulos en sys.modules: se abre en un proceso aparte
+    ruta = str(tmp_path / "datos.json")
+    benchmark.generar_archivo(ruta, 300)
+    codigo = ("import sys, benchmark; "
+              "inventario, _, _ = benchmark._abrir_generacion(sys.argv[1], sys.argv[2]); "
+              "print(inventario.obtener_tamaño())")
+    resultado = subprocess.run([sys.executable, "-c", codigo, generacion, ruta], cwd=SEMANA11,
+                               capture_output=True, text=True, timeout=60)
+    assert resultado.returncode == 0, resultado.stderr
+    assert resultado.stdout.split()[-1] == "300"
+
+
+@pytest.mark.parametrize('destino', DESTINOS)
+def test_migracion_publica_todos_los_productos(destino, tmp_path):
+    n = 300
+    origen = str(tmp_path / "inventario.txt")
+    benchmark.generar_archivo(origen, n)
+    with open(origen + ".log", 'w', encoding='utf-8') as diario:
+        diario.write('{"op": "cantidad", "id": 7, "valor": 1}\n')
+    resultado = migrar(origen, destino, str(tmp_path / f"destino-{destino}"))
+    assert resultado.publicado
+    assert resultado.registros == n
+
+
+def test_busqueda_aproximada_coincide_con_la_lineal(tmp_path):
+    inventario = Inventario(str(tmp_path / "inventario.json"))
+    inventario.agregar_lote(Producto(i, benchmark._nombre_realista(i), i % 500, 10.0) for i in range(1, 3001))
+    productos = inventario.obtener_todos()
+    for consulta in benchmark.CONSULTAS_DIFUSA:
+        esperado = benchmark._buscar_aproximado_lineal(productos, consulta, 10)
+        assert esperado
+        assert [p.id for p in inventario.buscar_aproximado(consulta)] == esperado
+
+
+def test_script_sintetico_se_ejecuta_sin_errores(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    benchmark.generar_archivo(ruta, 1000)
+    inventario = Inventario(ruta, usar_diario=True)
+    resultado = ejecutar_script(inventario, benchmark._lineas_script(400, 1000), io.StringIO())
+    inventario.cerrar()
+    assert resultado.errores == []
+    assert resultado.ejecutados == 400
+
+
+def test_tabla_alinea_titulos_y_valores(capsys):
+    tabla = benchmark.Tabla(('PRODUCTOS', '>10'), ('MODO', '<6'), ('TIEMPO (ms)', '>11.2f'))
+    tabla.fila(100, "json", 1.234)
+    tabla.fila(100, "bin", None)
+    encabezado, primera, segunda = capsys.readouterr().out.splitlines()
+    assert encabezado == " PRODUCTOS | MODO   | TIEMPO (ms)"
+    assert primera == "       100 | json   |        1.23"
+    assert segunda == "       100 | bin    |           -"
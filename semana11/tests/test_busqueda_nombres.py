@@ -0,0 +1,44 @@
+import pytest
+
+from inventario import Inventario
+from producto import Producto
+
+NOMBRES = ["Cañón de Agua", "CAÑERÍA PVC", "Árbol de levas", "arbolito", "Teclado Español",
+           "Ratón óptico", "RATÓN inalámbrico", "Piñón", "Café molido", "café EN GRANO",
+           "Über Kabel", "über", "A", "ab", "Tuerca 1/2\"", "Niño Pequeño"]
+CONSULTAS = ["", " ", "a", "A", "ñ", "Ñ", "ca", "CAÑ", "añ", "ón", "ÓN", "rat", "RATÓN I", "é",
+             "Café", "caf", "ber", "ÜBER", "arbol", "árbol", "ÁRBOL DE", "o", "1/2", "2\"", "xyz",
+             "  teclado  ", "niño pequeño", "ab", "abc", "de"]
+
+
+def _lineal(inventario: Inventario, consulta: str):
+    # La búsqueda anterior al índice: subcadena sin distinguir mayúsculas, en el orden del diccionario
+    normalizada = consulta.strip().lower()
+    return [p.id for p in inventario._productos.values() if normalizada in p.nombre.lower()]
+
+
+@pytest.fixture
+def inventario(tmp_path):
+    inventario = Inventario(str(tmp_path / "inventario.json"))
+    # IDs desordenados: el orden del resultado debe ser el del recorrido lineal
+    for posicion, nombre in enumerate(NOMBRES):
+        inventario.agregar_producto(Producto((posicion * 7) % len(NOMBRES) + 1, nombre, 1, 1.0))
+    return inventario
+
+
+def _comprobar(inventario: Inventario):
+    for consulta in CONSULTAS:
+        assert [p.id for p in inventario.buscar_por_nombre(consulta)] == _lineal(inventario, consulta), consulta
+
+
+def test_trigramas_coinciden_con_la_busqueda_lineal(inventario):
+    _comprobar(inventario)
+
+
+def test_coinciden_tras_altas_bajas_y_renombres(inventario):
+    _comprobar(inventario)  # construye el índice antes de los cambios
+    inventario.eliminar_producto(1)
+    inventario.actualizar_nombre(2, "Cañería de cobre")
+    inventario.buscar_por_id(3).nombre = "ÁRBOL DE TRANSMISIÓN"
+    inventario.agregar_producto(Producto(50, "Arbolado Ñandú", 1, 1.0))
+    _comprobar(inventario)
@@ -0,0 +1,97 @@
+import io
+import json
+
+import pytest
+
+from inventario import Inventario
+from lector_json import iterar_arreglo_json
+
+
+def _filas(cantidad: int):
+    # Nombres con caracteres de varios bytes, para que algunos queden partidos entre bloques
+    return [{'id': i, 'nombre': f"Artículo ñandú {i}", 'cantidad': i % 50, 'precio': round(i * 0.37, 2)}
+            for i in range(1, cantidad + 1)]
+
+
+def _escribir(ruta, filas):
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(filas, archivo, indent=4)
+
+
+@pytest.mark.parametrize('tamano_bloque', [1, 7, 64, 1 << 20])
+def test_arreglo_mayor_que_el_bloque(tamano_bloque):
+    filas = _filas(200)
+    contenido = json.dumps(filas, indent=4).encode('utf-8')
+    assert len(contenido) > 64
+    assert list(iterar_arreglo_json(io.BytesIO(contenido), tamano_bloque)) == filas
+
+
+def test_arreglo_vacio_y_con_espacios():
+    assert list(iterar_arreglo_json(io.BytesIO(b'  [ ]  \n'), 1)) == []
+
+
+@pytest.mark.parametrize('contenido', [
+    b'[{"id": 1}, {"id": 2',       # cortado dentro de un elemento
+    b'[{"id": 1}, {"id": 2}',      # falta el cierre
+    b'[{"id": 1}, {"id": 2},',     # coma final sin elemento
+    b'[{"id": 1} {"id": 2}]',      # falta la coma
+    b'[{"id": 1}] basura',         # contenido después del arreglo
+    b'{"id": 1}',                  # no es un arreglo
+    b'',
+])
+def test_arreglo_cortado_o_corrupto(contenido):
+    with pytest.raises(json.JSONDecodeError):
+        list(iterar_arreglo_json(io.BytesIO(contenido), 3))
+
+
+def test_al_leer_recibe_todos_los_bloques():
+    contenido = json.dumps(_filas(50)).encode('utf-8')
+    bloques = []
+    list(iterar_arreglo_json(io.BytesIO(contenido), 100, al_leer=bloques.append))
+    assert b''.join(bloques) == contenido
+    assert all(len(bloque) == 100 for bloque in bloques[:-1])
+
+
+def test_carga_completa(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    filas = _filas(1000)
+    _escribir(ruta, filas)
+    inventario = Inventario(ruta)
+    assert [p.to_dict() for p in inventario.obtener_todos()] == filas
+
+
+def test_carga_informa_progreso_hasta_el_total(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    _escribir(ruta, _filas(30000))  # más de un bloque de lectura (1 MB)
+    llamadas = []
+    Inventario(ruta, progreso=lambda leidos, total: llamadas.append((leidos, total)))
+    total = (tmp_path / "inventario.json").stat().st_size
+    assert total > 1 << 20
+    assert len(llamadas) > 1
+    assert all(t == total for _, t in llamadas)
+    assert [leidos for leidos, _ in llamadas] == sorted(leidos for leidos, _ in llamadas)
+    assert llamadas[-1][0] == total
+
+
+def test_archivo_cortado_inicia_vacio(tmp_path):
+    ruta = tmp_path / "inventario.json"
+    _escribir(str(ruta), _filas(100))
+    contenido = ruta.read_bytes()
+    ruta.write_bytes(contenido[:len(contenido) * 2 // 3])
+    assert Inventario(str(ruta)).esta_vacio()
+
+
+def test_producto_invalido_a_mitad_no_deja_carga_parcial(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    filas = _filas(100)
+    filas[60]['cantidad'] = -1
+    _escribir(ruta, filas)
+    assert Inventario(ruta).esta_vacio()
+
+
+def test_fila_sin_campos_no_deja_carga_parcial(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    filas = _filas(100)
+    del filas[60]['precio']
+    _escribir(ruta, filas)
+    assert Inventario(ruta).esta_vacio()
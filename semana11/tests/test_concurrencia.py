@@ -0,0 +1,138 @@
+import random
+import sys
+import threading
+from collections import Counter
+
+import pytest
+
+from inventario_concurrente import InventarioConcurrente
+from producto import Producto
+
+HILOS = 16
+
+
+@pytest.fixture(autouse=True)
+def cambios_de_hilo_frecuentes():
+    # Cambios de hilo más frecuentes para que una carrera aparezca en pocas operaciones
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(intervalo)
+
+
+def _crear(tmp_path, franjas: int, productos):
+    inventario = InventarioConcurrente(str(tmp_path / "inventario.json"), escritura_diferida=3600, franjas=franjas)
+    inventario.agregar_lote(productos)
+    return inventario
+
+
+def _en_hilos(trabajar):
+    barrera = threading.Barrier(HILOS)
+    errores = []
+
+    def envoltura(numero: int):
+        barrera.wait()
+        try:
+            trabajar(numero)
+        except BaseException as e:
+            errores.append(e)
+
+    trabajadores = [threading.Thread(target=envoltura, args=(i,)) for i in range(HILOS)]
+    for trabajador in trabajadores:
+        trabajador.start()
+    for trabajador in trabajadores:
+        trabajador.join()
+    assert errores == []
+
+
+@pytest.mark.parametrize('franjas', [1, 64])
+def test_incrementos_y_descuentos_sin_perdidas(tmp_path, franjas):
+    n, operaciones = 8, 3000
+    inventario = _crear(tmp_path, franjas, [Producto(i, f"Producto {i}", 5, 1.0) for i in range(1, n + 1)])
+    netos = [Counter() for _ in range(HILOS)]
+
+    def trabajar(numero: int):
+        azar = random.Random(numero)
+        for _ in range(operaciones):
+            id_producto = azar.randint(1, n)
+            if azar.random() < 0.5:
+                assert inventario.incrementar_cantidad(id_producto, 1)
+                netos[numero][id_producto] += 1
+            elif inventario.decrementar_si_hay(id_producto, 1):
+                netos[numero][id_producto] -= 1
+
+    _en_hilos(trabajar)
+    total = Counter()
+    for neto in netos:
+        total.update(neto)  # update conserva los netos negativos (la suma de Counter los descarta)
+    for id_producto in range(1, n + 1):
+        assert inventario.buscar_por_id(id_producto).cantidad == 5 + total[id_producto]
+    inventario.cerrar()
+
+
+@pytest.mark.parametrize('franjas', [1, 64])
+def test_no_se_vende_mas_que_el_stock(tmp_path, franjas):
+    inventario = _crear(tmp_path, franjas, [Producto(1, "Laptop", 1000, 850.0)])
+    vendidas = [0] * HILOS
+
+    def trabajar(numero: int):
+        while inventario.decrementar_si_hay(1, 1):
+            vendidas[numero] += 1
+
+    _en_hilos(trabajar)
+    assert sum(vendidas) == 1000
+    assert inventario.buscar_por_id(1).cantidad == 0
+    inventario.cerrar()
+
+
+def test_cambios_concurrentes_llegan_al_archivo(tmp_path):
+    inventario = _crear(tmp_path, 64, [Producto(i, f"Producto {i}", 0, 1.0) for i in range(1, HILOS + 1)])
+
+    def trabajar(numero: int):
+        for _ in range(500):
+            inventario.incrementar_cantidad(numero + 1, 2)
+
+    _en_hilos(trabajar)
+    inventario.cerrar()
+    recargado = InventarioConcurrente(str(tmp_path / "inventario.json"))
+    assert [p.cantidad for p in recargado.obtener_todos()] == [1000] * HILOS
+
+
+def test_top_k_menores_y_mayores(tmp_path):
+    productos = [Producto(i, f"Producto {i}", (i * 37) % 11, float((i * 13) % 7)) for i in range(1, 41)]
+    inventario = _crear(tmp_path, 8, productos)
+    for campo in ('precio', 'cantidad'):
+        orden = sorted(productos, key=lambda p: (getattr(p, campo), p.id))
+        assert inventario.top_k(campo, 5) == orden[:5]
+        assert inventario.top_k(campo, 5, mayores=True) == orden[::-1][:5]
+        assert inventario.top_k(campo, 100, mayores=True) == orden[::-1]
+    inventario.cerrar()
+
+
+def test_indices_al_dia_tras_cambios_directos_concurrentes(tmp_path):
+    n = HILOS * 4
+    inventario = _crear(tmp_path, 8, [Producto(i, f"Producto {i}", i, float(i)) for i in range(1, n + 1)])
+    # Construye los índices antes de los cambios para que se mantengan, no se reconstruyan
+    inventario.top_k('precio', 1)
+    inventario.top_k('cantidad', 1)
+    inventario.buscar_por_nombre("producto")
+
+    def trabajar(numero: int):
+        for ronda in range(50):
+            for id_producto in range(numero * 4 + 1, numero * 4 + 5):
+                producto = inventario.buscar_por_id(id_producto)
+                producto.precio = float(ronda + id_producto)
+                producto.cantidad = ronda * id_producto
+                producto.nombre = f"Pieza {id_producto} ronda {ronda}"
+            inventario.buscar_por_nombre("ronda")
+            inventario.por_rango_precio(0.0, 10.0)
+
+    _en_hilos(trabajar)
+    productos = inventario.obtener_todos()
+    assert inventario.top_k('precio', n) == sorted(productos, key=lambda p: (p.precio, p.id))
+    assert inventario.top_k('cantidad', n, mayores=True) == sorted(productos, key=lambda p: (p.cantidad, p.id))[::-1]
+    assert inventario.por_rango_precio(50.0, 60.0) == sorted((p for p in productos if 50.0 <= p.precio <= 60.0),
+                                                             key=lambda p: (p.precio, p.id))
+    assert {p.id for p in inventario.buscar_por_nombre("ronda 49")} == set(range(1, n + 1))
+    assert inventario.buscar_por_nombre("producto") == []
+    inventario.cerrar()
@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from csv_inventario import _mapear_en_ventana, exportar_csv, importar_csv
+from inventario import Inventario
+from producto import Producto
+
+
+def test_ventana_limita_los_bloques_leidos_por_adelantado():
+    leidos = []
+
+    def bloques():
+        for numero in range(100):
+            leidos.append(numero)
+            yield numero
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        resultados = _mapear_en_ventana(pool, lambda x: x * x, bloques(), 4)
+        for entregados, resultado in enumerate(resultados, start=1):
+            assert resultado == (entregados - 1) ** 2
+            assert len(leidos) <= entregados + 4
+    assert len(leidos) == 100
+
+
+def test_importar_lo_exportado_y_rechazar_filas_invalidas(tmp_path):
+    origen = Inventario(str(tmp_path / "origen.json"))
+    origen.agregar_lote([Producto(i, f"Producto {i}", i, 1.5) for i in range(1, 11)])
+    ruta_csv = str(tmp_path / "productos.csv")
+    assert exportar_csv(origen, ruta_csv) == 10
+    with open(ruta_csv, 'a', encoding='utf-8', newline='') as archivo:
+        archivo.write("3,Repetido,1,1.00\n11,Negativo,-1,1.00\n12,Corta\n")
+
+    destino = Inventario(str(tmp_path / "destino.json"))
+    resultado = importar_csv(destino, ruta_csv, tamano_bloque=4)
+    assert resultado.agregados == 10
+    assert [numero for numero, _ in resultado.rechazados] == [12, 13, 14]
+    assert [p.to_dict() for p in destino.obtener_todos()] == [p.to_dict() for p in origen.obtener_todos()]
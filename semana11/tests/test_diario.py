@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from inventario import Inventario
+from producto import Producto
+
+
+def _con_diario(tmp_path) -> str:
+    ruta = str(tmp_path / "inventario.json")
+    inventario = Inventario(ruta, usar_diario=True)
+    inventario.agregar_lote([Producto(1, "Clavo", 5, 0.1), Producto(2, "Tuerca", 5, 0.2)])
+    inventario.cerrar()
+    return ruta
+
+
+def test_ultima_linea_cortada_se_descarta_en_silencio(tmp_path, capsys):
+    ruta = _con_diario(tmp_path)
+    with open(ruta + ".log", 'a', encoding='utf-8') as diario:
+        diario.write('{"op":"cantidad","id":1,"valor":9}\n{"op":"canti')
+    inventario = Inventario(ruta, usar_diario=True)
+    assert inventario.buscar_por_id(1).cantidad == 9
+    assert "corrupta" not in capsys.readouterr().out
+
+
+def test_linea_corrupta_intermedia_se_informa(tmp_path, capsys):
+    ruta = _con_diario(tmp_path)
+    with open(ruta + ".log", 'a', encoding='utf-8') as diario:
+        diario.write('basura\n{"op":"cantidad","id":2,"valor":7}\n')
+    inventario = Inventario(ruta, usar_diario=True)
+    assert inventario.buscar_por_id(2).cantidad == 7
+    salida = capsys.readouterr().out
+    assert salida.count("está corrupta. Se omite.") == 1
+
+
+def _lineas_diario(ruta: str) -> list:
+    with open(ruta + ".log", encoding='utf-8') as diario:
+        return [json.loads(linea) for linea in diario]
+
+
+def test_varios_cambios_de_un_producto_dejan_una_sola_linea(tmp_path):
+    ruta = _con_diario(tmp_path)
+    inventario = Inventario(ruta, usar_diario=True)
+    antes = len(_lineas_diario(ruta))
+    with inventario.transaccion():
+        inventario.actualizar_cantidad(1, 8)
+        inventario.actualizar_precio(1, 0.5)
+        inventario.buscar_por_id(1).nombre = "Clavo largo"
+        inventario.actualizar_cantidad(1, 9)
+    assert _lineas_diario(ruta)[antes:] == [{'op': 'estado', 'id': 1, 'nombre': "Clavo largo",
+                                             'cantidad': 9, 'precio': 0.5}]
+
+
+def test_guardado_fallido_conserva_los_productos_marcados(tmp_path):
+    ruta = _con_diario(tmp_path)
+    inventario = Inventario(ruta, usar_diario=True)
+    ruta_diario = inventario._ruta_diario
+    # Un directorio en lugar del diario hace fallar la escritura
+    inventario._ruta_diario = str(tmp_path)
+    with pytest.raises(Exception, match="diario"):
+        inventario.actualizar_cantidad(2, 40)
+    assert inventario._sucios == {2}
+    inventario._ruta_diario = ruta_diario
+    inventario.cerrar()
+    assert Inventario(ruta, usar_diario=True).buscar_por_id(2).cantidad == 40
+
+
+def test_transaccion_revierte_cambios_directos_sobre_productos(tmp_path):
+    ruta = _con_diario(tmp_path)
+    inventario = Inventario(ruta, usar_diario=True)
+    antes = len(_lineas_diario(ruta))
+    with pytest.raises(RuntimeError):
+        with inventario.transaccion():
+            producto = inventario.buscar_por_id(1)
+            producto.cantidad = 99
+            producto.nombre = "Martillo"
+            inventario.actualizar_precio(2, 7.5)
+            producto.precio = 3.0
+            raise RuntimeError("cancelar")
+    assert inventario.buscar_por_id(1).to_dict() == {'id': 1, 'nombre': "Clavo", 'cantidad': 5, 'precio': 0.1}
+    assert inventario.buscar_por_id(2).precio == 0.2
+    assert [p.id for p in inventario.buscar_por_nombre("clavo")] == [1]
+    assert inventario.buscar_por_nombre("martillo") == []
+    assert [p.id for p in inventario.top_k('cantidad', 1, mayores=True)] == [2]
+    inventario.cerrar()
+    # La reversión puede volver a escribir el estado previo, nunca el descartado
+    assert all(linea['nombre'] in ("Clavo", "Tuerca") and linea['cantidad'] == 5
+               for linea in _lineas_diario(ruta)[antes:])
+    assert Inventario(ruta, usar_diario=True).buscar_por_id(1).to_dict() == {'id': 1, 'nombre': "Clavo",
+                                                                               'cantidad': 5, 'precio': 0.1}
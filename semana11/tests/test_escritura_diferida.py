@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import time
+
+from inventario import Inventario
+from producto import Producto
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+def _ejecutar_menu(ruta: str, entrada: str, *opciones: str) -> str:
+    resultado = subprocess.run([sys.executable, MAIN, "--archivo", ruta, *opciones], input=entrada,
+                               capture_output=True, text=True, timeout=60)
+    assert resultado.returncode == 0, resultado.stdout + resultado.stderr
+    return resultado.stdout
+
+
+def test_menu_guarda_al_momento_por_defecto(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    salida = _ejecutar_menu(ruta, "1\n7\nClavo\n5\n0.1\n\n6\n")
+    assert "agregado (guardado en archivo)" in salida
+
+
+def test_fin_de_entrada_guarda_cambios_pendientes(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    # Sin la opción 6: la entrada termina mientras el alta espera al hilo de escritura
+    salida = _ejecutar_menu(ruta, "1\n7\nClavo\n5\n0.1\n", "--escritura-diferida", "60")
+    assert "agregado (guardado pendiente)" in salida
+    assert Inventario(ruta).buscar_por_id(7).nombre == "Clavo"
+
+
+def test_error_en_segundo_plano_no_se_atribuye_al_cambio_siguiente(tmp_path, monkeypatch):
+    inventario = Inventario(str(tmp_path / "inventario.json"), usar_diario=True, escritura_diferida=0.01)
+    persistir = inventario._persistir
+    fallos = []
+
+    def persistir_fallando():
+        if not fallos:
+            fallos.append(1)
+            raise PermissionError("sin permiso")
+        persistir()
+
+    monkeypatch.setattr(inventario, '_persistir', persistir_fallando)
+    inventario.agregar_producto(Producto(1, "Clavo", 5, 0.1))
+    limite = time.monotonic() + 5
+    while not fallos and time.monotonic() < limite:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    # El cambio siguiente se acepta; el error anterior se informa aparte
+    assert inventario.agregar_producto(Producto(2, "Tuerca", 3, 0.2))
+    error = inventario.tomar_error_escritura()
+    assert isinstance(error, PermissionError)
+    assert inventario.tomar_error_escritura() is None
+    inventario.cerrar()
+    assert [p.id for p in Inventario(str(tmp_path / "inventario.json"), usar_diario=True).obtener_todos()] == [1, 2]
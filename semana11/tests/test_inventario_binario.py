@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from inventario import Inventario
+from inventario_binario import CABECERA, REGISTRO, InventarioBinario, PublicadorInstantaneas, ReplicaLectura
+from inventario_binario import escribir_inventario_binario
+from producto import Producto
+
+
+@pytest.fixture
+def binario(tmp_path):
+    ruta = str(tmp_path / "inventario.bin")
+    escribir_inventario_binario(ruta, [Producto(i, f"Producto {i}", i, i * 1.25) for i in range(1, 11)])
+    inventario = InventarioBinario(ruta)
+    yield inventario
+    inventario.cerrar()
+
+
+def test_lee_lo_escrito(binario):
+    assert binario.obtener_tamaño() == 10
+    assert [p.to_dict() for p in binario.recorrer()] == [p.to_dict() for p in binario.obtener_todos()]
+    assert binario.buscar_por_id(4).to_dict() == {'id': 4, 'nombre': "Producto 4", 'cantidad': 4, 'precio': 5.0}
+
+
+def test_actualizaciones_y_bajas_en_sitio(binario):
+    assert binario.actualizar_cantidad(3, 99)
+    assert binario.actualizar_precio(3, 1.99)
+    assert binario.eliminar_producto(5)
+    assert not binario.eliminar_producto(5)
+    assert binario.buscar_por_id(5) is None
+    assert (binario.buscar_por_id(3).cantidad, binario.buscar_por_id(3).precio) == (99, 1.99)
+    assert binario.obtener_tamaño() == 9
+
+
+def test_alta_rechazada_con_value_error(binario):
+    with pytest.raises(ValueError, match="escribir_inventario_binario"):
+        binario.agregar_producto(Producto(11, "Nuevo", 1, 1.0))
+    assert binario.obtener_tamaño() == 10
+
+
+def _descriptores_abiertos() -> int:
+    return len(os.listdir('/proc/self/fd'))
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc/self/fd'), reason="requiere /proc")
+@pytest.mark.parametrize('recorte', [0, 10, CABECERA.size + REGISTRO.size, -3])
+def test_archivo_incompleto_se_rechaza_y_se_cierra(tmp_path, recorte):
+    ruta = str(tmp_path / "inventario.bin")
+    escribir_inventario_binario(ruta, [Producto(i, f"Producto {i}", i, 1.0) for i in range(1, 4)])
+    with open(ruta, 'r+b') as archivo:
+        archivo.truncate(recorte if recorte >= 0 else os.path.getsize(ruta) + recorte)
+    abiertos = _descriptores_abiertos()
+    for solo_lectura in (False, True):
+        with pytest.raises(ValueError, match="inventario.bin"):
+            InventarioBinario(ruta, solo_lectura=solo_lectura)
+    assert _descriptores_abiertos() == abiertos
+
+
+def test_replica_pasa_a_la_nueva_instantanea_y_rechaza_archivos_incompletos(tmp_path):
+    ruta = str(tmp_path / "inventario.bin")
+    inventario = Inventario(str(tmp_path / "inventario.json"))
+    inventario.agregar_lote([Producto(i, f"Producto {i}", i, 1.0) for i in range(1, 6)])
+    publicador = PublicadorInstantaneas(inventario, ruta, intervalo=3600)
+    assert publicador.publicar_si_cambio()
+    assert not publicador.publicar_si_cambio()
+
+    replica = ReplicaLectura(ruta, intervalo_revision=None)
+    assert replica.buscar_por_id(2).cantidad == 2
+    anterior = replica._binario
+
+    inventario.actualizar_cantidad(2, 200)
+    inventario.eliminar_producto(5)
+    assert publicador.publicar_si_cambio()
+    assert replica.buscar_por_id(2).cantidad == 2  # hasta revisar, sigue con la que tenía
+    assert replica.revisar()
+    assert replica.buscar_por_id(2).cantidad == 200
+    assert replica.obtener_tamaño() == 4
+    # Quien aún tenía la instantánea anterior la sigue viendo completa y sin cambios
+    assert anterior.buscar_por_id(2).cantidad == 2
+    assert anterior.obtener_tamaño() == 5
+
+    # Un archivo a medio copiar en la ruta no reemplaza a la instantánea vigente
+    with open(ruta, 'rb') as archivo:
+        contenido = archivo.read()
+    with open(ruta + ".parcial", 'wb') as archivo:
+        archivo.write(contenido[:CABECERA.size + REGISTRO.size])
+    os.replace(ruta + ".parcial", ruta)
+    assert not replica.revisar()
+    assert replica.buscar_por_id(2).cantidad == 200
+
+    inventario.actualizar_cantidad(1, 100)
+    assert publicador.publicar_si_cambio()
+    assert replica.revisar()
+    assert replica.buscar_por_id(1).cantidad == 100
+    anterior.cerrar()
+    replica.cerrar()
@@ -0,0 +1,108 @@
+import pytest
+
+from inventario import Inventario
+from inventario_fragmentado import InventarioFragmentado, fusionar_fragmentos
+from producto import Producto
+
+
+def _sin_fragmentar_con_diario(ruta: str):
+    """Inventario sin fragmentar cuyo diario (.log) tiene cambios que no están en la instantánea."""
+    inventario = Inventario(ruta, usar_diario=True)
+    inventario.agregar_lote([Producto(i, f"Producto {i}", i, 1.0) for i in range(1, 6)])
+    inventario.compactar()
+    inventario.actualizar_cantidad(1, 100)
+    inventario.eliminar_producto(2)
+    inventario.agregar_producto(Producto(6, "Nuevo", 6, 2.0))
+    inventario.cerrar()
+    return {1: 100, 3: 3, 4: 4, 5: 5, 6: 6}
+
+
+def _cantidades(inventario):
+    return {producto.id: producto.cantidad for producto in inventario.obtener_todos()}
+
+
+def test_fragmentar_aplica_el_diario(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    esperado = _sin_fragmentar_con_diario(ruta)
+    assert (tmp_path / "inventario.json.log").stat().st_size > 0
+
+    fragmentado = InventarioFragmentado(ruta, fragmentos=3, procesos=1)
+    assert _cantidades(fragmentado) == esperado
+    assert not (tmp_path / "inventario.json").exists()
+    assert not (tmp_path / "inventario.json.log").exists()
+    assert _cantidades(InventarioFragmentado(ruta, fragmentos=3, procesos=1)) == esperado
+
+
+def test_fragmentar_con_solo_el_diario(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    _sin_fragmentar_con_diario(ruta)
+    (tmp_path / "inventario.json").unlink()
+    (tmp_path / "inventario.json.sha256").unlink()
+    # Sin instantánea solo quedan los productos que el diario registra completos
+    esperado = {1: 100, 6: 6}
+    assert _cantidades(InventarioFragmentado(ruta, fragmentos=2, procesos=1)) == esperado
+    assert not (tmp_path / "inventario.json.log").exists()
+
+
+def test_fusionar_vuelve_a_un_solo_archivo(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    esperado = _sin_fragmentar_con_diario(ruta)
+    fragmentado = InventarioFragmentado(ruta, fragmentos=3, procesos=1)
+    fragmentado.actualizar_cantidad(3, 30)
+    fragmentado.cerrar()
+    esperado[3] = 30
+    # Restos de una migración interrumpida: ya están incluidos en los fragmentos
+    (tmp_path / "inventario.json.log").write_text('{"op": "cantidad", "id": 4, "valor": 999}\n')
+
+    assert fusionar_fragmentos(ruta) == len(esperado)
+    assert list(tmp_path.glob("inventario-*")) == []
+    assert _cantidades(Inventario(ruta, usar_diario=True)) == esperado
+    assert fusionar_fragmentos(ruta) == 0
+
+
+def test_fusionar_no_toca_nada_si_un_fragmento_esta_corrupto(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    _sin_fragmentar_con_diario(ruta)
+    InventarioFragmentado(ruta, fragmentos=2, procesos=1).cerrar()
+    (tmp_path / "inventario-02de02.json").write_text('[{"id": 1,')
+    antes = sorted(archivo.name for archivo in tmp_path.iterdir())
+    with pytest.raises(Exception, match="inventario-02de02.json"):
+        fusionar_fragmentos(ruta)
+    assert sorted(archivo.name for archivo in tmp_path.iterdir()) == antes
+
+
+def _inodos(tmp_path) -> dict:
+    # Cada reescritura reemplaza el archivo (os.replace), así que cambia su inodo
+    return {archivo.name: archivo.stat().st_ino for archivo in tmp_path.glob("inventario-*.json")}
+
+
+def test_cerrar_sin_cambios_no_reescribe_fragmentos(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    fragmentado = InventarioFragmentado(ruta, fragmentos=3, procesos=1)
+    # Lote grande: se inserta sin marcar productos y se guarda con compactar
+    fragmentado.agregar_lote([Producto(i, f"Producto {i}", i, 1.0) for i in range(1, 1501)])
+    fragmentado.cerrar()
+    inodos = _inodos(tmp_path)
+    assert len(inodos) == 3
+
+    fragmentado = InventarioFragmentado(ruta, fragmentos=3, procesos=1)
+    assert fragmentado.obtener_tamaño() == 1500
+    fragmentado.compactar()
+    fragmentado.cerrar()
+    assert _inodos(tmp_path) == inodos
+
+    fragmentado = InventarioFragmentado(ruta, fragmentos=3, procesos=1)
+    fragmentado.actualizar_cantidad(3, 0)
+    fragmentado.compactar()
+    assert {nombre for nombre, inodo in _inodos(tmp_path).items() if inodo != inodos[nombre]} == {"inventario-01de03.json"}
+    assert InventarioFragmentado(ruta, fragmentos=3, procesos=1).buscar_por_id(3).cantidad == 0
+
+
+def test_fragmento_con_suma_distinta_se_valida(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    fragmentado = InventarioFragmentado(ruta, fragmentos=2, procesos=1)
+    fragmentado.agregar_lote([Producto(i, f"Producto {i}", i, 1.0) for i in range(1, 5)])
+    fragmentado.cerrar()
+    # Editado a mano: la suma ya no coincide y el producto inválido descarta el fragmento
+    (tmp_path / "inventario-01de02.json").write_text('[{"id": 2, "nombre": "  ", "cantidad": 1, "precio": 1.0}]')
+    assert sorted(_cantidades(InventarioFragmentado(ruta, fragmentos=2, procesos=1))) == [1, 3]
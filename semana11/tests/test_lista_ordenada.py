@@ -0,0 +1,64 @@
+import random
+from bisect import insort
+
+import pytest
+
+from lista_ordenada import ListaOrdenada
+
+
+class ListaChica(ListaOrdenada):
+    # Bloques pequeños para que pocas operaciones dividan y vacíen bloques
+    TAMANO_BLOQUE = 4
+
+
+def _comprobar(lista: ListaOrdenada, esperado: list):
+    assert list(lista) == esperado
+    assert list(reversed(lista)) == esperado[::-1]
+    assert len(lista) == len(esperado)
+    assert all(len(bloque) <= 2 * lista.TAMANO_BLOQUE for bloque in lista._bloques)
+    assert lista._maximos == [bloque[-1] for bloque in lista._bloques]
+
+
+def test_agregar_divide_los_bloques_sin_perder_el_orden():
+    lista = ListaChica(range(0, 40, 2))
+    esperado = list(range(0, 40, 2))
+    for valor in [5, 1, 39, 17, 17, -3, 100] + list(range(20, 30)):
+        lista.agregar(valor)
+        insort(esperado, valor)
+        _comprobar(lista, esperado)
+    assert len(lista._bloques) > 5
+
+
+def test_eliminar_vacia_bloques_y_rechaza_ausentes():
+    lista = ListaChica(range(20))
+    for valor in range(0, 20, 3):
+        assert lista.eliminar(valor)
+    assert not lista.eliminar(0)
+    assert not lista.eliminar(99)
+    esperado = [v for v in range(20) if v % 3]
+    _comprobar(lista, esperado)
+    for valor in esperado[:6]:
+        assert lista.eliminar(valor)
+    _comprobar(lista, esperado[6:])
+    assert 0 not in lista and esperado[6] in lista
+
+
+@pytest.mark.parametrize('semilla', range(5))
+def test_operaciones_al_azar_coinciden_con_una_lista(semilla):
+    azar = random.Random(semilla)
+    lista, esperado = ListaChica(), []
+    for _ in range(400):
+        valor = azar.randint(0, 60)
+        if valor in esperado and azar.random() < 0.5:
+            assert lista.eliminar(valor)
+            esperado.remove(valor)
+        elif valor not in esperado:
+            lista.agregar(valor)
+            insort(esperado, valor)
+    _comprobar(lista, esperado)
+    for desde in range(-1, 63, 4):
+        for hasta in (desde, desde + 1, desde + 9, 70):
+            assert list(lista.rango(desde, hasta)) == [v for v in esperado if desde <= v <= hasta]
+    for inicio in range(len(esperado) + 2):
+        for cantidad in (0, 1, 3, 4, 5, 9, len(esperado)):
+            assert lista.porcion(inicio, cantidad) == esperado[inicio:inicio + cantidad]
@@ -0,0 +1,97 @@
+import pytest
+
+from inventario import Inventario
+from metricas import HistogramaLatencias, Metricas, desinstrumentar, instrumentar
+from producto import Producto
+
+BITS = HistogramaLatencias.BITS_SUBCUBETA
+
+
+def _valores_de_prueba():
+    yield from range(0, 1 << 12)
+    for potencia in range(12, 63):
+        for desfase in (-1, 0, 1, 12345):
+            yield (1 << potencia) + desfase
+    yield (1 << 63) - 1
+
+
+def test_cada_valor_cae_dentro_de_los_limites_de_su_cubeta():
+    for valor in _valores_de_prueba():
+        indice = HistogramaLatencias._indice(valor)
+        desde, hasta = HistogramaLatencias._limites(indice)
+        assert 0 <= indice < HistogramaLatencias.CUBETAS
+        assert desde <= valor <= hasta
+        assert HistogramaLatencias._indice(desde) == HistogramaLatencias._indice(hasta) == indice
+
+
+def test_cubetas_contiguas_con_error_relativo_acotado():
+    anterior = -1
+    for indice in range(HistogramaLatencias.CUBETAS):
+        desde, hasta = HistogramaLatencias._limites(indice)
+        assert desde == anterior + 1
+        if desde >= 1 << (BITS + 1):
+            assert (hasta - desde + 1) / desde <= 1 / (1 << BITS)
+        else:
+            assert desde == hasta  # los valores pequeños se registran exactos
+        anterior = hasta
+    assert anterior == (1 << 63) - 1
+
+
+def test_registrar_usa_la_misma_cubeta_que_indice():
+    for valor in (0, 1, 63, 64, 65, 1000, 123456789, (1 << 63) - 1):
+        histograma = HistogramaLatencias()
+        histograma.registrar(valor)
+        assert histograma._cubetas[HistogramaLatencias._indice(valor)] == 1
+        assert histograma.maximo_ns == valor
+
+
+def test_percentiles_con_muestras_conocidas():
+    histograma = HistogramaLatencias()
+    for valor in range(1, 101):
+        histograma.registrar(valor)
+    assert histograma.conteo == 100
+    assert histograma.percentil(50) == 50
+    assert histograma.percentil(99) == 99
+    assert histograma.percentil(100) == 100
+
+    histograma = HistogramaLatencias()
+    for _ in range(1000):
+        histograma.registrar(1000)
+    for _ in range(10):
+        histograma.registrar(1_000_000)
+    for p in (50, 99):
+        assert 1000 <= histograma.percentil(p) <= 1000 * (1 + 1 / (1 << BITS))
+    assert histograma.percentil(99.9) == 1_000_000
+    resumen = histograma.a_dict()
+    assert resumen['conteo'] == 1010
+    assert resumen['max_ms'] == pytest.approx(1.0)
+    assert resumen['min_ms'] <= 0.001
+
+
+def test_desinstrumentar_vuelve_a_los_metodos_de_la_clase(tmp_path):
+    inventario = Inventario(str(tmp_path / "inventario.json"))
+    metricas = inventario.activar_metricas()
+    assert all(nombre in vars(inventario) for nombre in Inventario.METODOS_MEDIDOS)
+    inventario.agregar_producto(Producto(1, "Clavo", 5, 0.1))
+    assert metricas.histograma('agregar_producto').conteo == 1
+
+    inventario.desactivar_metricas()
+    assert not any(nombre in vars(inventario) for nombre in Inventario.METODOS_MEDIDOS)
+    assert inventario.agregar_producto.__func__ is Inventario.agregar_producto
+    inventario.agregar_producto(Producto(2, "Tuerca", 5, 0.1))
+    assert metricas.histograma('agregar_producto').conteo == 1
+
+
+def test_instrumentar_no_modifica_la_clase():
+    class Servicio:
+        def operar(self, x):
+            return x * 2
+
+    metricas = Metricas()
+    medido, libre = Servicio(), Servicio()
+    instrumentar(medido, ['operar'], metricas)
+    assert medido.operar(3) == libre.operar(3) == 6
+    assert metricas.operaciones() == ['operar']
+    assert 'operar' not in vars(libre)
+    desinstrumentar(medido, ['operar'])
+    assert medido.operar.__func__ is Servicio.operar
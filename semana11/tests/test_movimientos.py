@@ -0,0 +1,91 @@
+import os
+from datetime import date
+
+import pytest
+
+import movimientos
+from movimientos import FORMATO, RegistroMovimientos
+
+
+def _mediodia(dias_desde_hoy: int) -> float:
+    inicio, _ = RegistroMovimientos._limites_dia(date.today().toordinal() + dias_desde_hoy)
+    return inicio + 12 * 3600
+
+
+def test_cambio_de_dia_saca_de_la_ventana_el_dia_vencido():
+    registro = RegistroMovimientos(dias_ventana=2)
+    registro.registrar(1, -5, momento=_mediodia(0))
+    registro.registrar(1, 4, momento=_mediodia(0))  # las entradas no cuentan como salidas
+    assert registro.salida_ventana(1) == 5
+    registro.registrar(1, -3, momento=_mediodia(1))
+    assert registro.salidas_ventana() == {1: 8}
+    registro.registrar(2, -1, momento=_mediodia(2))
+    # Con dos días de ventana, el de hoy ya salió
+    assert registro.salidas_ventana() == {1: 3, 2: 1}
+    assert registro.salida_del_dia(1) == 0
+    registro.registrar(2, -2, momento=_mediodia(4))
+    assert registro.salidas_ventana() == {2: 2}
+
+
+def test_reloj_que_retrocede_no_desordena_el_archivo(tmp_path):
+    ruta = str(tmp_path / "movimientos.bin")
+    registro = RegistroMovimientos(ruta)
+    ahora = _mediodia(0)
+    for desfase, delta in ((0, -1), (-3600, -2), (60, -3), (-7200, -4)):
+        registro.registrar(1, delta, momento=ahora + desfase)
+    registro.volcar()
+    momentos = [momento for momento, _, _ in registro.movimientos()]
+    assert momentos == [ahora, ahora, ahora + 60, ahora + 60]
+
+    # Al reabrir, el último momento del archivo sigue siendo el mínimo para los siguientes
+    reabierto = RegistroMovimientos(ruta)
+    reabierto.registrar(1, -5, momento=ahora)
+    assert [m for m, _, _ in reabierto.movimientos()][-1] == ahora + 60
+    assert reabierto.salida_ventana(1) == 15
+
+
+def test_deshacer_hasta_revierte_los_agregados(tmp_path):
+    registro = RegistroMovimientos(str(tmp_path / "movimientos.bin"))
+    registro.registrar(1, -2)
+    registro.volcar()
+    marca = registro.marca()
+    registro.registrar(1, -3)
+    registro.registrar(2, -4)
+    registro.registrar(2, 10)
+    registro.deshacer_hasta(marca)
+    assert registro.salidas_ventana() == {1: 2}
+    assert [(i, d) for _, i, d in registro.movimientos()] == [(1, -2)]
+    with pytest.raises(ValueError):
+        registro.deshacer_hasta(0)
+
+
+def test_movimiento_cortado_al_final_se_descarta(tmp_path, capsys):
+    ruta = str(tmp_path / "movimientos.bin")
+    registro = RegistroMovimientos(ruta)
+    registro.registrar(1, -2)
+    registro.registrar(2, -1)
+    registro.volcar()
+    with open(ruta, 'ab') as archivo:
+        archivo.write(FORMATO.pack(_mediodia(0), 3, -9)[:10])
+
+    reabierto = RegistroMovimientos(ruta)
+    assert "movimiento incompleto" in capsys.readouterr().out
+    assert os.path.getsize(ruta) == 2 * FORMATO.size
+    assert reabierto.salidas_ventana() == {1: 2, 2: 1}
+    reabierto.registrar(3, -7)
+    reabierto.volcar()
+    assert [(i, d) for _, i, d in RegistroMovimientos(ruta).movimientos()] == [(1, -2), (2, -1), (3, -7)]
+
+
+def test_historial_por_bloques_con_filtros(tmp_path, monkeypatch):
+    monkeypatch.setattr(movimientos, 'MOVIMIENTOS_POR_LECTURA', 3)
+    registro = RegistroMovimientos(str(tmp_path / "movimientos.bin"))
+    inicio = _mediodia(0)
+    for i in range(10):
+        registro.registrar(i % 2 + 1, -1, momento=inicio + i)
+        if i == 6:
+            registro.volcar()  # los últimos quedan pendientes en memoria
+    todos = list(registro.movimientos())
+    assert [m - inicio for m, _, _ in todos] == list(range(10))
+    assert list(registro.movimientos(desde=inicio + 2, hasta=inicio + 8)) == todos[2:8]
+    assert list(registro.movimientos(id_producto=2, desde=inicio + 4)) == [m for m in todos[4:] if m[1] == 2]
@@ -0,0 +1,83 @@
+import io
+
+import pytest
+
+import main
+from inventario import Inventario
+from producto import Producto
+
+
+@pytest.fixture
+def inventario(tmp_path):
+    inventario = Inventario(str(tmp_path / "inventario.json"))
+    inventario.agregar_lote([Producto(i, f"Producto {i}", i, 1.0) for i in range(1, 26)])
+    return inventario
+
+
+def test_total_paginas(inventario):
+    assert [inventario.total_paginas(t) for t in (1, 5, 7, 25, 26)] == [25, 5, 4, 1, 1]
+    for tamaño in (0, -1):
+        with pytest.raises(ValueError):
+            inventario.total_paginas(tamaño)
+
+
+def test_paginas_cubren_el_inventario(inventario):
+    paginas = [inventario.pagina(n, 7) for n in range(1, inventario.total_paginas(7) + 1)]
+    assert [len(p) for p in paginas] == [7, 7, 7, 4]
+    assert [p.id for pagina in paginas for p in pagina] == list(range(1, 26))
+    assert inventario.pagina(5, 7) == []
+
+
+@pytest.mark.parametrize('tamaño_bloque', [1, 5, 7, 25, 26, 100])
+def test_recorrer_en_bloques_exactos_y_parciales(inventario, tamaño_bloque, monkeypatch):
+    paginas = []
+    pagina = inventario.pagina
+
+    def pagina_contada(numero, tamaño):
+        paginas.append(numero)
+        return pagina(numero, tamaño)
+
+    monkeypatch.setattr(inventario, 'pagina', pagina_contada)
+    assert [p.id for p in inventario.recorrer(tamaño_bloque)] == list(range(1, 26))
+    # Un múltiplo exacto necesita una página vacía más para saber que terminó
+    assert len(paginas) == 25 // tamaño_bloque + 1
+
+
+def test_recorrer_inventario_vacio(tmp_path):
+    assert list(Inventario(str(tmp_path / "vacio.json")).recorrer(5)) == []
+
+
+class _DestinoContado(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.escrituras = 0
+
+    def write(self, texto):
+        self.escrituras += 1
+        return super().write(texto)
+
+
+def test_escribir_tabla_agrupa_las_filas(inventario):
+    destino = _DestinoContado()
+    productos = (inventario.buscar_por_id(i) for i in range(1, 6))
+    assert main.escribir_tabla(destino, productos, filas_por_escritura=2) == 5
+    # Encabezado, tres bloques de filas (2 + 2 + 1) y cierre
+    assert destino.escrituras == 5
+    lineas = destino.getvalue().splitlines()
+    assert lineas[0] == lineas[2] == lineas[-1] == main.SEPARADOR_TABLA
+    assert lineas[3:-1] == [fila.rstrip('\n') for fila in main.formatear_filas(inventario.pagina(1, 5))]
+    assert main.escribir_tabla(io.StringIO(), []) == 0
+
+
+def test_exportar_listado_escribe_todo_el_recorrido(inventario, tmp_path, monkeypatch, capsys):
+    ruta = tmp_path / "listado.txt"
+    monkeypatch.setattr('builtins.input', lambda mensaje: str(ruta))
+    main.exportar_listado(inventario.recorrer(4))
+    assert "25 producto(s) exportado(s)" in capsys.readouterr().out
+    lineas = ruta.read_text(encoding='utf-8').splitlines()
+    assert lineas[-1] == "Total: 25 producto(s)"
+    assert [int(linea.split('|')[0]) for linea in lineas[3:-2]] == list(range(1, 26))
+
+    monkeypatch.setattr('builtins.input', lambda mensaje: str(tmp_path))
+    main.exportar_listado(inventario.recorrer(4))
+    assert "[ERROR" in capsys.readouterr().out
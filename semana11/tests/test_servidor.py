@@ -0,0 +1,41 @@
+import json
+
+from inventario import Inventario
+from producto import Producto
+from servidor import ServidorInventario
+
+
+def _pedir(servidor: ServidorInventario, **peticion) -> dict:
+    return json.loads(servidor.procesar(json.dumps(peticion).encode('utf-8')))
+
+
+def test_argumentos_invalidos_no_se_informan_como_fallo_de_guardado(tmp_path):
+    inventario = Inventario(str(tmp_path / "inventario.json"), usar_diario=True)
+    servidor = ServidorInventario(inventario)
+    for campos in ({'nombre': 5, 'cantidad': 1, 'precio': 1.0},
+                   {'nombre': "Clavo", 'cantidad': "mucho", 'precio': 1.0},
+                   {'nombre': "Clavo", 'cantidad': -1, 'precio': 1.0}):
+        respuesta = _pedir(servidor, id=1, op='agregar', id_producto=1, **campos)
+        assert respuesta['ok'] is False
+        assert respuesta['error'].startswith("Petición inválida: ")
+    assert _pedir(servidor, op='agregar', id_producto=1)['error'] == "Falta el campo 'nombre'"
+    assert inventario.obtener_tamaño() == 0
+    inventario.cerrar()
+
+
+def test_fallo_del_disco_se_informa_como_fallo_de_guardado(tmp_path, monkeypatch):
+    inventario = Inventario(str(tmp_path / "inventario.json"), usar_diario=True)
+    servidor = ServidorInventario(inventario)
+
+    def persistir_sin_permiso():
+        raise PermissionError("Permiso denegado para escribir en 'inventario.json.log'")
+
+    monkeypatch.setattr(inventario, '_persistir', persistir_sin_permiso)
+    respuesta = _pedir(servidor, id=2, op='agregar', id_producto=1, nombre="Clavo", cantidad=5, precio=0.1)
+    assert respuesta == {'id': 2, 'ok': False,
+                         'error': "Aplicado en memoria, pero falló el guardado: "
+                                  "Permiso denegado para escribir en 'inventario.json.log'"}
+    assert inventario.buscar_por_id(1).nombre == "Clavo"
+    monkeypatch.undo()
+    inventario.cerrar()
+    assert Inventario(str(tmp_path / "inventario.json"), usar_diario=True).buscar_por_id(1).nombre == "Clavo"